@@ -6,6 +6,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from services import CrewService, OllamaService
 from utils import URLDetector
+from scrapers.base_scraper import has_metrics
+from scrapers.revalidate import age_seconds, get_revalidator
 from config import Config
 
 # Page configuration
@@ -72,6 +74,8 @@ def setup_services():
             st.session_state.crew_service = CrewService()
         if st.session_state.ollama_service is None:
             st.session_state.ollama_service = OllamaService()
+            # Load the models while the user types a URL (once per process)
+            st.session_state.ollama_service.warm_up_in_background()
         return True
     except Exception as e:
         st.error(f"Error initializing services: {str(e)}")
@@ -92,6 +96,12 @@ def display_sidebar():
     """Display sidebar with configuration and info"""
     st.sidebar.header("⚙️ Konfigurasi")
     
+    st.session_state.hedged_scraping = st.sidebar.checkbox(
+        "⚡ Mode cepat (HTTP + browser paralel)",
+        value=st.session_state.get('hedged_scraping', Config.HEDGED_SCRAPING),
+        help="Ambil halaman lewat HTTP dan browser bersamaan, pakai hasil lengkap yang pertama"
+    )
+    
     # Service status
     st.sidebar.subheader("Status Layanan")
     
@@ -111,12 +121,33 @@ def display_sidebar():
                             st.warning(f"⚠️ Model {Config.OLLAMA_MODEL} tidak ditemukan")
                     else:
                         st.error("❌ Ollama: Tidak aktif")
+                    for model, info in ollama_status.get('models', {}).items():
+                        load = f", load {info['load_seconds']}s" if info.get('load_seconds') is not None else ""
+                        state = "di memori" if info.get('resident') else "belum dimuat"
+                        st.caption(f"🧠 {model}: {state}{load}")
+                    cache_stats = ollama_status.get('response_cache')
+                    if cache_stats:
+                        st.caption(f"🗃️ Cache LLM: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+                                   f"({cache_stats['hit_rate']:.0%})")
+                    circuit = ollama_status.get('circuit')
+                    if circuit and circuit['state'] != 'closed':
+                        st.warning(f"⚡ Ollama circuit {circuit['state']}: analisis dilewati, "
+                                   f"coba lagi dalam {circuit['retry_after']:.0f}s")
+                    reuse = ollama_status.get('context_reuse')
+                    if reuse and reuse['follow_ups']:
+                        st.caption(f"♻️ Context reuse: {reuse['reused_tokens']} token, "
+                                   f"hemat ~{reuse['prompt_eval_seconds_saved']}s prompt eval")
                     
                     # CrewAI status
                     if health_status.get('crew_agents_ready', False):
                         st.success("✅ CrewAI: Siap")
                     else:
                         st.error("❌ CrewAI: Tidak siap")
+                    
+                    # Adaptive scraper timeouts
+                    for platform, stages in health_status.get('scraper_timeouts', {}).items():
+                        st.caption(f"⏱️ {platform.title()}: " + ", ".join(
+                            f"{stage} {info['timeout']}s" for stage, info in stages.items()))
                 else:
                     st.error("❌ Layanan belum diinisialisasi")
     
@@ -178,6 +209,27 @@ def calculate_total_views(results):
     
     return total_views, platform_views
 
+def revalidate_results(results, key):
+    """Stale-while-revalidate: last known counts for every result now, stale ones refreshed in the background"""
+    revalidator = get_revalidator()
+    if not revalidator:
+        return
+    
+    for result in results:
+        stats = result.get('stats')
+        if result.get('success') and stats and stats.get('url'):
+            revalidator.apply(stats, stats['url'])
+    
+    # Streamlit 1.28 cannot push to the browser, so refreshed values appear on the next rerun
+    pending = revalidator.pending()
+    if pending:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.info(f"🔄 {pending} video sedang diperbarui di background")
+        with col2:
+            if st.button("🔄 Tampilkan data terbaru", key=key):
+                st.rerun()
+
 def display_total_views_summary(results):
     """Display total views summary across all platforms"""
     total_views, platform_views = calculate_total_views(results)
@@ -255,8 +307,30 @@ def display_total_views_summary(results):
         
         st.markdown("---")
 
-def display_analysis_results(result, chart_key=None):
-    """Display analysis results in a formatted way"""
+def write_stream(stream):
+    """Render a ResponseStream as it arrives and return the full text"""
+    if hasattr(st, 'write_stream'):
+        st.write_stream(stream)
+    else:
+        # st.write_stream needs Streamlit 1.31+; older versions redraw a placeholder per chunk
+        placeholder = st.empty()
+        text = ''
+        for chunk in stream:
+            text += chunk
+            placeholder.markdown(text + "▌")
+        placeholder.markdown(text)
+    
+    metrics = stream.metrics
+    if metrics.get('cached'):
+        st.caption("⚡ Dari cache LLM")
+    elif metrics.get('time_to_first_token') is not None:
+        rate = f" · {metrics['tokens_per_sec']} token/detik" if metrics.get('tokens_per_sec') else ""
+        st.caption(f"⏱️ Token pertama {metrics['time_to_first_token']:.1f} detik · "
+                   f"{metrics['tokens']} token dalam {metrics['total_time']:.1f} detik{rate}")
+    return stream.text
+
+def display_analysis_results(result, chart_key=None, analysis_stream=None):
+    """Display analysis results in a formatted way (analysis_stream is rendered while it is generated)"""
     if not result.get('success', False):
         st.error(f"❌ Analisis gagal: {result.get('error', 'Unknown error')}")
         return
@@ -264,8 +338,11 @@ def display_analysis_results(result, chart_key=None):
     stats = result.get('stats', {})
     
     if stats.get('error'):
-        st.error(f"❌ Error dalam scraping: {stats['error']}")
-        return
+        if not has_metrics(stats):
+            st.error(f"❌ Error dalam scraping: {stats['error']}")
+            return
+        # Partial scrape: show what was found, plus the error
+        st.warning(f"⚠️ Sebagian data tidak terbaca: {stats['error']}")
     
     # Display basic info
     col1, col2 = st.columns(2)
@@ -283,6 +360,9 @@ def display_analysis_results(result, chart_key=None):
             st.markdown(f"**Author:** {stats['author']}")
         if stats.get('upload_date'):
             st.markdown(f"**Tanggal Upload:** {stats['upload_date']}")
+        age = age_seconds(stats.get('scraped_at'))
+        if age is not None:
+            st.caption(f"🕒 Data {int(age // 60)} menit lalu" + (" (sedang diperbarui)" if stats.get('cache') == 'stale' else ""))
     
     with col2:
         st.subheader("📊 Statistik")
@@ -307,10 +387,21 @@ def display_analysis_results(result, chart_key=None):
                     st.metric(label=f"{icon} {label}", value=formatted_value)
     
     # Display analysis if available
-    if 'analysis' in result and result['analysis']:
+    if analysis_stream is not None:
+        st.subheader("🤖 Analisis AI")
+        result['analysis'] = result['insights'] = write_stream(analysis_stream)
+        # Follow-up on the streamed analysis' context, so the stats are not encoded again
+        if analysis_stream.session is not None and not analysis_stream.text.startswith('Error'):
+            with st.spinner("💡 Membuat saran konten..."):
+                result['insights'] = analysis_stream.session.content_suggestions()
+    elif 'analysis' in result and result['analysis']:
         st.subheader("🤖 Analisis AI")
         st.markdown(result['analysis'])
     
+    if result.get('insights') and result['insights'] != result.get('analysis'):
+        st.subheader("💡 Saran Konten")
+        st.markdown(result['insights'])
+    
     # Create visualization - always show all 4 metrics
     numeric_data = {
         'views': stats.get('views', 0),
@@ -373,7 +464,9 @@ def main():
             if is_valid:
                 with st.spinner(f"Menganalisis {platform} URL... Mohon tunggu..."):
                     try:
-                        result = st.session_state.crew_service.analyze_single_url(url_input)
+                        # Scrape under the spinner; the AI analysis streams in below the stats
+                        result = st.session_state.crew_service.analyze_single_url(
+                            url_input, hedged=st.session_state.get('hedged_scraping'), include_analysis=False)
                         
                         # Add timestamp
                         result['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -406,7 +499,12 @@ def main():
                                 st.markdown("---")
                         
                         # Display results
-                        display_analysis_results(result)
+                        analysis_stream = None
+                        # Same rule as the CLI: analyse unless the scrape failed without any metric
+                        stats = result.get('stats') or {}
+                        if result.get('success') and (not stats.get('error') or has_metrics(stats)):
+                            analysis_stream = st.session_state.ollama_service.stream_social_media_analysis(result['stats'])
+                        display_analysis_results(result, analysis_stream=analysis_stream)
                         
                     except Exception as e:
                         st.error(f"Error during analysis: {str(e)}")
@@ -465,6 +563,9 @@ def main():
         st.subheader("📈 Riwayat Analisis")
         
         if st.session_state.analysis_results:
+            # Show the last known numbers at once and refresh expired ones in the background
+            revalidate_results(st.session_state.analysis_results, key="revalidate_history")
+            
             # Display total views summary from all history
             display_total_views_summary(st.session_state.analysis_results)
             
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark biaya per command: Selenium (chromedriver HTTP) vs CDP websocket langsung
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from selenium.webdriver.common.by import By
+from scrapers.youtube_scraper import YouTubeScraper
+from scrapers.cdp_transport import CDPTransport
+
+def time_command(label, func, iterations):
+    """Jalankan command berulang kali dan kembalikan rata-rata ms per command"""
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+    print(f"  {label:<45} {elapsed_ms:8.2f} ms")
+    return elapsed_ms
+
+def run_benchmark(url, iterations):
+    """Bandingkan evaluasi, pencarian elemen, screenshot dan navigasi di kedua transport"""
+    print(f"URL: {url}")
+    print(f"Iterasi per command: {iterations}\n")
+
+    with YouTubeScraper(headless=True) as scraper:
+        driver = scraper.driver
+        cdp = scraper.cdp or CDPTransport.from_driver(driver).connect()
+
+        try:
+            driver.get(url)
+            time.sleep(3)
+
+            results = []
+
+            print("=== Evaluate (document.title) ===")
+            selenium_ms = time_command("Selenium execute_script", lambda: driver.execute_script("return document.title"), iterations)
+            cdp_ms = time_command("CDP Runtime.evaluate", lambda: cdp.evaluate("document.title"), iterations)
+            results.append(("evaluate", selenium_ms, cdp_ms))
+
+            # Sama-sama satu command per link, supaya yang diukur biaya per command, bukan batching
+            links = driver.find_elements(By.TAG_NAME, 'a')[:50]
+            count = len(links)
+            print(f"\n=== Attribute per link ({count} command) ===")
+            def selenium_links():
+                for element in links:
+                    element.get_attribute('href')
+            def cdp_links():
+                for index in range(count):
+                    cdp.evaluate(f"document.querySelectorAll('a')[{index}].href")
+            selenium_ms = time_command(f"Selenium {count}x get_attribute", selenium_links, max(1, iterations // 10))
+            cdp_ms = time_command(f"CDP {count}x Runtime.evaluate", cdp_links, max(1, iterations // 10))
+            results.append((f"{count} attributes", selenium_ms, cdp_ms))
+
+            print(f"\n=== Attribute batched ({count} link, 1 command) ===")
+            batch_script = f"Array.from(document.querySelectorAll('a')).slice(0, {count}).map(a => a.href)"
+            selenium_ms = time_command("Selenium execute_script (batch)",
+                                       lambda: driver.execute_script(f"return {batch_script}"), max(1, iterations // 10))
+            cdp_ms = time_command("CDP Runtime.evaluate (batch)", lambda: cdp.evaluate(batch_script), max(1, iterations // 10))
+            results.append(("batched attrs", selenium_ms, cdp_ms))
+
+            print("\n=== Screenshot ===")
+            selenium_ms = time_command("Selenium get_screenshot_as_base64", driver.get_screenshot_as_base64, max(1, iterations // 10))
+            cdp_ms = time_command("CDP Page.captureScreenshot", cdp.screenshot, max(1, iterations // 10))
+            results.append(("screenshot", selenium_ms, cdp_ms))
+
+            print("\n=== Navigation (about:blank) ===")
+            selenium_ms = time_command("Selenium get", lambda: driver.get('about:blank'), max(1, iterations // 10))
+            cdp_ms = time_command("CDP Page.navigate", lambda: cdp.navigate('about:blank'), max(1, iterations // 10))
+            results.append(("navigate", selenium_ms, cdp_ms))
+
+            print("\n=== RINGKASAN ===")
+            print(f"  {'command':<15} {'selenium ms':>12} {'cdp ms':>10} {'speedup':>9}")
+            for name, selenium_ms, cdp_ms in results:
+                speedup = selenium_ms / cdp_ms if cdp_ms else float('inf')
+                print(f"  {name:<15} {selenium_ms:12.2f} {cdp_ms:10.2f} {speedup:8.1f}x")
+        finally:
+            if cdp is not scraper.cdp:
+                cdp.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark Selenium vs direct CDP transport')
+    parser.add_argument('--url', default='https://www.youtube.com/watch?v=dQw4w9WgXcQ', help='Halaman untuk benchmark')
+    parser.add_argument('--iterations', type=int, default=100, help='Jumlah iterasi per command')
+    args = parser.parse_args()
+
+    run_benchmark(args.url, args.iterations)
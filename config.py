@@ -7,6 +7,35 @@ class Config:
     # Ollama Configuration
     OLLAMA_BASE_URL = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
     OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'llama2')
+    # How long Ollama keeps a model in memory after each call (duration like '30m', seconds, or -1 = forever)
+    OLLAMA_KEEP_ALIVE = os.getenv('OLLAMA_KEEP_ALIVE', '30m')
+    if OLLAMA_KEEP_ALIVE.lstrip('-').isdigit():
+        OLLAMA_KEEP_ALIVE = int(OLLAMA_KEEP_ALIVE)
+    # Load the text and vision models in the background at startup (empty vision model = first installed one)
+    OLLAMA_WARMUP = os.getenv('OLLAMA_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+    OLLAMA_WARMUP_TIMEOUT = float(os.getenv('OLLAMA_WARMUP_TIMEOUT', '300'))
+    OLLAMA_VISION_MODEL = os.getenv('OLLAMA_VISION_MODEL', '')
+    # Concurrent analyses sent to Ollama in batch runs; match the server's OLLAMA_NUM_PARALLEL
+    OLLAMA_NUM_PARALLEL = int(os.getenv('OLLAMA_NUM_PARALLEL', '4'))
+    # Per-endpoint timeouts in seconds: text generation, vision generation, and model listing / ps
+    OLLAMA_TIMEOUT = float(os.getenv('OLLAMA_TIMEOUT', '30'))
+    OLLAMA_VISION_TIMEOUT = float(os.getenv('OLLAMA_VISION_TIMEOUT', '60'))
+    OLLAMA_TAGS_TIMEOUT = float(os.getenv('OLLAMA_TAGS_TIMEOUT', '5'))
+    # Pooled connections of the async client (requests in flight at once)
+    OLLAMA_MAX_CONNECTIONS = int(os.getenv('OLLAMA_MAX_CONNECTIONS', '20'))
+    # Circuit breaker: after this many failed Ollama calls in a row, analyses are skipped at once
+    # until a probe call is let through OLLAMA_BREAKER_RESET seconds later
+    OLLAMA_BREAKER_ENABLED = os.getenv('OLLAMA_BREAKER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    OLLAMA_BREAKER_FAILURES = int(os.getenv('OLLAMA_BREAKER_FAILURES', '3'))
+    OLLAMA_BREAKER_RESET = float(os.getenv('OLLAMA_BREAKER_RESET', '30'))
+    # Seconds to wait for the next chunk of a streamed generation (not for the whole answer)
+    OLLAMA_STREAM_TIMEOUT = float(os.getenv('OLLAMA_STREAM_TIMEOUT', '120'))
+    
+    # LLM response cache by (model, prompt hash, options): LRU in memory, SQLite on disk when a path is set
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', '')
+    LLM_CACHE_MEMORY_SIZE = int(os.getenv('LLM_CACHE_MEMORY_SIZE', '256'))
+    LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', '86400'))
     
     # CrewAI Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -20,9 +49,65 @@ class Config:
     SELENIUM_TIMEOUT = 30
     HEADLESS_BROWSER = True
     
+    # Scraping backend for batches: 'selenium' or 'playwright' (one browser, one context per URL)
+    SCRAPER_BACKEND = os.getenv('SCRAPER_BACKEND', 'selenium')
+    PLAYWRIGHT_MAX_CONCURRENCY = int(os.getenv('PLAYWRIGHT_MAX_CONCURRENCY', '8'))
+    SELENIUM_MAX_CONCURRENCY = int(os.getenv('SELENIUM_MAX_CONCURRENCY', '1'))  # one Chrome per in-flight URL
+    
+    # Remote WebDriver endpoints (Selenium Grid hubs or standalone servers), comma-separated;
+    # empty means a local Chrome. Sessions go to the endpoint with the most free slots.
+    SELENIUM_REMOTE_URLS = [u.strip() for u in os.getenv('SELENIUM_REMOTE_URLS', '').split(',') if u.strip()]
+    
+    # Talk to Chrome's DevTools websocket directly for navigation/evaluation/screenshots
+    CDP_TRANSPORT = os.getenv('CDP_TRANSPORT', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Single-URL requests can race a plain HTTP fetch of the page against the browser scrape;
+    # HEDGE_DELAY seconds after the HTTP request the browser starts too (0 = both at once)
+    HEDGED_SCRAPING = os.getenv('HEDGED_SCRAPING', 'false').lower() in ('1', 'true', 'yes')
+    HEDGE_DELAY = float(os.getenv('HEDGE_DELAY', '0'))
+    
+    # Pin the UI language/region of every page (e.g. en-US) so extraction can use one language;
+    # empty keeps whatever locale the session lands in
+    SCRAPER_LOCALE = os.getenv('SCRAPER_LOCALE', '')
+    
+    # Navigation / content timeouts follow each platform's rolling p95 page-ready latency,
+    # kept within [TIMEOUT_MIN, TIMEOUT_MAX] seconds; fixed timeouts are used until enough samples exist
+    ADAPTIVE_TIMEOUTS = os.getenv('ADAPTIVE_TIMEOUTS', 'true').lower() in ('1', 'true', 'yes')
+    TIMEOUT_MIN = float(os.getenv('TIMEOUT_MIN', '5'))
+    TIMEOUT_MAX = float(os.getenv('TIMEOUT_MAX', '60'))
+    TIMEOUT_P95_MULTIPLIER = float(os.getenv('TIMEOUT_P95_MULTIPLIER', '1.5'))
+    
+    # Result cache of successful scrapes by canonical video ID: LRU in memory over SQLite on disk
+    # (empty path = memory only). Freshness in seconds per field group; callers may pass max_age instead.
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RESULT_CACHE_PATH = os.getenv('RESULT_CACHE_PATH', 'scrape_cache.db')
+    RESULT_CACHE_MEMORY_SIZE = int(os.getenv('RESULT_CACHE_MEMORY_SIZE', '512'))
+    RESULT_CACHE_FRESHNESS = {
+        name.strip(): float(seconds)
+        for name, seconds in (item.split('=') for item in os.getenv(
+            'RESULT_CACHE_FRESHNESS', 'counts=900,metadata=604800'
+        ).split(',') if '=' in item)
+    }
+    
+    # Stale-while-revalidate for dashboards: show cached stats of any age at once and
+    # rescrape expired ones on REVALIDATE_WORKERS background threads
+    STALE_WHILE_REVALIDATE = os.getenv('STALE_WHILE_REVALIDATE', 'true').lower() in ('1', 'true', 'yes')
+    REVALIDATE_WORKERS = int(os.getenv('REVALIDATE_WORKERS', '2'))
+    
+    # Negative cache: URLs that failed permanently are skipped until their error class's
+    # re-check interval (seconds) passes; empty path keeps it in memory for this process
+    NEGATIVE_CACHE_ENABLED = os.getenv('NEGATIVE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    NEGATIVE_CACHE_PATH = os.getenv('NEGATIVE_CACHE_PATH', '')
+    NEGATIVE_CACHE_TTLS = {
+        name.strip(): float(seconds)
+        for name, seconds in (item.split('=') for item in os.getenv(
+            'NEGATIVE_CACHE_TTLS', 'unavailable=86400,private=43200,login_wall=21600,unsupported=604800'
+        ).split(',') if '=' in item)
+    }
+    
     # Rate Limiting
-    REQUEST_DELAY = 2  # seconds between requests
-    MAX_RETRIES = 3
+    REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '2'))  # base backoff between retries (seconds)
+    MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))  # retries after the first attempt
     
     # Supported Platforms
     SUPPORTED_PLATFORMS = ['youtube', 'tiktok', 'facebook']
@@ -16,6 +16,7 @@ from utils.url_detector import URLDetector
 from scrapers.youtube_scraper import YouTubeScraper
 from scrapers.tiktok_scraper import TikTokScraper
 from scrapers.facebook_scraper import FacebookScraper
+from scrapers import ScraperFactory
 
 def get_scraper(platform: str):
     """Mendapatkan scraper yang sesuai berdasarkan platform"""
@@ -120,7 +121,7 @@ def calculate_completeness_score(stats) -> Dict[str, Any]:
         'missing_fields': missing_fields
     }
 
-def extract_video_details(url: str, save_to_file: bool = False) -> Dict[str, Any]:
+def extract_video_details(url: str, save_to_file: bool = False, max_age: float = None) -> Dict[str, Any]:
     """Ekstrak detail lengkap video dari URL"""
     print(f"\n🔍 Menganalisis URL: {url}")
     print("=" * 80)
@@ -135,12 +136,11 @@ def extract_video_details(url: str, save_to_file: bool = False) -> Dict[str, Any
     print(f"📱 Platform: {platform.upper()}")
     
     try:
-        # Inisialisasi scraper
-        scraper = get_scraper(platform)
+        # Validasi platform, lalu scrape lewat backend yang dikonfigurasi (wrapper sinkron)
+        get_scraper(platform)
         
         print("\n⏳ Mengekstrak metadata video...")
-        with scraper:
-            stats = scraper.scrape(url)
+        stats = ScraperFactory.create_async_scraper(timeout=30).scrape_sync(url, max_age=max_age)
         
         if not stats:
             error_msg = "Gagal mengekstrak data dari video"
@@ -209,7 +209,8 @@ def extract_video_details(url: str, save_to_file: bool = False) -> Dict[str, Any
                 'views': stats.views,
                 'likes': stats.likes,
                 'comments': stats.comments,
-                'shares': stats.shares
+                'shares': stats.shares,
+                'scraped_at': stats.scraped_at
             },
             'upload_date': date_analysis,
             'completeness': completeness,
@@ -154,6 +154,9 @@ LANGUAGE_CONFIG = {
     'ai_unavailable': '⚠️ Analisis AI tidak tersedia',
     'stats_unavailable': 'Data statistik tidak tersedia',
     'history_cleared': '✅ Riwayat berhasil dihapus!',
+    'data_age': 'Data {minutes} menit lalu',
+    'refreshing_count': '🔄 {count} video sedang diperbarui di background',
+    'show_latest': '🔄 Tampilkan data terbaru',
     'extraction_success': '🎉 Ekstraksi berhasil!',
     'fill_creator_warning': '⚠️ Harap isi Nama Pembuat Video dan Nama Akun sebelum menyimpan ke database',
     'data_saved_success': '✅ Data berhasil disimpan ke database MongoDB!',
@@ -154,6 +154,9 @@ LANGUAGE_CONFIG = {
     'ai_unavailable': '⚠️ AI分析不可用',
     'stats_unavailable': '统计数据不可用',
     'history_cleared': '✅ 历史记录已清除！',
+    'data_age': '数据来自 {minutes} 分钟前',
+    'refreshing_count': '🔄 {count} 个视频正在后台更新',
+    'show_latest': '🔄 显示最新数据',
     'extraction_success': '🎉 提取成功！',
     'fill_creator_warning': '⚠️ 保存到数据库前请填写视频创作者姓名和账户名',
     'data_saved_success': '✅ 数据已成功保存到MongoDB数据库！',
@@ -9,6 +9,7 @@ import json
 import sys
 from typing import List
 from services import CrewService, OllamaService
+from scrapers.base_scraper import has_metrics
 from utils import URLDetector
 from config import Config
 
@@ -40,16 +41,49 @@ def check_services():
             if health_status['models_available']:
                 print(f"  • Available Models: {', '.join(health_status['models_available'])}")
         
+        for model, info in health_status.get('models', {}).items():
+            load = f", last load {info['load_seconds']}s" if info.get('load_seconds') is not None else ''
+            print(f"  • {model}: {'✅ Resident' if info['resident'] else '💤 Not in memory'}{load}")
+        
+        cache_stats = health_status.get('response_cache')
+        if cache_stats:
+            print(f"  • LLM Cache: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+                  f"({cache_stats['hit_rate']:.0%}), {cache_stats['size']} entri")
+        
+        circuit = health_status.get('circuit')
+        if circuit and circuit['state'] != 'closed':
+            print(f"  • Circuit Breaker: {circuit['state']} setelah {circuit['failures']} kegagalan, "
+                  f"analisis dilewati (coba lagi dalam {circuit['retry_after']:.0f}s)")
+        
+        reuse = health_status.get('context_reuse')
+        if reuse and reuse['follow_ups']:
+            print(f"  • Context Reuse: {reuse['follow_ups']} follow-up, {reuse['reused_tokens']} token "
+                  f"tidak di-encode ulang (~{reuse['prompt_eval_seconds_saved']}s prompt eval)")
+        
         if health_status['error']:
             print(f"  • Error: {health_status['error']}")
         
+        from scrapers import ScraperFactory
+        for platform, stages in ScraperFactory.timeout_status().items():
+            parts = []
+            for stage, info in stages.items():
+                observed = f"p50 {info['p50']:.1f}s / p95 {info['p95']:.1f}s" if info['samples'] else 'belum ada sampel'
+                parts.append(f"{stage} {info['timeout']}s ({observed})")
+            print(f"  • Timeout {platform.title()}: {', '.join(parts)}")
+        
+        if Config.SELENIUM_REMOTE_URLS:
+            from scrapers.remote_grid import get_node_pool
+            for endpoint, free in get_node_pool(Config.SELENIUM_REMOTE_URLS).capacities().items():
+                state = '❌ Unreachable' if free is None else f"✅ {free} free slot(s)"
+                print(f"  • Selenium node {endpoint}: {state}")
+        
         return health_status['service_available'] and health_status['model_loaded']
         
     except Exception as e:
         print(f"❌ Error checking services: {str(e)}")
         return False
 
-def analyze_url(url: str, verbose: bool = False) -> dict:
+def analyze_url(url: str, verbose: bool = False, max_age: float = None) -> dict:
     """Analyze a single URL"""
     print(f"\n🔍 Analyzing URL: {url}")
     
@@ -70,13 +104,20 @@ def analyze_url(url: str, verbose: bool = False) -> dict:
         print("🤖 Initializing AI agents...")
         crew_service = CrewService()
         
-        # Perform analysis
+        # Scrape first, then stream the AI analysis while it is generated
         print("📊 Performing analysis...")
-        result = crew_service.analyze_single_url(url)
+        result = crew_service.analyze_single_url(url, max_age=max_age, include_analysis=False)
         
         if result['success']:
             print("✅ Analysis completed successfully!")
-            display_results(result, verbose)
+            stream = None
+            stats = result['stats']
+            if stats.get('error') and not has_metrics(stats):
+                print(f"⚠️ AI analysis skipped: no metrics were scraped ({stats['error']})")
+            else:
+                # Partial results (some metrics plus an error) are still analysed
+                stream = crew_service.ollama_service.stream_social_media_analysis(stats)
+            display_results(result, verbose, stream)
         else:
             print(f"❌ Analysis failed: {result.get('error', 'Unknown error')}")
         
@@ -87,7 +128,7 @@ def analyze_url(url: str, verbose: bool = False) -> dict:
         print(f"❌ {error_msg}")
         return {'success': False, 'error': error_msg}
 
-def analyze_multiple_urls(urls: List[str], verbose: bool = False) -> dict:
+def analyze_multiple_urls(urls: List[str], verbose: bool = False, backend: str = None, max_age: float = None) -> dict:
     """Analyze multiple URLs"""
     print(f"\n🔍 Analyzing {len(urls)} URLs...")
     
@@ -98,7 +139,7 @@ def analyze_multiple_urls(urls: List[str], verbose: bool = False) -> dict:
         
         # Perform analysis
         print("📊 Performing batch analysis...")
-        results = crew_service.analyze_multiple_urls(urls)
+        results = crew_service.analyze_multiple_urls(urls, backend=backend, max_age=max_age)
         
         print(f"\n📋 Analysis Summary:")
         print(f"  • Total URLs: {results['total_analyzed']}")
@@ -125,8 +166,44 @@ def analyze_multiple_urls(urls: List[str], verbose: bool = False) -> dict:
         print(f"❌ {error_msg}")
         return {'success': False, 'error': error_msg}
 
-def display_results(result: dict, verbose: bool = False):
-    """Display analysis results"""
+def analyze_listing(url: str, limit: int = None, fields: List[str] = None, verbose: bool = False) -> dict:
+    """Analyze every video of a channel, playlist or profile URL"""
+    print(f"\n🔍 Expanding listing: {url}")
+    
+    listing_info = URLDetector.validate_listing_url(url)
+    if not listing_info['valid']:
+        print(f"❌ Invalid listing URL: {listing_info['error']}")
+        return {'success': False, 'error': listing_info['error']}
+    
+    print(f"✅ {listing_info['platform'].title()} {listing_info['listing_type']} detected: {listing_info['listing_id']}")
+    
+    try:
+        crew_service = CrewService()
+        
+        print("📊 Collecting listing metrics...")
+        results = crew_service.analyze_listing(url, limit=limit, fields=fields, include_analysis=verbose)
+        
+        if results.get('error'):
+            print(f"❌ Listing failed: {results['error']}")
+            return results
+        
+        print(f"\n📋 Listing Summary:")
+        print(f"  • Videos found: {results['total_analyzed']}")
+        print(f"  • Successful: {results['successful_analyses']}")
+        
+        for i, result in enumerate(results['individual_results'], 1):
+            print(f"\n--- Video {i} ---")
+            display_results(result, verbose)
+        
+        return results
+        
+    except Exception as e:
+        error_msg = f"Error during listing analysis: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {'success': False, 'error': error_msg}
+
+def display_results(result: dict, verbose: bool = False, analysis_stream=None):
+    """Display analysis results (an analysis_stream is printed token by token as it arrives)"""
     if not result.get('success', False):
         return
     
@@ -168,9 +245,37 @@ def display_results(result: dict, verbose: bool = False):
             print(f"  • {icon} {label}: {formatted_value}")
     
     # AI Analysis
-    if 'analysis' in result and result['analysis'] and verbose:
+    if analysis_stream is not None:
+        if verbose:
+            print(f"\n🤖 AI Analysis:")
+        else:
+            print(f"\n🤖 Generating AI analysis...")
+        for chunk in analysis_stream:
+            if verbose:
+                print(chunk, end='', flush=True)
+        if verbose:
+            print()
+        result['analysis'] = result['insights'] = analysis_stream.text
+        
+        # Follow-up on the streamed analysis' context, so the stats are not encoded again
+        if verbose and analysis_stream.session is not None and not analysis_stream.text.startswith('Error'):
+            result['insights'] = analysis_stream.session.content_suggestions()
+            print(f"\n💡 Content Suggestions:")
+            print(result['insights'])
+        
+        metrics = analysis_stream.metrics
+        if metrics.get('cached'):
+            print("  ⚡ Served from LLM cache")
+        elif metrics.get('time_to_first_token') is not None:
+            rate = f", {metrics['tokens_per_sec']} tokens/s" if metrics.get('tokens_per_sec') else ''
+            print(f"  ⏱️ First token {metrics['time_to_first_token']:.1f}s, "
+                  f"{metrics['tokens']} tokens in {metrics['total_time']:.1f}s{rate}")
+    elif 'analysis' in result and result['analysis'] and verbose:
         print(f"\n🤖 AI Analysis:")
         print(result['analysis'])
+        if result.get('insights') and result['insights'] != result['analysis']:
+            print(f"\n💡 Content Suggestions:")
+            print(result['insights'])
     
     # JSON output for verbose mode
     if verbose:
@@ -187,6 +292,9 @@ Examples:
   python main.py --check                                    # Check services
   python main.py --url "https://youtube.com/watch?v=..."    # Analyze single URL
   python main.py --file urls.txt                           # Analyze URLs from file
+  python main.py --file urls.txt --backend playwright      # Scrape the file concurrently with Playwright
+  python main.py --file urls.txt --max-age 3600            # Reuse cached results up to an hour old
+  python main.py --listing "https://youtube.com/@channel"  # Analyze all videos of a channel
   python main.py --url "..." --verbose                     # Detailed output
   python main.py --web                                     # Launch web interface
         """
@@ -194,6 +302,11 @@ Examples:
     
     parser.add_argument('--url', '-u', type=str, help='Single URL to analyze')
     parser.add_argument('--file', '-f', type=str, help='File containing URLs (one per line)')
+    parser.add_argument('--listing', '-l', type=str, help='Channel, playlist or profile URL to expand')
+    parser.add_argument('--limit', type=int, help='Maximum number of videos to take from a listing')
+    parser.add_argument('--fields', type=str, help='Comma-separated fields to deep-scrape when missing from a listing (e.g. likes,comments)')
+    parser.add_argument('--backend', choices=['selenium', 'playwright'], help='Scraping backend (default: SCRAPER_BACKEND)')
+    parser.add_argument('--max-age', type=float, help='Accept cached results up to this many seconds old (0 = always scrape)')
     parser.add_argument('--check', '-c', action='store_true', help='Check service status')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--web', '-w', action='store_true', help='Launch web interface')
@@ -201,6 +314,9 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.backend:
+        Config.SCRAPER_BACKEND = args.backend
+    
     # Print banner
     print_banner()
     
@@ -228,11 +344,19 @@ Examples:
         print("2. Run: ollama pull llama2")
         sys.exit(1)
     
+    # Load the models while the first pages are scraped, so the first analysis does not wait for it
+    OllamaService().warm_up_in_background()
+    
     results = None
     
     # Analyze single URL
     if args.url:
-        results = analyze_url(args.url, args.verbose)
+        results = analyze_url(args.url, args.verbose, args.max_age)
+    
+    # Expand channel / playlist / profile URL
+    elif args.listing:
+        fields = [f.strip() for f in args.fields.split(',') if f.strip()] if args.fields else None
+        results = analyze_listing(args.listing, args.limit, fields, args.verbose)
     
     # Analyze URLs from file
     elif args.file:
@@ -244,7 +368,7 @@ Examples:
                 print(f"❌ No URLs found in file: {args.file}")
                 sys.exit(1)
             
-            results = analyze_multiple_urls(urls, args.verbose)
+            results = analyze_multiple_urls(urls, args.verbose, args.backend, args.max_age)
             
         except FileNotFoundError:
             print(f"❌ File not found: {args.file}")
@@ -2,6 +2,10 @@ from .base_scraper import BaseScraper, SocialMediaStats
 from .youtube_scraper import YouTubeScraper
 from .tiktok_scraper import TikTokScraper
 from .facebook_scraper import FacebookScraper
+from .async_scraper import AsyncScraper, ScrapeSession, SeleniumAsyncScraper, run_sync
+from .playwright_backend import PlaywrightBackend
+from .http_extractor import HttpExtractor
+from .hedged import HedgedScraper
 
 class ScraperFactory:
     """Factory class to create appropriate scraper based on platform"""
@@ -21,6 +25,32 @@ class ScraperFactory:
         scraper_class = cls.SCRAPERS[platform]
         return scraper_class(**kwargs)
     
+    @classmethod
+    def create_async_scraper(cls, backend: str = None, **kwargs) -> AsyncScraper:
+        """Create the async scraper for a backend ('selenium' or 'playwright', default Config.SCRAPER_BACKEND)"""
+        from config import Config
+        
+        backend = backend or Config.SCRAPER_BACKEND
+        if backend == 'playwright':
+            return PlaywrightBackend(**kwargs)
+        if backend == 'selenium':
+            return SeleniumAsyncScraper(**kwargs)
+        raise ValueError(f"Unsupported scraper backend: {backend}")
+    
+    @classmethod
+    def create_hedged_scraper(cls, backend: str = None, hedge_delay: float = None, **kwargs) -> AsyncScraper:
+        """HTTP fast path raced against the browser backend; first complete result wins"""
+        return HedgedScraper(HttpExtractor(), cls.create_async_scraper(backend, **kwargs), hedge_delay)
+    
+    @classmethod
+    def timeout_status(cls):
+        """Current adaptive timeouts with the p50/p95 latencies behind them, per platform and stage"""
+        from .latency import latency_tracker
+        
+        return latency_tracker.snapshot({
+            platform: scraper_class.timeout_defaults() for platform, scraper_class in cls.SCRAPERS.items()
+        })
+    
     @classmethod
     def get_supported_platforms(cls):
         """Get list of supported platforms"""
@@ -32,5 +62,12 @@ __all__ = [
     'YouTubeScraper',
     'TikTokScraper',
     'FacebookScraper',
-    'ScraperFactory'
+    'ScraperFactory',
+    'AsyncScraper',
+    'ScrapeSession',
+    'SeleniumAsyncScraper',
+    'PlaywrightBackend',
+    'HttpExtractor',
+    'HedgedScraper',
+    'run_sync'
 ]
\ No newline at end of file
@@ -0,0 +1,195 @@
+import asyncio
+import concurrent.futures
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Any, Callable, Coroutine, List, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .base_scraper import BaseScraper, SocialMediaStats
+from .single_flight import in_flight
+
+# Long-lived worker threads for blocking Selenium calls: asyncio.run() waits for its default
+# executor on shutdown, which would block on a scrape whose result is no longer wanted
+SELENIUM_EXECUTOR = concurrent.futures.ThreadPoolExecutor(thread_name_prefix='selenium-scrape')
+
+# Called with (url, stats) as soon as each URL of a batch is done, e.g. to start its analysis
+ResultCallback = Callable[[str, SocialMediaStats], None]
+
+def run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine from synchronous code, also when the calling thread already runs an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+class ScrapeSession:
+    """Browser state owned by a single scrape call, never stored on a shared scraper"""
+
+    def __init__(self, platform: str, headless: bool = True, timeout: int = 30):
+        self.platform = platform
+        self.headless = headless
+        self.timeout = timeout
+        self.scraper: Optional[BaseScraper] = None
+
+    @property
+    def driver(self):
+        return self.scraper.driver if self.scraper else None
+
+    def open(self) -> 'ScrapeSession':
+        """Create the platform scraper and its WebDriver for this session"""
+        from . import ScraperFactory
+
+        self.scraper = ScraperFactory.create_scraper(self.platform, headless=self.headless, timeout=self.timeout)
+        self.scraper.setup_driver()
+        return self
+
+    def close(self):
+        """Quit the session's WebDriver"""
+        if self.scraper:
+            self.scraper.close_driver()
+            self.scraper = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class AsyncScraper(ABC):
+    """Async scraper contract: all per-call state lives in the session, so one instance serves many coroutines"""
+
+    def __init__(self, headless: bool = True, timeout: int = 30, max_concurrency: Optional[int] = None):
+        self.headless = headless
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency or 1
+
+    async def start(self):
+        """Acquire shared resources (e.g. a browser process)"""
+
+    async def close(self):
+        """Release shared resources"""
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @abstractmethod
+    async def scrape(self, url: str, session: Optional[Any] = None) -> SocialMediaStats:
+        """Scrape one URL, opening a session for the call unless one is passed in"""
+
+    def cached_result(self, url: str, max_age: Optional[float] = None) -> Optional[SocialMediaStats]:
+        """Known-dead URL from the negative cache, or a fresh enough result from the result cache"""
+        from .negative_cache import get_negative_cache
+        from .result_cache import get_result_cache
+
+        negative = get_negative_cache()
+        cached = negative.lookup(url) if negative else None
+        if cached:
+            return cached
+        results = get_result_cache()
+        return results.get(url, max_age) if results else None
+
+    def remember_result(self, stats: SocialMediaStats):
+        """Store successes in the result cache and permanent failures in the negative cache"""
+        from .negative_cache import get_negative_cache
+        from .result_cache import get_result_cache
+
+        negative = get_negative_cache()
+        if negative:
+            negative.record(stats)
+        results = get_result_cache()
+        if results:
+            results.put(stats)
+
+    async def scrape_or_skip(self, url: str, session: Optional[Any] = None,
+                             max_age: Optional[float] = None) -> SocialMediaStats:
+        """scrape() behind the caches: cached results and known-dead URLs return without a browser"""
+        cached = self.cached_result(url, max_age)
+        if cached:
+            return cached
+        return await self.scrape_shared(url, session)
+
+    async def scrape_shared(self, url: str, session: Optional[Any] = None,
+                            slots: Optional[asyncio.Semaphore] = None) -> SocialMediaStats:
+        """scrape() coalesced per video: concurrent callers in any thread wait on one scrape (cache='shared')"""
+        async def lead():
+            if slots is None:
+                stats = await self.scrape(url, session)
+            else:
+                async with slots:
+                    stats = await self.scrape(url, session)
+            self.remember_result(stats)
+            return stats
+
+        key = URLDetector.canonical_id(url)
+        if not key:
+            return await lead()
+        stats, shared = await in_flight.run(key, lead)
+        return replace(stats, url=url, cache='shared') if shared else stats
+
+    async def scrape_many(self, urls: List[str], max_age: Optional[float] = None,
+                          on_result: Optional[ResultCallback] = None) -> List[SocialMediaStats]:
+        """Scrape URLs concurrently (at most max_concurrency at once), keeping input order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(url):
+            # Cached and already in-flight URLs are answered without taking a slot
+            stats = self.cached_result(url, max_age)
+            if not stats:
+                stats = await self.scrape_shared(url, slots=semaphore)
+            if on_result:
+                on_result(url, stats)
+            return stats
+
+        return list(await asyncio.gather(*(bounded(url) for url in urls)))
+
+    def scrape_sync(self, url: str, max_age: Optional[float] = None) -> SocialMediaStats:
+        """Blocking wrapper around scrape() for synchronous callers (max_age accepts older cached counts)"""
+        cached = self.cached_result(url, max_age)
+        if cached:
+            return cached
+
+        async def run():
+            async with self:
+                return await self.scrape_or_skip(url, max_age=max_age)
+
+        return run_sync(run())
+
+    def scrape_many_sync(self, urls: List[str], max_age: Optional[float] = None,
+                         on_result: Optional[ResultCallback] = None) -> List[SocialMediaStats]:
+        """Blocking wrapper around scrape_many() for synchronous callers"""
+        async def run():
+            async with self:
+                return await self.scrape_many(urls, max_age, on_result)
+
+        return run_sync(run())
+
+class SeleniumAsyncScraper(AsyncScraper):
+    """Async adapter for the Selenium scrapers: each call runs in a worker thread with its own session"""
+
+    def __init__(self, headless: bool = True, timeout: int = 30, max_concurrency: Optional[int] = None):
+        super().__init__(headless, timeout, max_concurrency or Config.SELENIUM_MAX_CONCURRENCY)
+
+    def _scrape_blocking(self, url: str, session: Optional[ScrapeSession]) -> SocialMediaStats:
+        if session is not None:
+            return session.scraper.scrape_with_retry(url)
+
+        url_info = URLDetector.validate_url(url)
+        if not url_info['valid']:
+            return SocialMediaStats(platform='unknown', url=url, error=f"Invalid URL: {url_info['error']}",
+                                    error_type='unsupported')
+
+        with ScrapeSession(url_info['platform'], headless=self.headless, timeout=self.timeout) as own_session:
+            return own_session.scraper.scrape_with_retry(url)
+
+    async def scrape(self, url: str, session: Optional[ScrapeSession] = None) -> SocialMediaStats:
+        """Scrape without blocking the event loop while Selenium waits on the page"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(SELENIUM_EXECUTOR, self._scrape_blocking, url, session)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 import time
 import requests
 from selenium import webdriver
@@ -10,6 +10,23 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
+from config import Config
+from .cdp_transport import CDPTransport
+from .network_capture import NetworkCapture, execute_cdp
+from .locale_pin import accept_language, locale_cookies, metric_words, pin_url, split_locale
+from .remote_grid import get_node_pool
+from .payload_utils import decode_documents
+from .latency import latency_tracker
+from .errors import BrowserCrashError, classify_exception
+from .page_state import CONSENT_DISMISSED, LOGIN_PROMPT, blocker_selectors, page_state_script, raise_for_page_state
+
+# Count fields; a scrape with at least one of them is analysed even when it also carries an error
+METRIC_FIELDS = ('views', 'likes', 'shares', 'comments')
+
+def has_metrics(stats_data: Dict) -> bool:
+    """True when a stats dict (SocialMediaStats.to_dict()) holds at least one count"""
+    return any((stats_data or {}).get(name) is not None for name in METRIC_FIELDS)
 
 @dataclass
 class SocialMediaStats:
@@ -24,6 +41,15 @@ class SocialMediaStats:
     author: Optional[str] = None
     upload_date: Optional[str] = None
     error: Optional[str] = None
+    error_type: Optional[str] = None  # timeout, login_wall, captcha, consent, unavailable, private, element_missing, browser_crash, unsupported, unknown
+    retry_count: int = 0
+    scrape_time: Optional[float] = None  # seconds over all attempts
+    cache: Optional[str] = None  # 'hit'/'stale' (result cache), 'negative' (negative cache) or 'shared' (joined another caller's scrape)
+    scraped_at: Optional[str] = None  # when the counts were scraped (ISO time)
+    
+    def has_metrics(self) -> bool:
+        """At least one count was scraped (partial results with an error included)"""
+        return any(getattr(self, name) is not None for name in METRIC_FIELDS)
     
     def to_dict(self) -> Dict:
         return {
@@ -36,16 +62,40 @@ class SocialMediaStats:
             'title': self.title,
             'author': self.author,
             'upload_date': self.upload_date,
-            'error': self.error
+            'error': self.error,
+            'error_type': self.error_type,
+            'retry_count': self.retry_count,
+            'scrape_time': self.scrape_time,
+            'cache': self.cache,
+            'scraped_at': self.scraped_at
         }
 
 class BaseScraper(ABC):
     """Base class for social media scrapers"""
     
+    PLATFORM = None
+    
+    # URL regexes of XHR/fetch responses to capture from the network log
+    CAPTURE_PATTERNS = []
+    # Page scripts (execute_script bodies) returning embedded JSON text or lists of texts
+    PAGE_PAYLOAD_SCRIPTS = []
+    # Signs of login walls, captchas and consent pages (keys in page_state.MARKER_KEYS)
+    PAGE_STATE_MARKERS = {}
+    CONSENT_DISMISS_WAIT = 2
+    # Fixed timeouts used until the latency tracker has enough samples (None = self.timeout)
+    PAGE_LOAD_TIMEOUT = None
+    CONTENT_TIMEOUT = 10
+    
     def __init__(self, headless: bool = True, timeout: int = 30):
         self.headless = headless
         self.timeout = timeout
         self.driver = None
+        self.network_capture = None
+        self.cdp = None
+        self.locale = Config.SCRAPER_LOCALE or None
+        self.page_language = None  # set after navigation when the pinned locale took effect
+        self._locale_cookie_driver = None  # driver the locale cookies were stored in
+        self._page_load_timeout = None  # value last sent to the driver
     
     def setup_driver(self):
         """Setup Selenium WebDriver with optimized performance settings"""
@@ -65,16 +115,226 @@ class BaseScraper(ABC):
         # Note: JavaScript is required for YouTube, so not disabling it
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        self.apply_locale_options(chrome_options)
+        
+        if self.CAPTURE_PATTERNS:
+            NetworkCapture.enable(chrome_options)
+        
+        self.driver = self._create_driver(chrome_options)
+        self.apply_page_load_timeout(force=True)
+        
+        if self.CAPTURE_PATTERNS:
+            self.network_capture = NetworkCapture(self.driver, self.CAPTURE_PATTERNS)
+        
+        self._attach_cdp()
+    
+    def _create_driver(self, chrome_options):
+        """Start Chrome locally, or on the remote Selenium endpoint with the most free capacity"""
+        if Config.SELENIUM_REMOTE_URLS:
+            endpoint = get_node_pool(Config.SELENIUM_REMOTE_URLS).pick()
+            return webdriver.Remote(command_executor=endpoint, options=chrome_options)
         
         service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.set_page_load_timeout(self.timeout)
+        return webdriver.Chrome(service=service, options=chrome_options)
+    
+    def _attach_cdp(self):
+        """Open the direct DevTools transport when enabled; chromedriver stays the fallback"""
+        # A remote node's debuggerAddress is local to that node
+        if not Config.CDP_TRANSPORT or Config.SELENIUM_REMOTE_URLS:
+            return
+        try:
+            self.cdp = CDPTransport.from_driver(self.driver, self.timeout).connect()
+        except Exception:
+            self.cdp = None
+    
+    @classmethod
+    def timeout_defaults(cls, timeout: int = Config.SELENIUM_TIMEOUT) -> Dict[str, float]:
+        """Fixed fallback timeouts per stage ('page' navigation, 'content' main element)"""
+        return {'page': cls.PAGE_LOAD_TIMEOUT or timeout, 'content': cls.CONTENT_TIMEOUT}
+    
+    def stage_timeout(self, stage: str, default=None) -> float:
+        """Adaptive timeout for a stage from this platform's observed latency"""
+        return latency_tracker.timeout(self.PLATFORM, stage, default or self.timeout_defaults(self.timeout)[stage])
+    
+    def wait_for_stage(self, stage: str, by, value):
+        """wait_for_element with the stage's adaptive timeout, recording how long the element took"""
+        timeout = self.stage_timeout(stage)
+        started = time.monotonic()
+        try:
+            element = self.wait_for_element(by, value, timeout)
+        except TimeoutException:
+            latency_tracker.record(self.PLATFORM, stage, timeout)
+            raise
+        latency_tracker.record(self.PLATFORM, stage, time.monotonic() - started)
+        return element
+    
+    def apply_page_load_timeout(self, force: bool = False):
+        """Send the current navigation timeout to the driver when it changed"""
+        timeout = self.stage_timeout('page')
+        if force or timeout != self._page_load_timeout:
+            self.driver.set_page_load_timeout(timeout)
+            self._page_load_timeout = timeout
+        return timeout
+    
+    def apply_locale_options(self, chrome_options):
+        """Browser UI language and Accept-Language header for the pinned locale"""
+        if not self.locale:
+            return
+        chrome_options.add_argument(f'--lang={self.locale}')
+        chrome_options.add_experimental_option('prefs', {'intl.accept_languages': accept_language(self.locale)})
+    
+    def _set_locale_cookies(self):
+        """Store the platform's language cookies once per browser, before the first page of its domain"""
+        if self._locale_cookie_driver is self.driver:
+            return
+        self._locale_cookie_driver = self.driver
+        for cookie in locale_cookies(self.PLATFORM, self.locale):
+            try:
+                execute_cdp(self.driver, 'Network.setCookie', dict(cookie, secure=True))
+            except Exception:
+                pass  # URL parameters still pin the page
+    
+    def _detect_page_language(self) -> Optional[str]:
+        """Pinned language when the page actually rendered in it, None when pinning did not take"""
+        try:
+            lang = self.run_script("return document.documentElement.lang || ''")
+        except Exception:
+            return None
+        pinned = split_locale(self.locale)[0]
+        return pinned if lang and split_locale(lang)[0] == pinned else None
+    
+    def metric_words(self, kind: str):
+        """Words for 'views' / 'likes' / 'ago' in the page language, or in every language when unknown"""
+        return metric_words(kind, self.page_language)
     
     def close_driver(self):
         """Close WebDriver"""
+        if self.cdp:
+            self.cdp.close()
+            self.cdp = None
         if self.driver:
             self.driver.quit()
             self.driver = None
+            self.network_capture = None
+    
+    def navigate(self, url: str):
+        """Open a page (locale-pinned when configured), dropping network responses captured on the previous one"""
+        if self.network_capture:
+            self.network_capture.clear()
+        if self.locale:
+            self._set_locale_cookies()
+            url = pin_url(url, self.PLATFORM, self.locale)
+        # The CDP transport waits for the load event itself; chromedriver needs the timeout set on the session
+        timeout = self.stage_timeout('page') if self.cdp else self.apply_page_load_timeout()
+        started = time.monotonic()
+        try:
+            if self.cdp:
+                if not self.cdp.navigate(url, timeout=timeout):
+                    raise TimeoutException(f"Page load timed out: {url}")
+            else:
+                self.driver.get(url)
+        except TimeoutException:
+            latency_tracker.record(self.PLATFORM, 'page', timeout)
+            raise
+        latency_tracker.record(self.PLATFORM, 'page', time.monotonic() - started)
+        self.page_language = self._detect_page_language() if self.locale else None
+    
+    def page_state(self):
+        """Raw page state (see page_state_script) after clicking away a consent banner, and whether one was"""
+        script = page_state_script(self.PAGE_STATE_MARKERS)
+        state = self.run_script(script)
+        dismissed = state == CONSENT_DISMISSED
+        if dismissed:
+            time.sleep(self.CONSENT_DISMISS_WAIT)
+            state = self.run_script(script)
+        return state, dismissed
+    
+    def check_page_state(self, content_pending: bool = False) -> bool:
+        """Raise LoginWallError / CaptchaError / ConsentWallError for a blocked page; True when consent was dismissed
+
+        content_pending=True when a wait_for_content follows: a login form without content yet is left to it.
+        """
+        if not self.PAGE_STATE_MARKERS:
+            return False
+        state, dismissed = self.page_state()
+        if not (content_pending and state == LOGIN_PROMPT):
+            raise_for_page_state(state, self.PLATFORM, self.driver.current_url)
+        return dismissed
+    
+    def wait_for_content(self, selector: str, timeout=None):
+        """Wait for the content or a known blocker, whichever appears first, then classify the page
+
+        A login form seen before the content is only a login wall if the content is still missing
+        at the end of the wait.
+        """
+        selectors = [selector] + blocker_selectors(self.PAGE_STATE_MARKERS)
+        timeout = self.stage_timeout('content', timeout)
+        started = time.monotonic()
+        try:
+            self.wait_for_element(By.CSS_SELECTOR, ', '.join(selectors), timeout)
+        except TimeoutException:
+            latency_tracker.record(self.PLATFORM, 'content', timeout)
+            raise
+        latency_tracker.record(self.PLATFORM, 'content', time.monotonic() - started)
+        if not self.PAGE_STATE_MARKERS:
+            return
+        
+        state, dismissed = self.page_state()
+        if state == LOGIN_PROMPT:
+            try:
+                self.wait_for_element(By.CSS_SELECTOR, selector, max(1.0, timeout - (time.monotonic() - started)))
+                return
+            except TimeoutException:
+                pass  # still only the login form: a real login wall
+        raise_for_page_state(state, self.PLATFORM, self.driver.current_url)
+        if dismissed:
+            self.wait_for_element(By.CSS_SELECTOR, selector, timeout)
+    
+    def run_script(self, script: str):
+        """Run an execute_script body (no arguments) over the fastest available transport"""
+        if self.cdp:
+            return self.cdp.run_script(script)
+        return self.driver.execute_script(script)
+    
+    def screenshot_base64(self) -> str:
+        """Capture the viewport as a base64 PNG"""
+        if self.cdp:
+            return self.cdp.screenshot()
+        return self.driver.get_screenshot_as_base64()
+    
+    def captured_payloads(self, url_pattern: Optional[str] = None) -> List:
+        """JSON documents of captured XHR/fetch responses (empty when capture is off)"""
+        if not self.network_capture:
+            return []
+        return self.network_capture.json_bodies(url_pattern, consume=False)
+    
+    def page_payloads(self) -> List:
+        """Embedded page JSON plus the captured XHR payloads of the current page"""
+        payloads = []
+        for script in self.PAGE_PAYLOAD_SCRIPTS:
+            try:
+                payloads.extend(decode_documents(self.run_script(script)))
+            except Exception:
+                continue
+        payloads.extend(self.captured_payloads())
+        return payloads
+    
+    def raise_for_payloads(self, payloads: List):
+        """Raise UnavailableError / PrivateContentError when the page JSON says the video is gone or private"""
+    
+    def payload_stats(self, payloads: List, url: str, current_url: Optional[str] = None) -> Optional[SocialMediaStats]:
+        """Stats of the video at url found in JSON payloads (works without a driver)"""
+        return None
+    
+    def apply_payload_stats(self, stats: SocialMediaStats, payload_stats: Optional[SocialMediaStats]):
+        """Copy fields found in JSON payloads onto stats, leaving DOM extraction for the rest"""
+        if not payload_stats:
+            return stats
+        for field in ('views', 'likes', 'shares', 'comments', 'title', 'author', 'upload_date'):
+            value = getattr(payload_stats, field)
+            if value is not None and getattr(stats, field) is None:
+                setattr(stats, field, value)
+        return stats
     
     def wait_for_element(self, by, value, timeout=None):
         """Wait for element to be present"""
@@ -126,6 +386,78 @@ class BaseScraper(ABC):
         """Abstract method to scrape social media stats"""
         pass
     
+    def scrape_listing(self, url: str, limit: Optional[int] = None,
+                       fields: Optional[Iterable[str]] = None) -> List[SocialMediaStats]:
+        """Expand a channel/playlist/profile URL into stats for each of its videos"""
+        raise NotImplementedError(f"Bulk listing is not supported by {self.__class__.__name__}")
+    
+    def fill_missing_fields(self, stats_list: List[SocialMediaStats],
+                            fields: Optional[Iterable[str]]) -> List[SocialMediaStats]:
+        """Deep-scrape only the listed videos that lack one of the requested fields"""
+        fields = list(fields or [])
+        if not fields:
+            return stats_list
+        
+        for stats in stats_list:
+            missing = [field for field in fields if getattr(stats, field, None) is None]
+            if not missing:
+                continue
+            
+            detail = self.scrape_with_retry(stats.url)
+            for field in missing:
+                value = getattr(detail, field, None)
+                if value is not None:
+                    setattr(stats, field, value)
+        
+        return stats_list
+    
+    def restart_driver(self):
+        """Replace a crashed browser with a fresh one"""
+        try:
+            self.close_driver()
+        except Exception:
+            self.driver = None
+            self.network_capture = None
+            self.cdp = None
+        self.setup_driver()
+    
+    def scrape_with_retry(self, url: str, policy=None) -> SocialMediaStats:
+        """scrape() with classified retries on the warm browser; records retry_count and scrape_time"""
+        from .retry import RetryPolicy, classify_stats
+        
+        policy = policy or RetryPolicy()
+        started = time.monotonic()
+        retries = 0
+        
+        while True:
+            try:
+                stats = self.scrape(url)
+                error_type = classify_stats(stats)
+            except Exception as e:
+                error_type = classify_exception(e)
+                stats = SocialMediaStats(platform=self.PLATFORM or 'unknown', url=url,
+                                         error=f"Error scraping {url}: {str(e)}")
+            
+            if not policy.should_retry(error_type, retries):
+                break
+            
+            if error_type == BrowserCrashError.kind:
+                try:
+                    self.restart_driver()
+                except Exception as e:
+                    stats.error = f"Browser restart failed: {str(e)}"
+                    break
+            
+            time.sleep(policy.delay(retries))
+            retries += 1
+        
+        if error_type == 'element_missing' and not stats.error:
+            stats.error = "No metrics found on page"
+        stats.error_type = error_type
+        stats.retry_count = retries
+        stats.scrape_time = round(time.monotonic() - started, 2)
+        return stats
+    
     def __enter__(self):
         self.setup_driver()
         return self
@@ -0,0 +1,126 @@
+import itertools
+import json
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import requests
+
+class CDPError(RuntimeError):
+    """Error returned by Chrome for a DevTools command"""
+
+class CDPTransport:
+    """Talk to a Chrome page target over its DevTools websocket, skipping chromedriver's HTTP hop"""
+
+    def __init__(self, debugger_address: str, timeout: int = 30):
+        self.debugger_address = debugger_address
+        self.timeout = timeout
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._page_enabled = False
+        self._events = deque(maxlen=200)  # events received while waiting for command replies
+
+    @classmethod
+    def from_driver(cls, driver, timeout: int = 30) -> 'CDPTransport':
+        """Build a transport for the browser behind a Selenium Chrome driver"""
+        address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if not address:
+            raise CDPError("Driver does not expose a DevTools debuggerAddress")
+        return cls(address, timeout)
+
+    def connect(self) -> 'CDPTransport':
+        """Open the websocket of the first page target"""
+        import websocket
+
+        targets = requests.get(f"http://{self.debugger_address}/json", timeout=self.timeout).json()
+        pages = [t for t in targets if t.get('type') == 'page' and t.get('webSocketDebuggerUrl')]
+        if not pages:
+            raise CDPError(f"No page target found at {self.debugger_address}")
+
+        # Chrome rejects websocket origins it does not know unless the Origin header is left out
+        self._ws = websocket.create_connection(
+            pages[0]['webSocketDebuggerUrl'], timeout=self.timeout, suppress_origin=True
+        )
+        return self
+
+    def close(self):
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+            self._page_enabled = False
+
+    def _receive(self) -> Dict[str, Any]:
+        return json.loads(self._ws.recv())
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a command and return its result, buffering events received meanwhile"""
+        if not self._ws:
+            raise CDPError("Transport is not connected")
+
+        message_id = next(self._ids)
+        self._ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+
+        while True:
+            message = self._receive()
+            if 'method' in message:
+                self._events.append(message)
+                continue
+            if message.get('id') != message_id:
+                continue
+            if 'error' in message:
+                raise CDPError(f"{method}: {message['error'].get('message', message['error'])}")
+            return message.get('result', {})
+
+    def wait_for_event(self, event: str, timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Wait for a DevTools event, returning its params or None on timeout"""
+        for message in list(self._events):
+            if message.get('method') == event:
+                self._events.remove(message)
+                return message.get('params', {})
+
+        deadline = time.time() + (timeout or self.timeout)
+        while time.time() < deadline:
+            try:
+                message = self._receive()
+            except Exception:
+                return None
+            if message.get('method') == event:
+                return message.get('params', {})
+        return None
+
+    def navigate(self, url: str, wait_for_load: bool = True, timeout: Optional[float] = None) -> bool:
+        """Navigate the page; returns False when the load event did not fire in time"""
+        if not self._page_enabled:
+            self.send('Page.enable')
+            self._page_enabled = True
+
+        self._events.clear()
+        result = self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        if wait_for_load:
+            return self.wait_for_event('Page.loadEventFired', timeout) is not None
+        return True
+
+    def evaluate(self, expression: str) -> Any:
+        """Evaluate a JavaScript expression in the page and return its value"""
+        result = self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True
+        })
+        if result.get('exceptionDetails'):
+            details = result['exceptionDetails']
+            raise CDPError(details.get('exception', {}).get('description') or details.get('text', 'Evaluation failed'))
+        return result.get('result', {}).get('value')
+
+    def run_script(self, script: str) -> Any:
+        """Run an execute_script style body (using `return`) and return its value"""
+        return self.evaluate(f"(function() {{ {script} }})()")
+
+    def screenshot(self) -> str:
+        """Capture the viewport as a base64 PNG"""
+        return self.send('Page.captureScreenshot', {'format': 'png'})['data']
@@ -0,0 +1,75 @@
+from typing import Optional
+
+class ScrapeError(Exception):
+    """Classified scraping failure; kind is recorded on SocialMediaStats.error_type"""
+    kind = 'unknown'
+
+class ScrapeTimeoutError(ScrapeError):
+    """Page or element did not load in time"""
+    kind = 'timeout'
+
+class LoginWallError(ScrapeError):
+    """Platform redirected to a login page"""
+    kind = 'login_wall'
+
+class CaptchaError(ScrapeError):
+    """Platform served a captcha / bot check"""
+    kind = 'captcha'
+
+class ConsentWallError(ScrapeError):
+    """Cookie/consent interstitial that could not be dismissed"""
+    kind = 'consent'
+
+class UnavailableError(ScrapeError):
+    """Video was deleted, removed or never existed"""
+    kind = 'unavailable'
+
+class PrivateContentError(ScrapeError):
+    """Video exists but only its owner (or their friends) can see it"""
+    kind = 'private'
+
+class ElementMissingError(ScrapeError):
+    """Page loaded but none of the expected elements or metrics were found"""
+    kind = 'element_missing'
+
+class BrowserCrashError(ScrapeError):
+    """Browser or WebDriver session died"""
+    kind = 'browser_crash'
+
+# Substrings of WebDriver error messages that mean the browser session is gone
+BROWSER_CRASH_MARKERS = (
+    'invalid session id',
+    'chrome not reachable',
+    'session deleted',
+    'tab crashed',
+    'page crash',
+    'disconnected: not connected to devtools',
+    'no such window',
+    'connection refused',
+    'max retries exceeded',
+)
+
+def classify_exception(exc: BaseException) -> str:
+    """Map an exception raised while scraping to an error kind"""
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, InvalidSessionIdException
+
+    if isinstance(exc, ScrapeError):
+        return exc.kind
+    if isinstance(exc, InvalidSessionIdException):
+        return BrowserCrashError.kind
+    if isinstance(exc, (TimeoutException, TimeoutError)) or 'Timeout' in type(exc).__name__:
+        return ScrapeTimeoutError.kind
+    if isinstance(exc, NoSuchElementException):
+        return ElementMissingError.kind
+    return classify_message(str(exc)) or ScrapeError.kind
+
+def classify_message(message: Optional[str]) -> Optional[str]:
+    """Map a stats.error string to an error kind, None when it is not recognised"""
+    if not message:
+        return None
+    lowered = message.lower()
+    if any(marker in lowered for marker in BROWSER_CRASH_MARKERS):
+        return BrowserCrashError.kind
+    if lowered.startswith('timeout') or 'timed out' in lowered:
+        return ScrapeTimeoutError.kind
+    return None
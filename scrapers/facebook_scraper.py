@@ -3,194 +3,254 @@ import re
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from .base_scraper import BaseScraper, SocialMediaStats
+from .errors import ScrapeError, ScrapeTimeoutError, classify_exception
+from .payload_utils import loads_multi
+from utils.url_detector import URLDetector
+
+GRAPHQL_PATTERN = r'/api/graphql/'
+
+# Keys carrying an exact integer view count on Facebook video nodes
+VIEW_COUNT_KEYS = ('video_view_count', 'play_count', 'view_count')
+
+# Feedback keys holding exact counts, either as integers or {count}/{total_count} objects
+FEEDBACK_COUNT_KEYS = {
+    'likes': ('reaction_count', 'reactors'),
+    'shares': ('share_count', 'reshares'),
+    'comments': ('total_comment_count', 'comment_count', 'comments'),
+}
+
+# Embedded Relay payloads of a post/video page that carry counts
+POST_PAGE_SCRIPT = """
+return Array.from(document.querySelectorAll('script[type="application/json"]'))
+    .map(s => s.textContent)
+    .filter(t => t.includes('reaction_count') || t.includes('play_count') || t.includes('video_view_count'));
+"""
+
+# Embedded Relay payloads that mention view counts, plus video links for IDs the payloads miss
+LISTING_PAGE_SCRIPT = """
+const payloads = Array.from(document.querySelectorAll('script[type="application/json"]'))
+    .map(s => s.textContent)
+    .filter(t => t.includes('play_count') || t.includes('video_view_count'));
+const links = Array.from(document.querySelectorAll('a[href*="/videos/"], a[href*="/reel/"]'))
+    .map(a => a.href);
+return {payloads: payloads, links: links};
+"""
+
+class FacebookTiming:
+    """Timing constants for Facebook scraping"""
+    LISTING_SCROLL_WAIT = 2
+    LISTING_MAX_IDLE_SCROLLS = 3
+    MAIN_CONTENT_TIMEOUT = 10
+    PAGE_SETTLE_WAIT = 5
 
 class FacebookScraper(BaseScraper):
     """Facebook post/video statistics scraper"""
     
+    PLATFORM = 'facebook'
+    CONTENT_TIMEOUT = FacebookTiming.MAIN_CONTENT_TIMEOUT
+    CAPTURE_PATTERNS = [GRAPHQL_PATTERN]
+    PAGE_PAYLOAD_SCRIPTS = [POST_PAGE_SCRIPT]
+    PAGE_STATE_MARKERS = {
+        'login_urls': ['/login', 'login.php', '/checkpoint/'],
+        'login_selectors': ['form#login_form', 'form[action*="/login/"]'],
+        'content_selectors': ['[role="main"]', '.story_body_container'],
+        'captcha_urls': ['/captcha'],
+        'captcha_selectors': ['iframe[src*="captcha"]', '#captcha_response'],
+        'consent_accept_selectors': ['[data-cookiebanner="accept_button"]',
+                                     '[data-testid="cookie-policy-manage-dialog-accept-button"]'],
+    }
+    
     def scrape(self, url: str) -> SocialMediaStats:
         """Scrape Facebook post/video statistics"""
         stats = SocialMediaStats(platform='facebook', url=url)
         
         try:
-            self.driver.get(url)
-            time.sleep(5)  # Wait for Facebook to load
+            self.navigate(url)
+            self.check_page_state(content_pending=True)
             
-            # Handle Facebook login redirect or content loading
-            try:
-                # Wait for main content to load
-                self.wait_for_element(By.CSS_SELECTOR, '[role="main"], .story_body_container', timeout=10)
-            except:
-                # If login required, try to find public content
-                pass
+            # Main content, or the login form / captcha that replaced it
+            self.wait_for_content('[role="main"], .story_body_container', timeout=FacebookTiming.MAIN_CONTENT_TIMEOUT)
+            time.sleep(FacebookTiming.PAGE_SETTLE_WAIT)  # Wait for Facebook to load
+            
+            # Exact counts from Relay/GraphQL JSON; DOM is only read for what is still missing
+            payloads = self.page_payloads()
+            self.raise_for_payloads(payloads)
+            self.apply_payload_stats(stats, self.payload_stats(payloads, url, self.driver.current_url))
             
             # Extract title/post content
-            try:
-                title_selectors = [
-                    '[data-testid="post_message"]',
-                    '.userContent',
-                    '[data-ad-preview="message"]',
-                    '.story_body_container p',
-                    'div[data-testid="post_message"] span'
-                ]
-                
-                for selector in title_selectors:
-                    title_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if title_element and title_element.text:
-                        stats.title = title_element.text.strip()[:200]  # Limit length
-                        break
-            except:
-                pass
+            if stats.title is None:
+                try:
+                    title_selectors = [
+                        '[data-testid="post_message"]',
+                        '.userContent',
+                        '[data-ad-preview="message"]',
+                        '.story_body_container p',
+                        'div[data-testid="post_message"] span'
+                    ]
+                    
+                    for selector in title_selectors:
+                        title_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if title_element and title_element.text:
+                            stats.title = title_element.text.strip()[:200]  # Limit length
+                            break
+                except:
+                    pass
             
             # Extract author/page name
-            try:
-                author_selectors = [
-                    'h3 a[role="link"]',
-                    '.actor a',
-                    '[data-testid="story-subtitle"] a',
-                    'strong a[role="link"]'
-                ]
-                
-                for selector in author_selectors:
-                    author_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if author_element and author_element.text:
-                        stats.author = author_element.text.strip()
-                        break
-            except:
-                pass
+            if stats.author is None:
+                try:
+                    author_selectors = [
+                        'h3 a[role="link"]',
+                        '.actor a',
+                        '[data-testid="story-subtitle"] a',
+                        'strong a[role="link"]'
+                    ]
+                    
+                    for selector in author_selectors:
+                        author_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if author_element and author_element.text:
+                            stats.author = author_element.text.strip()
+                            break
+                except:
+                    pass
             
             # Get page source once for both views and likes extraction
             import re
-            page_source = self.driver.page_source
+            page_source = self.driver.page_source if stats.views is None or stats.likes is None else ''
             
             # Extract view count (for videos)
-            try:
-                # First try to extract from visible text (user-facing display)
-                # Look for elements containing view count in visible text
-                all_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'view') or contains(text(), 'View')]") 
-                
-                for element in all_elements:
-                    try:
-                        text = element.text.strip()
-                        # Look for pattern like "25 views" or "25 view"
-                        view_match = re.search(r'(\d+)\s*views?', text, re.IGNORECASE)
-                        if view_match:
-                            stats.views = int(view_match.group(1))
-                            break
-                    except:
-                        continue
-                
-                # Fallback to page source JSON data if visible text extraction fails
-                if stats.views is None:
-                    # Look for video view count in JSON data
-                    view_patterns = [
-                        r'"video_view_count":\s*(\d+)',
-                        r'"view_count":\s*(\d+)',
-                        r'"playCount":\s*(\d+)'
+            if stats.views is None:
+                try:
+                    # First try to extract from visible text (user-facing display)
+                    # Look for elements containing view count in visible text
+                    all_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'view') or contains(text(), 'View')]") 
+                    
+                    for element in all_elements:
+                        try:
+                            text = element.text.strip()
+                            # Look for pattern like "25 views" or "25 view"
+                            view_match = re.search(r'(\d+)\s*views?', text, re.IGNORECASE)
+                            if view_match:
+                                stats.views = int(view_match.group(1))
+                                break
+                        except:
+                            continue
+                    
+                    # Fallback to page source JSON data if visible text extraction fails
+                    if stats.views is None:
+                        # Look for video view count in JSON data
+                        view_patterns = [
+                            r'"video_view_count":\s*(\d+)',
+                            r'"view_count":\s*(\d+)',
+                            r'"playCount":\s*(\d+)'
+                        ]
+                        
+                        for pattern in view_patterns:
+                            matches = re.findall(pattern, page_source)
+                            if matches:
+                                try:
+                                    stats.views = int(matches[0])
+                                    break
+                                except (ValueError, IndexError):
+                                    continue
+                    
+                    # Final fallback to DOM selectors
+                    if stats.views is None:
+                        view_selectors = [
+                            '[data-testid="video_view_count"]',
+                            '.video-view-count',
+                            'span[aria-label*="view"]'
+                        ]
+                        
+                        for selector in view_selectors:
+                            view_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                            if view_element:
+                                view_text = view_element.get_attribute('aria-label') or view_element.text
+                                if view_text:
+                                    stats.views = self.extract_number(view_text)
+                                    break
+                except:
+                    pass
+            
+            # Extract likes/reactions
+            if stats.likes is None:
+                try:
+                    # First try to extract from page source (most reliable for Facebook)
+                    # Look for reaction count in JSON data
+                    like_patterns = [
+                        r'"reaction_count":\s*(\d+)',
+                        r'"like_count":\s*(\d+)',
+                        r'"likes":\s*(\d+)',
+                        r'reaction_count["\']?:\s*(\d+)'
                     ]
                     
-                    for pattern in view_patterns:
+                    for pattern in like_patterns:
                         matches = re.findall(pattern, page_source)
                         if matches:
                             try:
-                                stats.views = int(matches[0])
+                                stats.likes = int(matches[0])
                                 break
                             except (ValueError, IndexError):
                                 continue
-                
-                # Final fallback to DOM selectors
-                if stats.views is None:
-                    view_selectors = [
-                        '[data-testid="video_view_count"]',
-                        '.video-view-count',
-                        'span[aria-label*="view"]'
-                    ]
                     
-                    for selector in view_selectors:
-                        view_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                        if view_element:
-                            view_text = view_element.get_attribute('aria-label') or view_element.text
-                            if view_text:
-                                stats.views = self.extract_number(view_text)
-                                break
-            except:
-                pass
+                    # Fallback to DOM selectors if page source extraction fails
+                    if stats.likes is None:
+                        like_selectors = [
+                            '[data-testid="like_count"]',
+                            'span[data-testid="like_count"]',
+                            '.reaction-count',
+                            'span[aria-label*="reaction"]'
+                        ]
+                        
+                        for selector in like_selectors:
+                            like_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                            if like_element:
+                                like_text = like_element.get_attribute('aria-label') or like_element.text
+                                if like_text:
+                                    stats.likes = self.extract_number(like_text)
+                                    break
+                except:
+                    pass
             
-            # Extract likes/reactions
-            try:
-                # First try to extract from page source (most reliable for Facebook)
-                # Look for reaction count in JSON data
-                like_patterns = [
-                    r'"reaction_count":\s*(\d+)',
-                    r'"like_count":\s*(\d+)',
-                    r'"likes":\s*(\d+)',
-                    r'reaction_count["\']?:\s*(\d+)'
-                ]
-                
-                for pattern in like_patterns:
-                    matches = re.findall(pattern, page_source)
-                    if matches:
-                        try:
-                            stats.likes = int(matches[0])
-                            break
-                        except (ValueError, IndexError):
-                            continue
-                
-                # Fallback to DOM selectors if page source extraction fails
-                if stats.likes is None:
-                    like_selectors = [
-                        '[data-testid="like_count"]',
-                        'span[data-testid="like_count"]',
-                        '.reaction-count',
-                        'span[aria-label*="reaction"]'
+            # Extract shares
+            if stats.shares is None:
+                try:
+                    share_selectors = [
+                        '[data-testid="share_count"]',
+                        'span[data-testid="share_count"]',
+                        '.share-count',
+                        'span[aria-label*="share"]'
                     ]
                     
-                    for selector in like_selectors:
-                        like_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                        if like_element:
-                            like_text = like_element.get_attribute('aria-label') or like_element.text
-                            if like_text:
-                                stats.likes = self.extract_number(like_text)
+                    for selector in share_selectors:
+                        share_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if share_element:
+                            share_text = share_element.get_attribute('aria-label') or share_element.text
+                            if share_text:
+                                stats.shares = self.extract_number(share_text)
                                 break
-            except:
-                pass
-            
-            # Extract shares
-            try:
-                share_selectors = [
-                    '[data-testid="share_count"]',
-                    'span[data-testid="share_count"]',
-                    '.share-count',
-                    'span[aria-label*="share"]'
-                ]
-                
-                for selector in share_selectors:
-                    share_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if share_element:
-                        share_text = share_element.get_attribute('aria-label') or share_element.text
-                        if share_text:
-                            stats.shares = self.extract_number(share_text)
-                            break
-            except:
-                pass
+                except:
+                    pass
             
             # Extract comments
-            try:
-                comment_selectors = [
-                    '[data-testid="comment_count"]',
-                    'span[data-testid="comment_count"]',
-                    '.comment-count',
-                    'span[aria-label*="comment"]'
-                ]
-                
-                for selector in comment_selectors:
-                    comment_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if comment_element:
-                        comment_text = comment_element.get_attribute('aria-label') or comment_element.text
-                        if comment_text:
-                            stats.comments = self.extract_number(comment_text)
-                            break
-            except:
-                pass
+            if stats.comments is None:
+                try:
+                    comment_selectors = [
+                        '[data-testid="comment_count"]',
+                        'span[data-testid="comment_count"]',
+                        '.comment-count',
+                        'span[aria-label*="comment"]'
+                    ]
+                    
+                    for selector in comment_selectors:
+                        comment_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if comment_element:
+                            comment_text = comment_element.get_attribute('aria-label') or comment_element.text
+                            if comment_text:
+                                stats.comments = self.extract_number(comment_text)
+                                break
+                except:
+                    pass
             
             # Extract upload date with enhanced extraction
             try:
@@ -226,17 +286,179 @@ class FacebookScraper(BaseScraper):
                 if not upload_date:
                     upload_date = self._enhanced_date_extraction_facebook()
                 
-                stats.upload_date = upload_date
+                stats.upload_date = stats.upload_date or upload_date
             except:
                 pass
                 
+        except ScrapeError as e:
+            stats.error = str(e)
+            stats.error_type = e.kind
         except TimeoutException:
             stats.error = "Timeout: Facebook page took too long to load"
+            stats.error_type = ScrapeTimeoutError.kind
         except Exception as e:
             stats.error = f"Error scraping Facebook: {str(e)}"
+            stats.error_type = classify_exception(e)
         
         return stats
     
+    def _listing_tab_url(self, url, listing):
+        """Resolve the videos (or reels) tab of a page"""
+        tab = 'reels' if re.search(r'/reels/?(?:[?#]|$)', url) else 'videos'
+        if listing['listing_id'].startswith('profile.php'):
+            sk = 'reels_tab' if tab == 'reels' else 'videos'
+            return f"https://www.facebook.com/{listing['listing_id']}&sk={sk}"
+        return f"https://www.facebook.com/{listing['listing_id']}/{tab}"
+    
+    def _collect_videos(self, node, found, video=None):
+        """Walk a Relay/GraphQL payload and record counts under the nearest video ID"""
+        if isinstance(node, list):
+            for child in node:
+                self._collect_videos(child, found, video)
+            return
+        if not isinstance(node, dict):
+            return
+        
+        video_id = node.get('videoId') or node.get('video_id')
+        if not video_id and node.get('__typename') == 'Video':
+            video_id = node.get('id')
+        if video_id and str(video_id).isdigit():
+            video = found.setdefault(str(video_id), {'id': str(video_id)})
+        
+        if video is not None:
+            for key in VIEW_COUNT_KEYS:
+                value = node.get(key)
+                if isinstance(value, int) and video.get('views') is None:
+                    video['views'] = value
+            
+            title = node.get('title')
+            if isinstance(title, dict) and title.get('text') and not video.get('title'):
+                video['title'] = title['text']
+            
+            for field, keys in FEEDBACK_COUNT_KEYS.items():
+                if video.get(field) is None:
+                    for key in keys:
+                        count = self._count_value(node.get(key))
+                        if count is not None:
+                            video[field] = count
+                            break
+            
+            link = node.get('permalink_url') or node.get('url')
+            if isinstance(link, str) and re.search(r'/(?:videos|reel)/', link) and not video.get('url'):
+                video['url'] = link
+        
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                self._collect_videos(value, found, video)
+    
+    def _count_value(self, value):
+        """Read an exact count stored as an integer or as a {count}/{total_count} object"""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, dict):
+            for key in ('count', 'total_count'):
+                if isinstance(value.get(key), int):
+                    return value[key]
+        return None
+    
+    def _video_id(self, url):
+        """Numeric video ID of a watch/videos/reel URL, if it has one"""
+        match = re.search(r'(?:/videos/(?:[^/?#]+/)?|/reel/|[?&]v=)(\d+)', url or '')
+        return match.group(1) if match else None
+    
+    def _stats_from_payloads(self, payloads, video_id=None):
+        """Build stats for video_id (or the page's post) from Relay/GraphQL payloads"""
+        found = {}
+        post = {}  # counts outside any video node, i.e. the post's own feedback
+        for payload in payloads:
+            self._collect_videos(payload, found, post)
+        
+        video = found.get(video_id) if video_id else None
+        if video is None and len(found) == 1 and not video_id:
+            video = next(iter(found.values()))
+        video = video or {}
+        
+        def pick(field):
+            return video.get(field) if video.get(field) is not None else post.get(field)
+        
+        return SocialMediaStats(
+            platform='facebook',
+            url=video.get('url', ''),
+            views=video.get('views'),
+            likes=pick('likes'),
+            shares=pick('shares'),
+            comments=pick('comments'),
+            title=video.get('title')
+        )
+    
+    def payload_stats(self, payloads, url, current_url=None):
+        """Stats of the post/video at url from Relay/GraphQL payloads"""
+        video_id = self._video_id(current_url) or self._video_id(url)
+        return self._stats_from_payloads(payloads, video_id)
+    
+    def _collect_listing_links(self, links, found):
+        """Register video IDs from tab links that the payloads did not describe"""
+        for link in links or []:
+            match = re.search(r'/(?:videos|reel)/(\d+)', link)
+            if match and match.group(1) not in found:
+                found[match.group(1)] = {'id': match.group(1), 'url': link.split('?')[0]}
+    
+    def scrape_listing(self, url, limit=None, fields=None):
+        """Walk a page's videos/reels tab with infinite scroll, reading view counts from loaded payloads"""
+        listing = URLDetector.detect_listing(url)
+        if not listing or listing['platform'] != 'facebook':
+            raise ValueError(f"Not a Facebook page URL: {url}")
+        
+        self.navigate(self._listing_tab_url(url, listing))
+        self.check_page_state(content_pending=True)
+        # The tab's grid renders inside [role="main"]; a login form drawn before it is not yet a wall
+        self.wait_for_content('[role="main"]', timeout=FacebookTiming.MAIN_CONTENT_TIMEOUT)
+        page_name = (self.driver.title or '').split('|')[0].strip() or listing['listing_id']
+        
+        found = {}
+        idle_scrolls = 0
+        
+        while idle_scrolls < FacebookTiming.LISTING_MAX_IDLE_SCROLLS:
+            known = len(found)
+            
+            page_data = self.run_script(LISTING_PAGE_SCRIPT) or {}
+            for payload in page_data.get('payloads', []):
+                for document in loads_multi(payload):
+                    self._collect_videos(document, found)
+            for document in self.network_capture.json_bodies(GRAPHQL_PATTERN):
+                self._collect_videos(document, found)
+            self._collect_listing_links(page_data.get('links'), found)
+            
+            if limit and len(found) >= limit:
+                break
+            
+            idle_scrolls = 0 if len(found) > known else idle_scrolls + 1
+            
+            # Infinite scroll loads the next batch through GraphQL
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(FacebookTiming.LISTING_SCROLL_WAIT)
+        
+        videos = list(found.values())
+        if limit:
+            videos = videos[:limit]
+        
+        results = []
+        for video in videos:
+            results.append(SocialMediaStats(
+                platform='facebook',
+                url=video.get('url') or f"https://www.facebook.com/watch/?v={video['id']}",
+                views=video.get('views'),
+                likes=video.get('likes'),
+                shares=video.get('shares'),
+                comments=video.get('comments'),
+                title=video.get('title'),
+                author=page_name
+            ))
+        
+        return self.fill_missing_fields(results, fields)
+    
     def extract_number(self, text: str) -> int:
         """Override to handle Facebook specific number formats"""
         if not text:
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Optional, Tuple
+
+from config import Config
+from .async_scraper import AsyncScraper
+from .base_scraper import SocialMediaStats
+
+class HedgedScraper(AsyncScraper):
+    """Race the HTTP fast path against a browser scrape and return the first complete result
+
+    The browser starts hedge_delay seconds after the HTTP request (0 = both at once) and is
+    skipped when HTTP already answered completely. The losing task is cancelled; a Selenium
+    scrape runs in a worker thread, so it finishes in the background and closes its browser.
+    """
+
+    # Fields a result needs to win the race
+    REQUIRED_FIELDS = ('views', 'likes')
+
+    def __init__(self, fast: AsyncScraper, slow: AsyncScraper, hedge_delay: Optional[float] = None):
+        super().__init__(slow.headless, slow.timeout, slow.max_concurrency)
+        self.fast = fast
+        self.slow = slow
+        self.hedge_delay = Config.HEDGE_DELAY if hedge_delay is None else hedge_delay
+
+    async def start(self):
+        await self.fast.start()
+        await self.slow.start()
+
+    async def close(self):
+        await self.fast.close()
+        await self.slow.close()
+
+    def is_complete(self, stats: SocialMediaStats) -> bool:
+        return not stats.error and all(getattr(stats, field) is not None for field in self.REQUIRED_FIELDS)
+
+    def _best(self, results) -> SocialMediaStats:
+        """Most filled-in result when neither path was complete (browser wins ties)"""
+        def score(item: Tuple[bool, SocialMediaStats]):
+            from_browser, stats = item
+            filled = sum(getattr(stats, f) is not None for f in ('views', 'likes', 'shares', 'comments'))
+            return (filled, from_browser)
+        return max(results, key=score)[1]
+
+    async def scrape(self, url: str, session: Optional[Any] = None) -> SocialMediaStats:
+        """First complete result of the two paths; session is passed to the browser path"""
+        fast_task = asyncio.ensure_future(self.fast.scrape(url))
+        if self.hedge_delay:
+            await asyncio.wait({fast_task}, timeout=self.hedge_delay)
+        if fast_task.done() and fast_task.exception() is None and self.is_complete(fast_task.result()):
+            return fast_task.result()
+
+        slow_task = asyncio.ensure_future(self.slow.scrape(url, session))
+        pending = {fast_task, slow_task}
+        results = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    stats = task.result()
+                    if self.is_complete(stats):
+                        return stats
+                    results.append((task is slow_task, stats))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if results:
+            return self._best(results)
+        return SocialMediaStats(platform='unknown', url=url, error=f"Both HTTP and browser scraping failed for {url}")
@@ -0,0 +1,104 @@
+import asyncio
+import concurrent.futures
+import json
+import re
+from typing import Any, List, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .async_scraper import AsyncScraper
+from .base_scraper import SocialMediaStats
+from .errors import LoginWallError, ScrapeError
+from .locale_pin import accept_language, pin_url
+from .payload_utils import loads_multi
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Script assignments whose object literal is the page JSON (YouTube watch pages)
+ASSIGNMENT_MARKERS = ('ytInitialPlayerResponse = ', 'ytInitialData = ')
+
+# <script> blocks carrying JSON: TikTok hydration state and Facebook Relay payloads
+JSON_SCRIPT_PATTERN = re.compile(
+    r'<script[^>]*(?:id="(?:__UNIVERSAL_DATA_FOR_REHYDRATION__|SIGI_STATE)"|type="application/json")[^>]*>(.*?)</script>',
+    re.DOTALL
+)
+
+# Own worker threads so a cancelled fetch never holds up asyncio.run() shutdown
+HTTP_EXECUTOR = concurrent.futures.ThreadPoolExecutor(thread_name_prefix='http-extract')
+
+def html_payloads(html: str) -> List[Any]:
+    """JSON documents embedded in server-rendered HTML (the same data the page scripts read)"""
+    payloads = []
+    decoder = json.JSONDecoder()
+    for marker in ASSIGNMENT_MARKERS:
+        start = html.find(marker)
+        if start == -1:
+            continue
+        try:
+            document, _ = decoder.raw_decode(html, start + len(marker))
+            payloads.append(document)
+        except ValueError:
+            continue
+    for match in JSON_SCRIPT_PATTERN.finditer(html):
+        payloads.extend(loads_multi(match.group(1)))
+    return payloads
+
+class HttpExtractor(AsyncScraper):
+    """Browserless fast path: fetch the page HTML and run the scrapers' payload parsers on its embedded JSON"""
+
+    def __init__(self, headless: bool = True, timeout: int = 15, max_concurrency: Optional[int] = None):
+        super().__init__(headless, timeout, max_concurrency or 8)
+        self._session = None
+
+    async def start(self):
+        import requests
+
+        self._session = requests.Session()
+        self._session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Language': accept_language(Config.SCRAPER_LOCALE or 'en-US'),
+        })
+
+    async def close(self):
+        if self._session:
+            self._session.close()
+            self._session = None
+
+    def _fetch(self, url: str):
+        return self._session.get(url, timeout=self.timeout)
+
+    async def scrape(self, url: str, session: Optional[Any] = None) -> SocialMediaStats:
+        """Scrape one URL with a single HTTP GET; session is unused"""
+        from . import ScraperFactory
+
+        url_info = URLDetector.validate_url(url)
+        if not url_info['valid']:
+            return SocialMediaStats(platform='unknown', url=url, error=f"Invalid URL: {url_info['error']}",
+                                    error_type='unsupported')
+
+        platform = url_info['platform']
+        stats = SocialMediaStats(platform=platform, url=url)
+        parser = ScraperFactory.create_scraper(platform, headless=self.headless, timeout=self.timeout)
+
+        try:
+            page_url = pin_url(url, platform, Config.SCRAPER_LOCALE) if Config.SCRAPER_LOCALE else url
+            response = await asyncio.get_running_loop().run_in_executor(HTTP_EXECUTOR, self._fetch, page_url)
+            response.raise_for_status()
+
+            if any(marker in response.url for marker in parser.PAGE_STATE_MARKERS.get('login_urls', ())):
+                raise LoginWallError(f"Login required: {platform.title()} redirected to a login wall ({response.url})")
+
+            payloads = html_payloads(response.text)
+            parser.raise_for_payloads(payloads)
+            parser.apply_payload_stats(stats, parser.payload_stats(payloads, url, response.url))
+            if all(getattr(stats, field) is None for field in ('views', 'likes', 'shares', 'comments')):
+                stats.error = f"No metrics found in page HTML for {url}"
+                stats.error_type = 'element_missing'
+        except ScrapeError as e:
+            stats.error = str(e)
+            stats.error_type = e.kind
+        except Exception as e:
+            stats.error = f"Error fetching {platform.title()} page: {str(e)}"
+            stats.error_type = 'timeout' if 'timed out' in str(e).lower() else 'unknown'
+
+        return stats
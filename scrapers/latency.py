@@ -0,0 +1,60 @@
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+from config import Config
+
+def percentile(samples, q: float) -> Optional[float]:
+    """Nearest-rank percentile of samples (q in 0..100), None when there are none"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered), max(1, math.ceil(q / 100 * len(ordered)))) - 1
+    return ordered[index]
+
+class LatencyTracker:
+    """Rolling page-ready latencies per (platform, stage), turned into bounded timeouts"""
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, platform: Optional[str], stage: str, seconds: float):
+        """Store one observation; timeouts are recorded at their limit so a degraded platform gets slack"""
+        with self._lock:
+            self._samples[(platform or 'unknown', stage)].append(seconds)
+
+    def percentiles(self, platform: Optional[str], stage: str) -> Dict[str, Optional[float]]:
+        with self._lock:
+            samples = list(self._samples.get((platform or 'unknown', stage), ()))
+        return {'p50': percentile(samples, 50), 'p95': percentile(samples, 95), 'samples': len(samples)}
+
+    def timeout(self, platform: Optional[str], stage: str, default: float) -> float:
+        """p95 x multiplier within [TIMEOUT_MIN, TIMEOUT_MAX]; the fixed default until enough samples exist"""
+        if not Config.ADAPTIVE_TIMEOUTS:
+            return default
+        stats = self.percentiles(platform, stage)
+        if stats['samples'] < self.min_samples:
+            return default
+        adaptive = stats['p95'] * Config.TIMEOUT_P95_MULTIPLIER
+        return round(min(Config.TIMEOUT_MAX, max(Config.TIMEOUT_MIN, adaptive)), 1)
+
+    def snapshot(self, defaults: Dict[str, Dict[str, float]]) -> Dict[str, Dict]:
+        """Percentiles and current timeout per platform and stage, for health checks"""
+        result = {}
+        for platform, stages in defaults.items():
+            result[platform] = {
+                stage: dict(self.percentiles(platform, stage), timeout=self.timeout(platform, stage, default))
+                for stage, default in stages.items()
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+# Shared by every scraper in the process so each platform's history survives driver restarts
+latency_tracker = LatencyTracker()
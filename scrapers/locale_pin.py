@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Words the DOM fallbacks look for, per UI language
+METRIC_WORDS = {
+    'en': {'views': ('view',), 'likes': ('like',), 'ago': ('ago',)},
+    'id': {'views': ('ditonton', 'tayangan'), 'likes': ('suka',), 'ago': ('lalu',)},
+}
+
+def split_locale(locale: str) -> Tuple[str, str]:
+    """'en-US' / 'en_US' -> ('en', 'US'); region may be empty"""
+    parts = locale.replace('_', '-').split('-')
+    return parts[0].lower(), (parts[1].upper() if len(parts) > 1 else '')
+
+def accept_language(locale: str) -> str:
+    """Accept-Language value preferring the pinned locale"""
+    language, region = split_locale(locale)
+    if region:
+        return f"{language}-{region},{language};q=0.9"
+    return language
+
+def locale_params(platform: str, locale: str) -> Dict[str, str]:
+    """Query parameters each platform honours for UI language/region"""
+    language, region = split_locale(locale)
+    if platform == 'youtube':
+        return {'hl': language, 'gl': region} if region else {'hl': language}
+    if platform == 'tiktok':
+        return {'lang': language}
+    if platform == 'facebook':
+        return {'locale': f"{language}_{region}" if region else language}
+    return {}
+
+def locale_cookies(platform: str, locale: str) -> List[Dict]:
+    """Cookies that keep the UI language across redirects and in-app navigation"""
+    language, region = split_locale(locale)
+    if platform == 'youtube':
+        pref = f"hl={language}&gl={region}" if region else f"hl={language}"
+        return [{'name': 'PREF', 'value': pref, 'domain': '.youtube.com', 'path': '/'}]
+    if platform == 'facebook':
+        value = f"{language}_{region}" if region else language
+        return [{'name': 'locale', 'value': value, 'domain': '.facebook.com', 'path': '/'}]
+    return []
+
+def pin_url(url: str, platform: str, locale: str) -> str:
+    """Add the platform's locale parameters to url, keeping any the URL already sets"""
+    params = locale_params(platform, locale)
+    if not params:
+        return url
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    present = {key for key, _ in query}
+    query += [(key, value) for key, value in params.items() if key not in present]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def metric_words(kind: str, language: Optional[str] = None) -> Tuple[str, ...]:
+    """Words for one language when the page is known to be in it, otherwise every known language"""
+    if language in METRIC_WORDS:
+        return METRIC_WORDS[language][kind]
+    return tuple(word for words in METRIC_WORDS.values() for word in words[kind])
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .base_scraper import SocialMediaStats
+
+class NegativeCache:
+    """Known-dead URLs (deleted, private, login-walled, unsupported) keyed by canonical video ID
+
+    Each error class has its own re-check interval (Config.NEGATIVE_CACHE_TTLS, seconds);
+    classes without one (timeouts, captchas, crashes) are never cached.
+    """
+
+    def __init__(self, path: str = None, ttls: Optional[Dict[str, float]] = None):
+        self.path = path or ':memory:'
+        self.ttls = Config.NEGATIVE_CACHE_TTLS if ttls is None else ttls
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS negative_cache ('
+            'key TEXT PRIMARY KEY, platform TEXT, error_type TEXT, error TEXT, cached_at REAL, expires_at REAL)'
+        )
+        self._db.commit()
+
+    def _key(self, url: str) -> str:
+        # Unrecognised URLs have no video ID, so they are keyed by the URL itself
+        return URLDetector.canonical_id(url) or f"url:{url.strip()}"
+
+    def lookup(self, url: str) -> Optional[SocialMediaStats]:
+        """Cached failure for url as stats (cache='negative'), None when unknown or due for a re-check"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT platform, error_type, error, expires_at FROM negative_cache WHERE key = ?', (self._key(url),)
+            ).fetchone()
+        if not row or row[3] <= time.time():
+            return None
+
+        platform, error_type, error, expires_at = row
+        recheck = datetime.fromtimestamp(expires_at).strftime('%Y-%m-%d %H:%M')
+        return SocialMediaStats(platform=platform, url=url, error=f"{error} (cached, re-check after {recheck})",
+                                error_type=error_type, cache='negative')
+
+    def record(self, stats: SocialMediaStats) -> bool:
+        """Remember a failed scrape whose error class has a TTL; a success clears any earlier entry"""
+        if stats.cache:
+            return False
+        key = self._key(stats.url)
+        ttl = self.ttls.get(stats.error_type or '')
+        with self._lock:
+            if not stats.error:
+                self._db.execute('DELETE FROM negative_cache WHERE key = ?', (key,))
+                self._db.commit()
+                return False
+            if not ttl:
+                return False
+            now = time.time()
+            self._db.execute(
+                'INSERT OR REPLACE INTO negative_cache VALUES (?, ?, ?, ?, ?, ?)',
+                (key, stats.platform, stats.error_type, stats.error, now, now + ttl)
+            )
+            self._db.commit()
+        return True
+
+    def forget(self, url: str):
+        """Drop the entry for url so the next request scrapes it again"""
+        with self._lock:
+            self._db.execute('DELETE FROM negative_cache WHERE key = ?', (self._key(url),))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM negative_cache')
+            self._db.commit()
+
+_cache = None
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """Process-wide negative cache, None when disabled"""
+    global _cache
+    if not Config.NEGATIVE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = NegativeCache(Config.NEGATIVE_CACHE_PATH)
+    return _cache
@@ -0,0 +1,101 @@
+import base64
+import json
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+from .payload_utils import loads_multi
+
+
+def execute_cdp(driver, cmd: str, params: dict) -> dict:
+    """execute_cdp_cmd for local Chrome; remote sessions go through the goog/cdp endpoint"""
+    if hasattr(driver, 'execute_cdp_cmd'):
+        return driver.execute_cdp_cmd(cmd, params)
+    # Same registration ChromiumRemoteConnection does for local Chrome
+    driver.command_executor._commands['executeCdpCommand'] = ('POST', '/session/$sessionId/goog/cdp/execute')
+    return driver.execute('executeCdpCommand', {'cmd': cmd, 'params': params})['value']
+
+
+class NetworkCapture:
+    """Collect response bodies of matching XHR/fetch requests from Chrome's performance log"""
+
+    def __init__(self, driver, url_patterns: Iterable[str]):
+        self.driver = driver
+        self.url_patterns = [re.compile(pattern) for pattern in url_patterns]
+        self._pending = {}  # requestId -> url of matching responses not finished yet
+        self._bodies: List[Tuple[str, str]] = []
+
+    @staticmethod
+    def enable(chrome_options):
+        """Turn on performance logging (Network events) for a Chrome session"""
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def _matches(self, url: str) -> bool:
+        return any(pattern.search(url) for pattern in self.url_patterns)
+
+    def _execute_cdp(self, cmd: str, params: dict) -> dict:
+        return execute_cdp(self.driver, cmd, params)
+
+    def _read_body(self, request_id: str) -> Optional[str]:
+        try:
+            result = self._execute_cdp('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            return None
+        body = result.get('body')
+        if body and result.get('base64Encoded'):
+            try:
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            except Exception:
+                return None
+        return body
+
+    def poll(self):
+        """Drain the performance log and store bodies of finished matching responses"""
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                url = params.get('response', {}).get('url', '')
+                if self._matches(url):
+                    self._pending[params.get('requestId')] = url
+            elif method == 'Network.loadingFinished':
+                url = self._pending.pop(params.get('requestId'), None)
+                if url:
+                    body = self._read_body(params.get('requestId'))
+                    if body:
+                        self._bodies.append((url, body))
+            elif method == 'Network.loadingFailed':
+                self._pending.pop(params.get('requestId'), None)
+
+    def json_bodies(self, url_pattern: Optional[str] = None, consume: bool = True) -> List[Any]:
+        """Decoded JSON documents captured so far, optionally filtered by URL pattern"""
+        self.poll()
+
+        selected, remaining = [], []
+        for url, body in self._bodies:
+            if url_pattern is None or re.search(url_pattern, url):
+                selected.append(body)
+            else:
+                remaining.append((url, body))
+
+        if consume:
+            self._bodies = remaining
+
+        # Some endpoints (e.g. Facebook GraphQL) stream several documents per body
+        return [document for body in selected for document in loads_multi(body)]
+
+    def clear(self):
+        """Drop everything captured so far (e.g. before navigating to a new page)"""
+        self.poll()
+        self._pending.clear()
+        self._bodies = []
@@ -0,0 +1,50 @@
+import json
+from typing import Dict, Optional
+
+from .errors import LoginWallError, CaptchaError, ConsentWallError
+
+# Keys of a scraper's PAGE_STATE_MARKERS; missing keys mean "no marker of that kind"
+MARKER_KEYS = (
+    'login_urls', 'login_selectors', 'content_selectors',
+    'captcha_urls', 'captcha_selectors',
+    'consent_urls', 'consent_accept_selectors',
+)
+
+CONSENT_DISMISSED = 'consent_dismissed'
+
+# A login form with no content (yet): Facebook renders a dismissible login prompt before its main
+# content, so this only counts as a login wall once the content has had its full wait to appear
+LOGIN_PROMPT = 'login_prompt'
+
+# One round trip: classify the page and click a consent "accept" button when there is one
+PAGE_STATE_SCRIPT = """
+const m = %s;
+const href = location.href;
+const has = selectors => selectors.some(s => document.querySelector(s));
+if (m.captcha_urls.some(u => href.includes(u)) || has(m.captcha_selectors)) return 'captcha';
+if (m.login_urls.some(u => href.includes(u))) return 'login_wall';
+if (has(m.login_selectors) && !has(m.content_selectors)) return 'login_prompt';
+const accept = m.consent_accept_selectors.map(s => document.querySelector(s)).find(e => e);
+if (accept) { accept.click(); return 'consent_dismissed'; }
+if (m.consent_urls.some(u => href.includes(u))) return 'consent';
+return null;
+"""
+
+def page_state_script(markers: Dict) -> str:
+    """execute_script body returning 'login_wall', 'login_prompt', 'captcha', 'consent', 'consent_dismissed' or null"""
+    return PAGE_STATE_SCRIPT % json.dumps({key: list(markers.get(key, ())) for key in MARKER_KEYS})
+
+def blocker_selectors(markers: Dict) -> list:
+    """DOM selectors that mark a blocked page, to wait for alongside the content"""
+    return list(markers.get('captcha_selectors', ())) + list(markers.get('login_selectors', ())) \
+        + list(markers.get('consent_accept_selectors', ()))
+
+def raise_for_page_state(state: Optional[str], platform: str, url: str):
+    """Raise the typed error for a blocked page state; no-op for a normal page"""
+    name = (platform or 'page').title()
+    if state in (LoginWallError.kind, LOGIN_PROMPT):
+        raise LoginWallError(f"Login required: {name} redirected to a login wall ({url})")
+    if state == CaptchaError.kind:
+        raise CaptchaError(f"Captcha: {name} served a bot check ({url})")
+    if state in (ConsentWallError.kind, CONSENT_DISMISSED):
+        raise ConsentWallError(f"Consent: {name} cookie/consent page could not be dismissed ({url})")
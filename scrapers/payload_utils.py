@@ -0,0 +1,79 @@
+import json
+from typing import Any, Iterator, List, Optional
+
+
+def walk_dicts(obj: Any) -> Iterator[dict]:
+    """Yield every dict nested anywhere inside a decoded JSON payload"""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def find_first(obj: Any, key: str) -> Optional[Any]:
+    """Return the value of the first occurrence of key in a JSON payload"""
+    for node in walk_dicts(obj):
+        if key in node:
+            return node[key]
+    return None
+
+
+def text_of(node: Any) -> Optional[str]:
+    """Flatten YouTube style text objects ({simpleText} or {runs: [...]}) to a string"""
+    if isinstance(node, str):
+        return node
+    if not isinstance(node, dict):
+        return None
+    if 'simpleText' in node:
+        return node['simpleText']
+    if 'runs' in node:
+        return ''.join(run.get('text', '') for run in node['runs'] if isinstance(run, dict))
+    if 'content' in node:
+        return node['content']
+    return None
+
+
+def loads_or_none(text: Optional[str]) -> Optional[Any]:
+    """Decode a JSON string, returning None on empty or invalid input"""
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def loads_multi(text: Optional[str]) -> List[Any]:
+    """Decode a body that may hold several JSON documents (one per line) and an anti-XSSI prefix"""
+    if not text:
+        return []
+
+    text = text.strip()
+    if text.startswith('for (;;);'):
+        text = text[len('for (;;);'):]
+
+    single = loads_or_none(text)
+    if single is not None:
+        return [single]
+
+    documents = []
+    for line in text.splitlines():
+        document = loads_or_none(line.strip())
+        if document is not None:
+            documents.append(document)
+    return documents
+
+
+def decode_documents(value: Any) -> List[Any]:
+    """Decode a page script result (JSON text, a list of texts or parsed objects) into documents"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return loads_multi(value)
+    if isinstance(value, list):
+        return [document for item in value for document in decode_documents(item)]
+    return [value]
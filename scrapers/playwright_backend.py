@@ -0,0 +1,202 @@
+import asyncio
+import re
+import time
+from typing import Any, List, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .async_scraper import AsyncScraper, ResultCallback
+from .base_scraper import SocialMediaStats
+from .errors import ElementMissingError, ScrapeError, ScrapeTimeoutError, classify_exception
+from .latency import latency_tracker
+from .page_state import CONSENT_DISMISSED, LOGIN_PROMPT, page_state_script, raise_for_page_state
+from .locale_pin import locale_cookies, pin_url
+from .payload_utils import decode_documents, loads_multi
+from .retry import RetryPolicy, classify_stats
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Resource types not needed to read counts (same idea as --disable-images for Selenium)
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+class PlaywrightTiming:
+    """Timing constants for the Playwright backend"""
+    SETTLE_WAIT = 3  # seconds after load for hydration XHRs to finish
+
+class PlaywrightBackend(AsyncScraper):
+    """Async scraping backend: one browser process, one BrowserContext per URL, pages bounded by a semaphore
+
+    Counts come from the same payload parsers the Selenium scrapers use (page JSON plus
+    captured XHR responses), so a URL costs a context instead of a chromedriver process.
+    """
+
+    def __init__(self, headless: bool = True, timeout: int = 30, max_concurrency: Optional[int] = None):
+        super().__init__(headless, timeout, max_concurrency or Config.PLAYWRIGHT_MAX_CONCURRENCY)
+        self._playwright = None
+        self._browser = None
+        self._semaphore = None
+        self.retry_policy = RetryPolicy()
+
+    async def start(self):
+        """Launch the shared browser process"""
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu',
+                  '--disable-blink-features=AutomationControlled']
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Close the browser and stop Playwright"""
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _block_resources(self, route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _read_response(self, response, patterns, captured):
+        """Store the JSON body of a matching XHR/fetch response"""
+        if not any(re.search(pattern, response.url) for pattern in patterns):
+            return
+        try:
+            captured.extend(loads_multi(await response.text()))
+        except Exception:
+            pass
+
+    async def _check_page_state(self, page, parser):
+        """Same blocked-page classification as BaseScraper.check_page_state, on a Playwright page"""
+        if not parser.PAGE_STATE_MARKERS:
+            return
+        script = f"() => {{ {page_state_script(parser.PAGE_STATE_MARKERS)} }}"
+        state = await page.evaluate(script)
+        if state == CONSENT_DISMISSED:
+            await page.wait_for_timeout(parser.CONSENT_DISMISS_WAIT * 1000)
+            state = await page.evaluate(script)
+        if state == LOGIN_PROMPT:
+            # A login prompt may render before the main content; re-check once the page settled
+            await page.wait_for_timeout(PlaywrightTiming.SETTLE_WAIT * 1000)
+            state = await page.evaluate(script)
+        raise_for_page_state(state, parser.PLATFORM, page.url)
+
+    async def scrape(self, url: str, session: Optional[Any] = None) -> SocialMediaStats:
+        """Scrape one video URL in its own BrowserContext (or in the BrowserContext passed as session)
+
+        Classified failures are retried like BaseScraper.scrape_with_retry, releasing the page slot
+        during the backoff; retry_count and scrape_time are recorded.
+        """
+        from . import ScraperFactory
+
+        url_info = URLDetector.validate_url(url)
+        if not url_info['valid']:
+            return SocialMediaStats(platform='unknown', url=url, error=f"Invalid URL: {url_info['error']}",
+                                    error_type='unsupported')
+
+        platform = url_info['platform']
+
+        # Scraper instance is only used for its payload parsers and timeouts; it never opens a driver
+        parser = ScraperFactory.create_scraper(platform, headless=self.headless, timeout=self.timeout)
+
+        policy = self.retry_policy
+        started = time.monotonic()
+        retries = 0
+        while True:
+            stats = await self._scrape_once(url, platform, parser, session)
+            error_type = classify_stats(stats)
+            if not policy.should_retry(error_type, retries):
+                break
+            await asyncio.sleep(policy.delay(retries))
+            retries += 1
+
+        if error_type == ElementMissingError.kind and not stats.error:
+            stats.error = "No metrics found on page"
+        stats.error_type = error_type
+        stats.retry_count = retries
+        stats.scrape_time = round(time.monotonic() - started, 2)
+        return stats
+
+    async def _goto(self, page, url: str, parser):
+        """Navigate with the platform's adaptive page timeout, recording the load time"""
+        timeout = parser.stage_timeout('page')
+        started = time.monotonic()
+        try:
+            await page.goto(url, wait_until='load', timeout=timeout * 1000)
+        except Exception as e:
+            if classify_exception(e) == ScrapeTimeoutError.kind:
+                latency_tracker.record(parser.PLATFORM, 'page', timeout)
+            raise
+        latency_tracker.record(parser.PLATFORM, 'page', time.monotonic() - started)
+
+    async def _scrape_once(self, url: str, platform: str, parser, session: Optional[Any]) -> SocialMediaStats:
+        """One attempt: open the page, classify it and read counts from its payloads"""
+        stats = SocialMediaStats(platform=platform, url=url)
+
+        async with self._semaphore:
+            context = session or await self._browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={'width': 1920, 'height': 1080},
+                **({'locale': Config.SCRAPER_LOCALE} if Config.SCRAPER_LOCALE else {})
+            )
+            try:
+                # A caller's context is reused across URLs and already has its routes
+                if session is None:
+                    await context.route('**/*', self._block_resources)
+                if Config.SCRAPER_LOCALE:
+                    await context.add_cookies(locale_cookies(platform, Config.SCRAPER_LOCALE))
+                page = await context.new_page()
+
+                captured, reads = [], []
+                page.on('response', lambda response: reads.append(asyncio.ensure_future(
+                    self._read_response(response, parser.CAPTURE_PATTERNS, captured))))
+
+                page_url = pin_url(url, platform, Config.SCRAPER_LOCALE) if Config.SCRAPER_LOCALE else url
+                await self._goto(page, page_url, parser)
+                await self._check_page_state(page, parser)
+                await page.wait_for_timeout(PlaywrightTiming.SETTLE_WAIT * 1000)
+
+                payloads = []
+                for script in parser.PAGE_PAYLOAD_SCRIPTS:
+                    try:
+                        payloads.extend(decode_documents(await page.evaluate(f"() => {{ {script} }}")))
+                    except Exception:
+                        continue
+
+                await asyncio.gather(*reads, return_exceptions=True)
+                payloads.extend(captured)
+
+                parser.raise_for_payloads(payloads)
+                parser.apply_payload_stats(stats, parser.payload_stats(payloads, url, page.url))
+                if all(getattr(stats, field) is None for field in ('views', 'likes', 'shares', 'comments')):
+                    stats.error = f"No metrics found in page data for {url}"
+                    stats.error_type = ElementMissingError.kind
+            except ScrapeError as e:
+                stats.error = str(e)
+                stats.error_type = e.kind
+            except Exception as e:
+                stats.error = f"Error scraping {platform.title()} with Playwright: {str(e)}"
+                stats.error_type = classify_exception(e)
+            finally:
+                if session is None:
+                    await context.close()
+
+        return stats
+
+    async def scrape_many(self, urls: List[str], max_age: Optional[float] = None,
+                          on_result: Optional[ResultCallback] = None) -> List[SocialMediaStats]:
+        """Scrape URLs concurrently (scrape() already holds the semaphore), keeping input order"""
+        async def one(url):
+            stats = await self.scrape_or_skip(url, max_age=max_age)
+            if on_result:
+                on_result(url, stats)
+            return stats
+
+        return list(await asyncio.gather(*(one(url) for url in urls)))
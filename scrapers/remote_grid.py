@@ -0,0 +1,65 @@
+import itertools
+import threading
+from typing import Dict, List, Optional
+
+import requests
+
+class RemoteNodePool:
+    """Spread remote WebDriver sessions over Selenium Grid hubs / standalone nodes by free capacity"""
+
+    def __init__(self, urls: List[str], status_timeout: int = 5, browser_name: str = 'chrome'):
+        self.urls = [url.rstrip('/') for url in urls]
+        self.status_timeout = status_timeout
+        self.browser_name = browser_name
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+
+    def _free_slots(self, status: dict) -> int:
+        """Free browser slots reported by a /status payload (Grid 4, standalone 4, or bare ready flag)"""
+        value = status.get('value', status)
+        nodes = value.get('nodes')
+        if not nodes:
+            return 1 if value.get('ready') else 0
+
+        free = 0
+        for node in nodes:
+            if node.get('availability', 'UP') != 'UP':
+                continue
+            for slot in node.get('slots', []):
+                browser = slot.get('stereotype', {}).get('browserName', self.browser_name)
+                if browser == self.browser_name and not slot.get('session'):
+                    free += 1
+        return free
+
+    def capacities(self) -> Dict[str, Optional[int]]:
+        """Free slots per endpoint, None when the endpoint is unreachable"""
+        result = {}
+        for url in self.urls:
+            try:
+                response = requests.get(f"{url}/status", timeout=self.status_timeout)
+                response.raise_for_status()
+                result[url] = self._free_slots(response.json())
+            except Exception:
+                result[url] = None
+        return result
+
+    def pick(self) -> str:
+        """Endpoint with the most free slots; ties rotate so sessions spread across equal nodes"""
+        capacities = {url: free for url, free in self.capacities().items() if free is not None}
+        if not capacities:
+            raise ConnectionError(f"No Selenium endpoint reachable: {', '.join(self.urls)}")
+
+        # When every node is busy the Grid queues the new session, so the least loaded still wins
+        best = max(capacities.values())
+        candidates = [url for url, free in capacities.items() if free == best]
+        with self._lock:
+            return candidates[next(self._rotation) % len(candidates)]
+
+_pools: Dict[tuple, RemoteNodePool] = {}
+
+def get_node_pool(urls: List[str]) -> RemoteNodePool:
+    """Shared pool per endpoint list, so rotation state is kept across scrapers"""
+    key = tuple(urls)
+    if key not in _pools:
+        _pools[key] = RemoteNodePool(list(urls))
+    return _pools[key]
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .base_scraper import SocialMediaStats
+
+# Fields refreshed together; each group has its own freshness (Config.RESULT_CACHE_FRESHNESS)
+FIELD_GROUPS = {
+    'counts': ('views', 'likes', 'shares', 'comments'),
+    'metadata': ('title', 'author', 'upload_date'),
+}
+
+class ResultCache:
+    """Successful scrape results by (platform, canonical video ID): bounded in-memory LRU over SQLite"""
+
+    def __init__(self, path: str = None, memory_size: int = None, freshness: Optional[Dict[str, float]] = None):
+        self.path = path or ':memory:'
+        self.memory_size = memory_size or Config.RESULT_CACHE_MEMORY_SIZE
+        self.freshness = Config.RESULT_CACHE_FRESHNESS if freshness is None else freshness
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, entry TEXT, updated_at REAL)')
+        self._db.commit()
+
+    def _remember(self, key: str, entry: Dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _entry(self, key: str) -> Optional[Dict]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        row = self._db.execute('SELECT entry FROM result_cache WHERE key = ?', (key,)).fetchone()
+        if not row:
+            return None
+        entry = json.loads(row[0])
+        self._remember(key, entry)
+        return entry
+
+    def _groups_for(self, fields: Optional[Iterable[str]], entry: Dict) -> List[str]:
+        """Field groups a lookup needs: those of fields, or every group the entry holds when none are named"""
+        if not fields:
+            return list(entry['groups'])
+        fields = set(fields)
+        return [group for group, names in FIELD_GROUPS.items() if fields & set(names)]
+
+    def get(self, url: str, max_age: Optional[float] = None, fields: Optional[Iterable[str]] = None,
+            allow_stale: bool = False) -> Optional[SocialMediaStats]:
+        """Cached stats (cache='hit') when every needed field group is fresh; max_age overrides the group limits
+
+        allow_stale also returns expired entries, marked cache='stale'.
+        """
+        key = URLDetector.canonical_id(url)
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entry(key)
+        if not entry:
+            return None
+
+        now = time.time()
+        fresh = True
+        for group in self._groups_for(fields, entry):
+            stamped = entry['groups'].get(group)
+            limit = max_age if max_age is not None else self.freshness.get(group, 0)
+            if stamped is None or now - stamped >= limit:
+                fresh = False
+        if not fresh and not allow_stale:
+            return None
+
+        counts_at = entry['groups'].get('counts') or max(entry['groups'].values())
+        return SocialMediaStats(url=url, cache='hit' if fresh else 'stale', **entry['stats'],
+                                scraped_at=datetime.fromtimestamp(counts_at).isoformat(timespec='seconds'))
+
+    def put(self, stats: SocialMediaStats) -> bool:
+        """Store a successful scrape; field groups it did not find keep their earlier values and age"""
+        if stats.error or stats.cache or all(getattr(stats, f) is None for f in FIELD_GROUPS['counts']):
+            return False
+        key = URLDetector.canonical_id(stats.url)
+        if not key:
+            return False
+
+        now = time.time()
+        stats.scraped_at = stats.scraped_at or datetime.fromtimestamp(now).isoformat(timespec='seconds')
+        with self._lock:
+            entry = self._entry(key) or {'stats': {'platform': stats.platform}, 'groups': {}}
+            for group, names in FIELD_GROUPS.items():
+                values = {name: getattr(stats, name) for name in names}
+                # A group the scrape found nothing for is not stamped, so asking for it rescrapes
+                if any(value is not None for value in values.values()):
+                    entry['stats'].update(values)
+                    entry['groups'][group] = now
+            self._remember(key, entry)
+            self._db.execute('INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?)', (key, json.dumps(entry), now))
+            self._db.commit()
+        return True
+
+    def invalidate(self, url: str):
+        """Forget the cached result of url's video"""
+        key = URLDetector.canonical_id(url)
+        with self._lock:
+            self._memory.pop(key, None)
+            self._db.execute('DELETE FROM result_cache WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute('DELETE FROM result_cache')
+            self._db.commit()
+
+_cache = None
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide result cache, None when disabled"""
+    global _cache
+    if not Config.RESULT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResultCache(Config.RESULT_CACHE_PATH)
+    return _cache
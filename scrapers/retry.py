@@ -0,0 +1,39 @@
+import random
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional
+
+from config import Config
+from .errors import (
+    ScrapeTimeoutError, ElementMissingError, BrowserCrashError, classify_message
+)
+
+# Login walls and captchas will not clear by asking again, so they fail fast
+RETRYABLE_ERRORS = frozenset({ScrapeTimeoutError.kind, ElementMissingError.kind, BrowserCrashError.kind})
+
+METRIC_FIELDS = ('views', 'likes', 'shares', 'comments')
+
+@dataclass
+class RetryPolicy:
+    """How many times and how long to wait before retrying a classified failure"""
+    max_retries: int = field(default_factory=lambda: Config.MAX_RETRIES)
+    base_delay: float = field(default_factory=lambda: Config.REQUEST_DELAY)
+    max_delay: float = 30.0
+    retryable: FrozenSet[str] = RETRYABLE_ERRORS
+
+    def should_retry(self, error_type: Optional[str], retries_done: int) -> bool:
+        return error_type in self.retryable and retries_done < self.max_retries
+
+    def delay(self, retries_done: int) -> float:
+        """Exponential backoff with equal jitter: half fixed, half random"""
+        backoff = min(self.max_delay, self.base_delay * (2 ** retries_done))
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+def classify_stats(stats) -> Optional[str]:
+    """Error kind of a finished scrape, None when it succeeded"""
+    if stats.error_type:
+        return stats.error_type
+    if stats.error:
+        return classify_message(stats.error) or 'unknown'
+    if all(getattr(stats, name) is None for name in METRIC_FIELDS):
+        return ElementMissingError.kind
+    return None
@@ -0,0 +1,110 @@
+import concurrent.futures
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from config import Config
+from utils.url_detector import URLDetector
+from .base_scraper import SocialMediaStats
+from .result_cache import FIELD_GROUPS, get_result_cache
+
+# Background refreshes get their own threads so a slow scrape never holds up a dashboard rerun
+REVALIDATE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=Config.REVALIDATE_WORKERS, thread_name_prefix='revalidate'
+)
+
+def age_seconds(scraped_at: Optional[str]) -> Optional[float]:
+    """Seconds since an ISO scraped_at timestamp, None when unknown"""
+    if not scraped_at:
+        return None
+    try:
+        return max(0.0, (datetime.now() - datetime.fromisoformat(scraped_at)).total_seconds())
+    except ValueError:
+        return None
+
+class Revalidator:
+    """Stale-while-revalidate over the result cache: last known stats now, a background refresh when stale
+
+    Refreshed stats land in the result cache, so the next read (e.g. a Streamlit rerun) shows them;
+    callers that want a push instead pass on_update.
+    """
+
+    def __init__(self, scraper_factory: Optional[Callable[[], Any]] = None,
+                 executor: Optional[concurrent.futures.Executor] = None):
+        self.scraper_factory = scraper_factory or self._default_scraper
+        self.executor = executor or REVALIDATE_EXECUTOR
+        self._lock = threading.Lock()
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+
+    @staticmethod
+    def _default_scraper():
+        from . import ScraperFactory
+        return ScraperFactory.create_async_scraper(headless=True)
+
+    def get(self, url: str, on_update: Optional[Callable[[SocialMediaStats], None]] = None) -> Optional[SocialMediaStats]:
+        """Cached stats right away (cache='hit' or 'stale'), None when nothing is cached; stale ones are refreshed"""
+        cache = get_result_cache()
+        cached = cache.get(url, allow_stale=True) if cache else None
+        if cached is not None and cached.cache == 'stale':
+            self.refresh(url, on_update)
+        return cached
+
+    def refresh(self, url: str, on_update: Optional[Callable[[SocialMediaStats], None]] = None) -> concurrent.futures.Future:
+        """Rescrape url in the background, once per video; on_update receives the stats if the scrape succeeds"""
+        key = URLDetector.canonical_id(url) or url
+        with self._lock:
+            future = self._pending.get(key)
+            started = future is None
+            if started:
+                future = self._pending[key] = self.executor.submit(self._scrape, url)
+
+        # Callbacks run at once when the scrape already finished, so they are added outside the lock
+        if started:
+            future.add_done_callback(lambda done: self._finish(key, done))
+        if on_update:
+            future.add_done_callback(lambda done: self._notify(done, on_update))
+        return future
+
+    def _scrape(self, url: str) -> SocialMediaStats:
+        return self.scraper_factory().scrape_sync(url, max_age=0)
+
+    def _finish(self, key: str, done: concurrent.futures.Future):
+        with self._lock:
+            if self._pending.get(key) is done:
+                del self._pending[key]
+
+    def _notify(self, done: concurrent.futures.Future, on_update: Callable[[SocialMediaStats], None]):
+        if done.cancelled() or done.exception() is not None or done.result().error:
+            return
+        try:
+            on_update(done.result())
+        except Exception as e:
+            print(f"Revalidation callback failed: {e}")
+
+    def pending(self) -> int:
+        """Number of background refreshes still running"""
+        with self._lock:
+            return len(self._pending)
+
+    def apply(self, data: Dict[str, Any], url: str) -> Optional[SocialMediaStats]:
+        """Update a stats dict in place with the last known counts for url (refreshing them when stale)"""
+        cached = self.get(url)
+        if cached is None:
+            return None
+        for name in FIELD_GROUPS['counts']:
+            if getattr(cached, name) is not None:
+                data[name] = getattr(cached, name)
+        data['scraped_at'] = cached.scraped_at
+        data['cache'] = cached.cache
+        return cached
+
+_revalidator = None
+
+def get_revalidator() -> Optional[Revalidator]:
+    """Process-wide revalidator, None when stale-while-revalidate or the result cache is disabled"""
+    global _revalidator
+    if not (Config.STALE_WHILE_REVALIDATE and Config.RESULT_CACHE_ENABLED):
+        return None
+    if _revalidator is None:
+        _revalidator = Revalidator()
+    return _revalidator
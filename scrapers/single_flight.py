@@ -0,0 +1,84 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+class SingleFlight:
+    """Coalesce concurrent calls per key: one leader does the work, later callers await its result
+
+    Callers may run in different threads and event loops (one per Streamlit session), so the
+    shared result lives in a concurrent.futures.Future. A leader that is cancelled hands the
+    key over: its followers start a new flight instead of failing with it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+
+    def join(self, key: str) -> Tuple[concurrent.futures.Future, bool]:
+        """The in-flight future for key and whether the caller became its leader"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = concurrent.futures.Future()
+            return future, True
+
+    def finish(self, key: str, future: concurrent.futures.Future, result: Any = None, error: BaseException = None):
+        """Publish the leader's outcome (result None = leader gave up) and close the flight"""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self) -> List[str]:
+        with self._lock:
+            return list(self._calls)
+
+    async def _wait(self, future: concurrent.futures.Future) -> Any:
+        """Await another caller's future without letting our own cancellation cancel it"""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        def relay(done: concurrent.futures.Future):
+            def settle():
+                if waiter.done():
+                    return
+                if done.exception() is not None:
+                    waiter.set_exception(done.exception())
+                else:
+                    waiter.set_result(done.result())
+            try:
+                loop.call_soon_threadsafe(settle)
+            except RuntimeError:
+                pass  # the follower's loop has already closed
+
+        future.add_done_callback(relay)
+        return await waiter
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Result of work() for key and whether it came from another caller's flight"""
+        while True:
+            future, leader = self.join(key)
+            if not leader:
+                result = await self._wait(future)
+                if result is None:
+                    continue
+                return result, True
+
+            try:
+                result = await work()
+            except asyncio.CancelledError:
+                self.finish(key, future)
+                raise
+            except Exception as e:
+                self.finish(key, future, error=e)
+                raise
+            self.finish(key, future, result)
+            return result, False
+
+# Process-wide, so every scraper instance and backend shares one flight per video
+in_flight = SingleFlight()
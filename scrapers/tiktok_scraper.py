@@ -1,18 +1,60 @@
 import time
 import re
+from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from .base_scraper import BaseScraper, SocialMediaStats
+from .errors import ScrapeError, ScrapeTimeoutError, PrivateContentError, UnavailableError, classify_exception
+from .network_capture import NetworkCapture
+from .payload_utils import walk_dicts
+from utils.url_detector import URLDetector
+
+# Profile feed pages are loaded through this XHR endpoint
+ITEM_LIST_PATTERN = r'/api/post/item_list/'
+# Video pages (and in-app navigation between videos) fetch exact counts here
+ITEM_DETAIL_PATTERN = r'/api/item/detail/'
+
+# statusCode values of the video-detail hydration state for videos that cannot be shown
+UNAVAILABLE_STATUS_CODES = {
+    10204: UnavailableError,  # video not found / deleted
+    10216: PrivateContentError,  # private video
+    10222: PrivateContentError,  # private account
+}
+
+# Hydration state embedded in the server-rendered video page
+REHYDRATION_SCRIPT = """
+var ids = ['__UNIVERSAL_DATA_FOR_REHYDRATION__', 'SIGI_STATE'];
+for (var i = 0; i < ids.length; i++) {
+    var el = document.getElementById(ids[i]);
+    if (el && el.textContent) return el.textContent;
+}
+return null;
+"""
+
+class TikTokTiming:
+    """Timing constants for TikTok scraping"""
+    FEED_SCROLL_WAIT = 2
+    FEED_MAX_IDLE_SCROLLS = 3
+    VIDEO_ELEMENT_TIMEOUT = 20
+    PAGE_SETTLE_WAIT = 3
 
 class TikTokScraper(BaseScraper):
     """TikTok video statistics scraper"""
     
+    PLATFORM = 'tiktok'
+    PAGE_LOAD_TIMEOUT = 45  # TikTok needs more than the default until latency samples exist
+    CONTENT_TIMEOUT = TikTokTiming.VIDEO_ELEMENT_TIMEOUT
+    CAPTURE_PATTERNS = [ITEM_LIST_PATTERN, ITEM_DETAIL_PATTERN]
+    PAGE_PAYLOAD_SCRIPTS = [REHYDRATION_SCRIPT]
+    PAGE_STATE_MARKERS = {
+        'login_urls': ['/login'],
+        'captcha_selectors': ['#captcha-verify-container', '.captcha_verify_container',
+                              '[class*="captcha-verify"]', '#tiktok-verify-ele'],
+    }
+    
     def setup_driver(self):
         """Setup Selenium WebDriver with TikTok-specific optimizations"""
         from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
-        from selenium import webdriver
         
         chrome_options = Options()
         if self.headless:
@@ -32,187 +74,185 @@ class TikTokScraper(BaseScraper):
         # Additional performance optimizations
         chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        self.apply_locale_options(chrome_options)
+        NetworkCapture.enable(chrome_options)
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.set_page_load_timeout(45)  # Increased timeout for TikTok
+        self.driver = self._create_driver(chrome_options)
+        self.apply_page_load_timeout(force=True)
         
         # Execute script to remove webdriver property
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        self.network_capture = NetworkCapture(self.driver, self.CAPTURE_PATTERNS)
+        self._attach_cdp()
     
     def scrape(self, url: str) -> SocialMediaStats:
         """Scrape TikTok video statistics"""
         stats = SocialMediaStats(platform='tiktok', url=url)
         
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                self.driver.get(url)
-                time.sleep(8)  # Increased initial wait time
-                
-                # Wait for video container to load with increased timeout
-                # Try multiple selectors for better compatibility
-                video_selectors = [
-                    '[data-e2e="video-player"]',
-                    '.video-player',
-                    '[data-e2e="browse-video"]',
-                    '.browse-video',
-                    'video',
-                    '.video-card'
-                ]
-                
-                element_found = False
-                for selector in video_selectors:
-                    try:
-                        self.wait_for_element(By.CSS_SELECTOR, selector, timeout=10)
-                        element_found = True
-                        break
-                    except TimeoutException:
-                        continue
-                
-                if element_found:
-                    break  # Success, exit retry loop
-                else:
-                    raise TimeoutException("No video elements found")
-                
-            except TimeoutException:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    stats.error = f"Timeout: TikTok page took too long to load after {max_retries} attempts"
-                    return stats
-                time.sleep(3)  # Wait before retry
-                continue
+        try:
+            self.navigate(url)
+            self.check_page_state(content_pending=True)
+            # Deleted/private videos never render a player; the hydration state says so right away
+            self.raise_for_payloads(self.page_payloads())
+            
+            # Wait for the video container; one combined selector instead of a 10s wait per selector
+            video_selectors = [
+                '[data-e2e="video-player"]',
+                '.video-player',
+                '[data-e2e="browse-video"]',
+                '.browse-video',
+                'video',
+                '.video-card'
+            ]
+            self.wait_for_content(', '.join(video_selectors), timeout=TikTokTiming.VIDEO_ELEMENT_TIMEOUT)
+            time.sleep(TikTokTiming.PAGE_SETTLE_WAIT)  # Let the counters hydrate
+        except TimeoutException:
+            # Retries (with backoff, on the same browser) are handled by scrape_with_retry
+            stats.error = "Timeout: TikTok page took too long to load"
+            stats.error_type = ScrapeTimeoutError.kind
+            return stats
+        except ScrapeError as e:
+            stats.error = str(e)
+            stats.error_type = e.kind
+            return stats
         
         try:
+            # Exact counts from the item detail JSON; DOM is only read for what is still missing
+            self.apply_payload_stats(stats, self.payload_stats(self.page_payloads(), url, self.driver.current_url))
             
             # Extract title/description
-            try:
-                title_selectors = [
-                    '[data-e2e="video-desc"]',
-                    '.video-meta-caption',
-                    '.tt-video-meta-caption',
-                    'h1[data-e2e="video-desc"]'
-                ]
-                
-                for selector in title_selectors:
-                    title_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if title_element and title_element.text:
-                        stats.title = title_element.text.strip()
-                        break
-            except:
-                pass
+            if stats.title is None:
+                try:
+                    title_selectors = [
+                        '[data-e2e="video-desc"]',
+                        '.video-meta-caption',
+                        '.tt-video-meta-caption',
+                        'h1[data-e2e="video-desc"]'
+                    ]
+                    
+                    for selector in title_selectors:
+                        title_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if title_element and title_element.text:
+                            stats.title = title_element.text.strip()
+                            break
+                except:
+                    pass
             
             # Extract author/username
-            try:
-                author_selectors = [
-                    '[data-e2e="video-author-uniqueid"]',
-                    '.author-uniqueid',
-                    'h3[data-e2e="video-author-uniqueid"]',
-                    '.username'
-                ]
-                
-                for selector in author_selectors:
-                    author_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if author_element and author_element.text:
-                        stats.author = author_element.text.strip().replace('@', '')
-                        break
-            except:
-                pass
+            if stats.author is None:
+                try:
+                    author_selectors = [
+                        '[data-e2e="video-author-uniqueid"]',
+                        '.author-uniqueid',
+                        'h3[data-e2e="video-author-uniqueid"]',
+                        '.username'
+                    ]
+                    
+                    for selector in author_selectors:
+                        author_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if author_element and author_element.text:
+                            stats.author = author_element.text.strip().replace('@', '')
+                            break
+                except:
+                    pass
             
             # Extract view count
-            try:
-                # First try to extract from page source (most reliable for TikTok)
-                page_source = self.driver.page_source
-                import re
-                
-                # Look for playCount in JSON data
-                play_count_patterns = [
-                    r'"playCount":\s*"?(\d+)"?',
-                    r'"stats":\s*{[^}]*"playCount":\s*(\d+)',
-                    r'"viewCount":\s*"?(\d+)"?'
-                ]
-                
-                for pattern in play_count_patterns:
-                    matches = re.findall(pattern, page_source)
-                    if matches:
-                        try:
-                            stats.views = int(matches[0])
-                            break
-                        except (ValueError, IndexError):
-                            continue
-                
-                # Fallback to DOM selectors if page source extraction fails
-                if stats.views is None:
-                    view_selectors = [
-                        '[data-e2e="video-views"]',
-                        '.video-count',
-                        '.playback-count'
+            if stats.views is None:
+                try:
+                    # First try to extract from page source (most reliable for TikTok)
+                    page_source = self.driver.page_source
+                    import re
+                    
+                    # Look for playCount in JSON data
+                    play_count_patterns = [
+                        r'"playCount":\s*"?(\d+)"?',
+                        r'"stats":\s*{[^}]*"playCount":\s*(\d+)',
+                        r'"viewCount":\s*"?(\d+)"?'
                     ]
                     
-                    for selector in view_selectors:
-                        view_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                        if view_element and view_element.text:
-                            view_text = view_element.text
-                            stats.views = self.extract_number(view_text)
-                            break
-            except:
-                pass
+                    for pattern in play_count_patterns:
+                        matches = re.findall(pattern, page_source)
+                        if matches:
+                            try:
+                                stats.views = int(matches[0])
+                                break
+                            except (ValueError, IndexError):
+                                continue
+                    
+                    # Fallback to DOM selectors if page source extraction fails
+                    if stats.views is None:
+                        view_selectors = [
+                            '[data-e2e="video-views"]',
+                            '.video-count',
+                            '.playback-count'
+                        ]
+                    
+                        for selector in view_selectors:
+                            view_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                            if view_element and view_element.text:
+                                view_text = view_element.text
+                                stats.views = self.extract_number(view_text)
+                                break
+                except:
+                    pass
             
             # Extract likes
-            try:
-                like_selectors = [
-                    '[data-e2e="like-count"]',
-                    '[data-e2e="video-like-count"]',
-                    '.like-count',
-                    'strong[data-e2e="like-count"]'
-                ]
-                
-                for selector in like_selectors:
-                    like_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if like_element and like_element.text:
-                        like_text = like_element.text
-                        stats.likes = self.extract_number(like_text)
-                        break
-            except:
-                pass
+            if stats.likes is None:
+                try:
+                    like_selectors = [
+                        '[data-e2e="like-count"]',
+                        '[data-e2e="video-like-count"]',
+                        '.like-count',
+                        'strong[data-e2e="like-count"]'
+                    ]
+                    
+                    for selector in like_selectors:
+                        like_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if like_element and like_element.text:
+                            like_text = like_element.text
+                            stats.likes = self.extract_number(like_text)
+                            break
+                except:
+                    pass
             
             # Extract shares
-            try:
-                share_selectors = [
-                    '[data-e2e="share-count"]',
-                    '[data-e2e="video-share-count"]',
-                    '.share-count',
-                    'strong[data-e2e="share-count"]'
-                ]
-                
-                for selector in share_selectors:
-                    share_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if share_element and share_element.text:
-                        share_text = share_element.text
-                        stats.shares = self.extract_number(share_text)
-                        break
-            except:
-                pass
+            if stats.shares is None:
+                try:
+                    share_selectors = [
+                        '[data-e2e="share-count"]',
+                        '[data-e2e="video-share-count"]',
+                        '.share-count',
+                        'strong[data-e2e="share-count"]'
+                    ]
+                    
+                    for selector in share_selectors:
+                        share_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if share_element and share_element.text:
+                            share_text = share_element.text
+                            stats.shares = self.extract_number(share_text)
+                            break
+                except:
+                    pass
             
             # Extract comments
-            try:
-                comment_selectors = [
-                    '[data-e2e="comment-count"]',
-                    '[data-e2e="video-comment-count"]',
-                    '.comment-count',
-                    'strong[data-e2e="comment-count"]'
-                ]
-                
-                for selector in comment_selectors:
-                    comment_element = self.safe_find_element(By.CSS_SELECTOR, selector)
-                    if comment_element and comment_element.text:
-                        comment_text = comment_element.text
-                        stats.comments = self.extract_number(comment_text)
-                        break
-            except:
-                pass
+            if stats.comments is None:
+                try:
+                    comment_selectors = [
+                        '[data-e2e="comment-count"]',
+                        '[data-e2e="video-comment-count"]',
+                        '.comment-count',
+                        'strong[data-e2e="comment-count"]'
+                    ]
+                    
+                    for selector in comment_selectors:
+                        comment_element = self.safe_find_element(By.CSS_SELECTOR, selector)
+                        if comment_element and comment_element.text:
+                            comment_text = comment_element.text
+                            stats.comments = self.extract_number(comment_text)
+                            break
+                except:
+                    pass
             
             # Extract upload date (if available)
             upload_date = None
@@ -233,15 +273,132 @@ class TikTokScraper(BaseScraper):
             if not upload_date:
                 upload_date = self._enhanced_date_extraction_tiktok()
             
-            stats.upload_date = upload_date
+            stats.upload_date = stats.upload_date or upload_date
                 
         except TimeoutException:
             stats.error = "Timeout: TikTok page took too long to load"
+            stats.error_type = ScrapeTimeoutError.kind
         except Exception as e:
             stats.error = f"Error scraping TikTok: {str(e)}"
+            stats.error_type = classify_exception(e)
         
         return stats
     
+    def _stats_from_item(self, item):
+        """Build stats from a TikTok itemStruct (item_list / item detail payloads)"""
+        if not isinstance(item, dict) or not item.get('id'):
+            return None
+        
+        author = item.get('author') or {}
+        username = author.get('uniqueId') if isinstance(author, dict) else author
+        
+        # stats holds integers; statsV2 holds exact counts as strings
+        counts = dict(item.get('statsV2') or {})
+        counts.update({k: v for k, v in (item.get('stats') or {}).items() if v is not None})
+        
+        def count(key):
+            try:
+                return int(counts[key])
+            except (KeyError, TypeError, ValueError):
+                return None
+        
+        upload_date = None
+        try:
+            if item.get('createTime'):
+                upload_date = datetime.fromtimestamp(int(item['createTime'])).strftime('%B %d, %Y')
+        except (TypeError, ValueError, OSError):
+            pass
+        
+        if username:
+            video_url = f"https://www.tiktok.com/@{username}/video/{item['id']}"
+        else:
+            video_url = f"https://www.tiktok.com/video/{item['id']}"
+        
+        return SocialMediaStats(
+            platform='tiktok',
+            url=video_url,
+            views=count('playCount'),
+            likes=count('diggCount'),
+            shares=count('shareCount'),
+            comments=count('commentCount'),
+            title=item.get('desc') or None,
+            author=username,
+            upload_date=upload_date
+        )
+    
+    def _stats_from_payloads(self, payloads, video_id=None):
+        """Find the itemStruct of video_id in JSON payloads and build stats from it"""
+        for payload in payloads:
+            for node in walk_dicts(payload):
+                if not node.get('id') or 'createTime' not in node:
+                    continue
+                if 'stats' not in node and 'statsV2' not in node:
+                    continue
+                # Hydration state also carries recommended videos
+                if video_id and str(node['id']) != video_id:
+                    continue
+                return self._stats_from_item(node)
+        return None
+    
+    def raise_for_payloads(self, payloads):
+        """Deleted and private videos from the statusCode of the video-detail state"""
+        for payload in payloads:
+            for node in walk_dicts(payload):
+                error_class = UNAVAILABLE_STATUS_CODES.get(node.get('statusCode'))
+                if error_class and 'itemInfo' not in node:
+                    raise error_class(f"TikTok video not available (statusCode {node['statusCode']}: {node.get('statusMsg') or 'no message'})")
+    
+    def payload_stats(self, payloads, url, current_url=None):
+        """Stats of the video at url from item detail / hydration payloads"""
+        # Short links only reveal the numeric id after the redirect
+        video_id = self._video_id(current_url) or self._video_id(url)
+        return self._stats_from_payloads(payloads, video_id)
+    
+    def _video_id(self, url):
+        """Numeric video ID of a TikTok video URL, if it has one"""
+        match = re.search(r'/video/(\d+)', url or '')
+        return match.group(1) if match else None
+    
+    def scrape_listing(self, url, limit=None, fields=None):
+        """Harvest stats for a profile's recent videos from the item_list responses of its feed"""
+        listing = URLDetector.detect_listing(url)
+        if not listing or listing['platform'] != 'tiktok':
+            raise ValueError(f"Not a TikTok profile URL: {url}")
+        
+        self.navigate(f"https://www.tiktok.com/{listing['listing_id']}")
+        self.check_page_state()
+        
+        results = []
+        seen_ids = set()
+        idle_scrolls = 0
+        has_more = True
+        
+        while has_more and idle_scrolls < TikTokTiming.FEED_MAX_IDLE_SCROLLS:
+            new_items = 0
+            for payload in self.network_capture.json_bodies(ITEM_LIST_PATTERN):
+                if not isinstance(payload, dict):
+                    continue
+                for item in payload.get('itemList') or []:
+                    stats = self._stats_from_item(item)
+                    if stats and item['id'] not in seen_ids:
+                        seen_ids.add(item['id'])
+                        results.append(stats)
+                        new_items += 1
+                if payload.get('hasMore') is False:
+                    has_more = False
+            
+            if limit and len(results) >= limit:
+                results = results[:limit]
+                break
+            
+            idle_scrolls = 0 if new_items else idle_scrolls + 1
+            
+            # Scrolling the feed triggers the next item_list request
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(TikTokTiming.FEED_SCROLL_WAIT)
+        
+        return self.fill_missing_fields(results, fields)
+    
     def extract_number(self, text: str) -> int:
         """Override to handle TikTok specific number formats"""
         if not text:
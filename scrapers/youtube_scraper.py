@@ -5,6 +5,12 @@ from datetime import datetime, timedelta
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from .base_scraper import BaseScraper, SocialMediaStats
+from .errors import (
+    ScrapeError, ScrapeTimeoutError, LoginWallError, PrivateContentError, UnavailableError, classify_exception
+)
+from .payload_utils import walk_dicts, find_first, text_of, loads_or_none
+from utils.url_detector import URLDetector
+from config import Config
 
 # Constants for better maintainability
 class YouTubeSelectors:
@@ -50,6 +56,17 @@ class YouTubeSelectors:
     REGULAR_UPLOAD_DATE = ['#info-strings yt-formatted-string', '.ytd-video-secondary-info-renderer #date']
     SHORTS_UPLOAD_DATE = ['.ytd-reel-player-header-renderer .published-time-text', '.reel-player-header-renderer .published-time-text', 'span[class*="published-time"]', '.published-time-text']
 
+# Listing renderers that carry one video each (channel tabs, playlists, shorts shelves)
+LISTING_VIDEO_RENDERERS = ('videoRenderer', 'gridVideoRenderer', 'playlistVideoRenderer', 'reelItemRenderer')
+
+# InnerTube endpoints whose responses carry watch page data (SPA navigation, comments)
+NEXT_PATTERN = r'/youtubei/v1/next'
+PLAYER_PATTERN = r'/youtubei/v1/player'
+
+# Watch page data embedded by the server render
+PLAYER_RESPONSE_SCRIPT = "return window.ytInitialPlayerResponse ? JSON.stringify(window.ytInitialPlayerResponse) : null;"
+INITIAL_DATA_SCRIPT = "return window.ytInitialData ? JSON.stringify(window.ytInitialData) : null;"
+
 # Timing constants
 class YouTubeTiming:
     """Timing constants for YouTube scraping"""
@@ -59,10 +76,52 @@ class YouTubeTiming:
     COMMENTS_SCROLL_WAIT = 2
     ELEMENT_TIMEOUT = 10
     SHORTS_ELEMENT_TIMEOUT = 5
+    TITLE_TIMEOUT = 5
+    INNERTUBE_TIMEOUT = 10
+
+# InnerTube request issued from inside the page so it reuses the session's
+# cookies, API key and client context (ytcfg)
+INNERTUBE_FETCH_SCRIPT = """
+const endpoint = arguments[0];
+const continuation = arguments[1];
+const done = arguments[arguments.length - 1];
+const cfg = (window.ytcfg && window.ytcfg.data_) || {};
+if (!cfg.INNERTUBE_CONTEXT) { done(null); return; }
+fetch('/youtubei/v1/' + endpoint + '?prettyPrint=false' +
+      (cfg.INNERTUBE_API_KEY ? '&key=' + cfg.INNERTUBE_API_KEY : ''), {
+    method: 'POST',
+    credentials: 'same-origin',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({context: cfg.INNERTUBE_CONTEXT, continuation: continuation})
+}).then(r => r.text()).then(done).catch(() => done(null));
+"""
 
 class YouTubeScraper(BaseScraper):
     """YouTube video statistics scraper with enhanced maintainability"""
     
+    PLATFORM = 'youtube'
+    CONTENT_TIMEOUT = YouTubeTiming.ELEMENT_TIMEOUT
+    CAPTURE_PATTERNS = [NEXT_PATTERN, PLAYER_PATTERN]
+    PAGE_PAYLOAD_SCRIPTS = [PLAYER_RESPONSE_SCRIPT, INITIAL_DATA_SCRIPT]
+    PAGE_STATE_MARKERS = {
+        'login_urls': ['accounts.google.com', '/verify_age'],
+        'captcha_urls': ['google.com/sorry', '/das_captcha'],
+        'captcha_selectors': ['form#captcha-form', 'iframe[src*="recaptcha"]'],
+        'consent_urls': ['consent.youtube.com', 'consent.google.com'],
+        'consent_accept_selectors': ['form[action*="consent"] button[aria-label*="Accept"]',
+                                     'ytd-consent-bump-v2-lightbox button[aria-label*="Accept"]'],
+    }
+    
+    @classmethod
+    def timeout_defaults(cls, timeout: int = Config.SELENIUM_TIMEOUT):
+        """Base stages plus the Shorts container and regular title waits"""
+        return dict(super().timeout_defaults(timeout),
+                    shorts=YouTubeTiming.SHORTS_ELEMENT_TIMEOUT, title=YouTubeTiming.TITLE_TIMEOUT)
+    
+    def _xpath_contains_any(self, expression, kind):
+        """XPath condition matching the metric words of the page language (all languages when not pinned)"""
+        return ' or '.join(f'contains({expression}, "{word}")' for word in self.metric_words(kind))
+    
     def _extract_with_selectors(self, selectors, is_meta=False, attribute='content'):
         """Helper method to extract data using multiple selectors"""
         if isinstance(selectors, str):
@@ -101,11 +160,293 @@ class YouTubeScraper(BaseScraper):
             pass
         return likes, comments
     
+    def _get_initial_data(self):
+        """Read ytInitialData from the already loaded page"""
+        try:
+            raw = self.run_script(INITIAL_DATA_SCRIPT)
+        except Exception:
+            return None
+        return loads_or_none(raw)
+    
+    def _parse_like_count(self, data):
+        """Find the exact like count (accessibility text / likeCount) in watch page data"""
+        for node in walk_dicts(data):
+            if 'likeButtonViewModel' in node:
+                # "like this video along with 1,234 other people"
+                default_button = find_first(node['likeButtonViewModel'], 'defaultButtonViewModel')
+                count = self._count_from_text(find_first(default_button, 'accessibilityText'))
+                if count is not None:
+                    return count
+            elif 'likeButtonRenderer' in node:
+                like_count = node['likeButtonRenderer'].get('likeCount')
+                if isinstance(like_count, int):
+                    return like_count
+        return None
+    
+    def _stats_from_payloads(self, payloads, video_id=None):
+        """Build stats from ytInitialPlayerResponse / ytInitialData / youtubei/v1 payloads"""
+        stats = SocialMediaStats(platform='youtube', url='')
+        
+        for payload in payloads:
+            for node in walk_dicts(payload):
+                details = node.get('videoDetails')
+                if isinstance(details, dict) and details.get('viewCount') and stats.views is None:
+                    if video_id and str(details.get('videoId', '')).lower() != video_id.lower():
+                        continue
+                    try:
+                        stats.views = int(details['viewCount'])
+                    except (TypeError, ValueError):
+                        pass
+                    stats.title = details.get('title') or stats.title
+                    stats.author = details.get('author') or stats.author
+                microformat = node.get('playerMicroformatRenderer')
+                if isinstance(microformat, dict) and stats.upload_date is None:
+                    published = microformat.get('publishDate') or microformat.get('uploadDate')
+                    if published:
+                        stats.upload_date = self._normalize_date(published)
+            
+            if stats.likes is None:
+                stats.likes = self._parse_like_count(payload)
+            if stats.comments is None:
+                stats.comments = self._parse_comment_count(payload)
+        
+        return stats
+    
+    def raise_for_payloads(self, payloads):
+        """Deleted, private and sign-in-gated videos from the player response's playabilityStatus"""
+        for payload in payloads:
+            status = find_first(payload, 'playabilityStatus')
+            if not isinstance(status, dict):
+                continue
+            reason = text_of(status.get('reason')) or status.get('status', '')
+            if status.get('status') == 'ERROR':
+                raise UnavailableError(f"Video unavailable: {reason}")
+            if status.get('status') == 'LOGIN_REQUIRED':
+                # Age gates carry desktopLegacyAgeGateReason; other sign-in walls mean a private video
+                if 'desktopLegacyAgeGateReason' in status:
+                    raise LoginWallError(f"Login required: {reason}")
+                raise PrivateContentError(f"Private video: {reason}")
+            return
+    
+    def payload_stats(self, payloads, url, current_url=None):
+        """Stats of the video at url from ytInitialPlayerResponse / ytInitialData / youtubei payloads"""
+        try:
+            video_id = URLDetector.extract_video_id(url, 'youtube')
+        except ValueError:
+            video_id = None
+        return self._stats_from_payloads(payloads, video_id)
+    
+    def _innertube_post(self, endpoint, continuation):
+        """POST a continuation token to an InnerTube endpoint and return the decoded JSON"""
+        try:
+            self.driver.set_script_timeout(YouTubeTiming.INNERTUBE_TIMEOUT)
+            raw = self.driver.execute_async_script(INNERTUBE_FETCH_SCRIPT, endpoint, continuation)
+        except Exception:
+            return None
+        return loads_or_none(raw)
+    
+    def _count_from_text(self, text):
+        """Extract the leading count from texts like '1,234 Comments' or '1.2K'"""
+        if not text:
+            return None
+        match = re.search(r'\d[\d.,]*\s*[KMB]?(?![a-z])', text, re.IGNORECASE)
+        if not match:
+            return None
+        return self.extract_number(match.group(0))
+    
+    def _parse_comment_count(self, data):
+        """Find the comment count in ytInitialData or a youtubei/v1/next payload"""
+        header_count = None
+        entry_point_count = None
+        panel_count = None
+        
+        for node in walk_dicts(data):
+            if 'commentsHeaderRenderer' in node:
+                header = node['commentsHeaderRenderer']
+                # countText is exact ("1,234 Comments"), commentsCount is rounded
+                header_count = self._count_from_text(text_of(header.get('countText')))
+                if header_count is None:
+                    header_count = self._count_from_text(text_of(header.get('commentsCount')))
+                if header_count is not None:
+                    break
+            elif 'commentsEntryPointHeaderRenderer' in node and entry_point_count is None:
+                entry_point = node['commentsEntryPointHeaderRenderer']
+                entry_point_count = self._count_from_text(text_of(entry_point.get('commentCount')))
+            elif 'engagementPanelSectionListRenderer' in node and panel_count is None:
+                panel = node['engagementPanelSectionListRenderer']
+                panel_id = panel.get('panelIdentifier') or panel.get('targetId') or ''
+                if 'comment' in panel_id:
+                    title_header = panel.get('header', {}).get('engagementPanelTitleHeaderRenderer', {})
+                    panel_count = self._count_from_text(text_of(title_header.get('contextualInfo')))
+        
+        for count in (header_count, entry_point_count, panel_count):
+            if count is not None:
+                return count
+        return None
+    
+    def _find_comments_continuation(self, data):
+        """Find the continuation token that loads the comments section"""
+        for node in walk_dicts(data):
+            section = node.get('itemSectionRenderer')
+            if not isinstance(section, dict) or section.get('sectionIdentifier') != 'comment-item-section':
+                continue
+            for item in walk_dicts(section.get('contents', [])):
+                command = item.get('continuationCommand')
+                if isinstance(command, dict) and command.get('token'):
+                    return command['token']
+        return None
+    
+    def _extract_comment_count_from_data(self, payloads):
+        """Get the comment count without scrolling from the continuation named in the scrape's page payloads
+
+        payload_stats already read any count the payloads themselves carry, so only the token is looked up.
+        """
+        for data in payloads or []:
+            token = self._find_comments_continuation(data)
+            if token:
+                payload = self._innertube_post('next', token)
+                return self._parse_comment_count(payload) if payload else None
+        return None
+    
+    def _listing_page_url(self, url, listing):
+        """Resolve the page to open for a channel or playlist listing"""
+        if listing['listing_type'] == 'playlist':
+            return f"https://www.youtube.com/playlist?list={listing['listing_id']}"
+        
+        # Keep an explicitly requested channel tab, otherwise open the videos tab
+        if re.search(r'/(videos|shorts|streams)/?(?:\?|$)', url):
+            return url
+        return f"https://www.youtube.com/{listing['listing_id']}/videos"
+    
+    def _listing_author(self, data):
+        """Channel or playlist owner name from listing data"""
+        for node in walk_dicts(data):
+            if 'channelMetadataRenderer' in node:
+                return node['channelMetadataRenderer'].get('title')
+            if 'playlistHeaderRenderer' in node:
+                return text_of(node['playlistHeaderRenderer'].get('ownerText'))
+        return None
+    
+    def _parse_listing_item(self, key, renderer):
+        """Convert a single listing renderer into a video item dict"""
+        if key in LISTING_VIDEO_RENDERERS:
+            video_id = renderer.get('videoId')
+            title = text_of(renderer.get('title')) or text_of(renderer.get('headline'))
+            # viewCountText is exact on channel tabs; playlists only expose videoInfo
+            view_text = (text_of(renderer.get('viewCountText'))
+                         or text_of(renderer.get('shortViewCountText')))
+            if not view_text and renderer.get('videoInfo'):
+                view_text = text_of(renderer['videoInfo'])
+            author = text_of(renderer.get('shortBylineText')) or text_of(renderer.get('ownerText'))
+            published = text_of(renderer.get('publishedTimeText'))
+        elif key == 'lockupViewModel':
+            if renderer.get('contentType') not in (None, 'LOCKUP_CONTENT_TYPE_VIDEO'):
+                return None
+            video_id = renderer.get('contentId')
+            metadata = renderer.get('metadata', {}).get('lockupMetadataViewModel', {})
+            title = text_of(metadata.get('title'))
+            parts = [text_of(part.get('text')) or ''
+                     for row in walk_dicts(metadata) if 'metadataParts' in row
+                     for part in row['metadataParts']]
+            view_words, ago_words = self.metric_words('views'), self.metric_words('ago')
+            view_text = next((part for part in parts if any(w in part.lower() for w in view_words)), None)
+            author = None
+            published = next((part for part in parts if any(w in part.lower() for w in ago_words)), None)
+        elif key == 'shortsLockupViewModel':
+            endpoint = renderer.get('onTap', {}).get('innertubeCommand', {}).get('reelWatchEndpoint', {})
+            video_id = endpoint.get('videoId')
+            overlay = renderer.get('overlayMetadata', {})
+            title = text_of(overlay.get('primaryText'))
+            view_text = text_of(overlay.get('secondaryText'))
+            author = None
+            published = None
+        else:
+            return None
+        
+        if not video_id:
+            return None
+        
+        return {
+            'video_id': video_id,
+            'title': title,
+            'views': self._count_from_text(view_text),
+            'author': author,
+            'published': published
+        }
+    
+    def _parse_listing_items(self, data):
+        """Extract video items from a browse page or browse continuation payload"""
+        items = []
+        keys = LISTING_VIDEO_RENDERERS + ('lockupViewModel', 'shortsLockupViewModel')
+        for node in walk_dicts(data):
+            for key in keys:
+                if isinstance(node.get(key), dict):
+                    item = self._parse_listing_item(key, node[key])
+                    if item:
+                        items.append(item)
+        return items
+    
+    def _find_listing_continuation(self, data):
+        """Find the token for the next page of a listing"""
+        token = None
+        for node in walk_dicts(data):
+            if 'continuationItemRenderer' not in node:
+                continue
+            for item in walk_dicts(node['continuationItemRenderer']):
+                command = item.get('continuationCommand')
+                if isinstance(command, dict) and command.get('token'):
+                    token = command['token']
+        return token
+    
+    def scrape_listing(self, url, limit=None, fields=None):
+        """Expand a channel or playlist into per-video stats straight from the listing payload"""
+        listing = URLDetector.detect_listing(url)
+        if not listing or listing['platform'] != 'youtube':
+            raise ValueError(f"Not a YouTube channel or playlist URL: {url}")
+        
+        self.navigate(self._listing_page_url(url, listing))
+        self.check_page_state()
+        data = self._get_initial_data()
+        channel_name = self._listing_author(data) if data else None
+        
+        results = []
+        seen_ids = set()
+        seen_tokens = set()
+        
+        while data:
+            for item in self._parse_listing_items(data):
+                if item['video_id'] in seen_ids:
+                    continue
+                seen_ids.add(item['video_id'])
+                
+                results.append(SocialMediaStats(
+                    platform='youtube',
+                    url=f"https://www.youtube.com/watch?v={item['video_id']}",
+                    views=item['views'],
+                    title=item['title'],
+                    author=item['author'] or channel_name,
+                    upload_date=self._normalize_date(item['published']) if item['published'] else None
+                ))
+                if limit and len(results) >= limit:
+                    break
+            
+            if limit and len(results) >= limit:
+                break
+            
+            # Page through the listing with browse continuations, no scrolling
+            token = self._find_listing_continuation(data)
+            if not token or token in seen_tokens:
+                break
+            seen_tokens.add(token)
+            data = self._innertube_post('browse', token)
+        
+        return self.fill_missing_fields(results, fields)
+    
     def _wait_for_shorts_load(self):
         """Optimized waiting for YouTube Shorts to load"""
         time.sleep(YouTubeTiming.SHORTS_LOAD_WAIT)
         try:
-            self.wait_for_element(By.CSS_SELECTOR, YouTubeSelectors.SHORTS_CONTAINER, timeout=YouTubeTiming.SHORTS_ELEMENT_TIMEOUT)
+            self.wait_for_stage('shorts', By.CSS_SELECTOR, YouTubeSelectors.SHORTS_CONTAINER)
         except:
             time.sleep(YouTubeTiming.SHORTS_FALLBACK_WAIT)
     
@@ -114,7 +455,8 @@ class YouTubeScraper(BaseScraper):
         stats = SocialMediaStats(platform='youtube', url=url)
         
         try:
-            self.driver.get(url)
+            self.navigate(url)
+            self.check_page_state()
             time.sleep(YouTubeTiming.PAGE_LOAD_WAIT)
             
             # Check if this is a YouTube Shorts URL
@@ -124,155 +466,138 @@ class YouTubeScraper(BaseScraper):
                 self._wait_for_shorts_load()
             else:
                 # Wait for regular video player to load
-                self.wait_for_element(By.ID, 'movie_player', timeout=YouTubeTiming.ELEMENT_TIMEOUT)
+                self.wait_for_content('#movie_player', timeout=YouTubeTiming.ELEMENT_TIMEOUT)
+            
+            # Exact counts from the page's JSON; DOM is only read for what is still missing
+            payloads = self.page_payloads()
+            self.raise_for_payloads(payloads)
+            self.apply_payload_stats(stats, self.payload_stats(payloads, url, self.driver.current_url))
             
             # Extract title
-            try:
-                if is_shorts:
-                    stats.title = self._extract_with_selectors(YouTubeSelectors.SHORTS_TITLE, is_meta=True)
-                else:
-                    # Regular YouTube video title
-                    title_element = self.wait_for_element(
-                        By.CSS_SELECTOR, 
-                        YouTubeSelectors.REGULAR_TITLE,
-                        timeout=5
-                    )
-                    stats.title = title_element.text.strip()
-            except:
-                pass
+            if stats.title is None:
+                try:
+                    if is_shorts:
+                        stats.title = self._extract_with_selectors(YouTubeSelectors.SHORTS_TITLE, is_meta=True)
+                    else:
+                        # Regular YouTube video title
+                        title_element = self.wait_for_stage('title', By.CSS_SELECTOR, YouTubeSelectors.REGULAR_TITLE)
+                        stats.title = title_element.text.strip()
+                except:
+                    pass
             
             # Extract author/channel name
-            try:
-                if is_shorts:
-                    stats.author = self._extract_with_selectors(YouTubeSelectors.SHORTS_AUTHOR, is_meta=True)
-                else:
-                    # Regular YouTube video author
-                    stats.author = self._extract_with_selectors([YouTubeSelectors.REGULAR_AUTHOR])
-            except:
-                pass
+            if stats.author is None:
+                try:
+                    if is_shorts:
+                        stats.author = self._extract_with_selectors(YouTubeSelectors.SHORTS_AUTHOR, is_meta=True)
+                    else:
+                        # Regular YouTube video author
+                        stats.author = self._extract_with_selectors([YouTubeSelectors.REGULAR_AUTHOR])
+                except:
+                    pass
             
             # Extract view count
-            try:
-                if is_shorts:
-                    view_text = self._extract_with_selectors(YouTubeSelectors.SHORTS_VIEWS)
-                    if view_text and 'view' in view_text.lower():
-                        stats.views = self.extract_number(view_text)
-                else:
-                    # Regular YouTube video views - try multiple approaches
-                    view_text = None
-                    
-                    # First try: Look for main video views in metadata area
-                    try:
-                        # Look for views in metadata area first (most accurate)
-                        metadata_views = self.driver.find_elements(By.XPATH, '//div[contains(@class, "metadata")]//span[contains(text(), "views") or contains(text(), "ditonton")]')
-                        if metadata_views:
-                            view_text = metadata_views[0].text.strip()
-                        else:
-                            # Fallback: Look for any views with yt-core-attributed-string class
-                            core_views = self.driver.find_elements(By.XPATH, '//span[contains(@class, "yt-core-attributed-string") and (contains(text(), "views") or contains(text(), "ditonton"))]')
-                            if core_views:
-                                # Get the first one that looks like main video views (usually has higher count)
-                                for element in core_views:
-                                    text = element.text.strip()
-                                    if text:
-                                        # Extract number to check if it's reasonable for main video
-                                        number = self.extract_number(text)
-                                        if number and number > 1000:  # Main videos usually have >1K views
-                                            view_text = text
-                                            break
-                                # If no high-count views found, use the first one
-                                if not view_text and core_views:
-                                    view_text = core_views[0].text.strip()
-                    except:
-                        pass
-                    
-                    # Second try: Use CSS selectors
-                    if not view_text:
-                        view_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_VIEWS)
-                    
-                    # Third try: Look for yt-core-attributed-string elements
-                    if not view_text:
+            if stats.views is None:
+                try:
+                    if is_shorts:
+                        view_text = self._extract_with_selectors(YouTubeSelectors.SHORTS_VIEWS)
+                        if view_text and any(word in view_text.lower() for word in self.metric_words('views')):
+                            stats.views = self.extract_number(view_text)
+                    else:
+                        # Regular YouTube video views - try multiple approaches
+                        view_text = None
+                        
+                        # First try: Look for main video views in metadata area
                         try:
-                            core_elements = self.driver.find_elements(By.CSS_SELECTOR, '.yt-core-attributed-string')
-                            for element in core_elements:
-                                text = element.text.strip()
-                                if text and ('view' in text.lower() or 'ditonton' in text.lower()):
-                                    # Check if this is in the main video metadata area
-                                    try:
-                                        parent = element.find_element(By.XPATH, '../..')
-                                        parent_classes = parent.get_attribute('class') or ''
-                                        if 'metadata' in parent_classes.lower() or 'primary' in parent_classes.lower():
-                                            view_text = text
-                                            break
-                                    except:
-                                        # If we can't check parent, use the first views text we find
-                                        if not view_text:
-                                            view_text = text
+                            # Look for views in metadata area first (most accurate)
+                            view_condition = self._xpath_contains_any('text()', 'views')
+                            metadata_views = self.driver.find_elements(By.XPATH, f'//div[contains(@class, "metadata")]//span[{view_condition}]')
+                            if metadata_views:
+                                view_text = metadata_views[0].text.strip()
+                            else:
+                                # Fallback: Look for any views with yt-core-attributed-string class
+                                core_views = self.driver.find_elements(By.XPATH, f'//span[contains(@class, "yt-core-attributed-string") and ({view_condition})]')
+                                if core_views:
+                                    # Get the first one that looks like main video views (usually has higher count)
+                                    for element in core_views:
+                                        text = element.text.strip()
+                                        if text:
+                                            # Extract number to check if it's reasonable for main video
+                                            number = self.extract_number(text)
+                                            if number and number > 1000:  # Main videos usually have >1K views
+                                                view_text = text
+                                                break
+                                    # If no high-count views found, use the first one
+                                    if not view_text and core_views:
+                                        view_text = core_views[0].text.strip()
                         except:
                             pass
-                    
-                    if view_text:
-                        stats.views = self.extract_number(view_text)
-            except:
-                pass
+                        
+                        # Second try: Use CSS selectors
+                        if not view_text:
+                            view_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_VIEWS)
+                        
+                        # Third try: Look for yt-core-attributed-string elements
+                        if not view_text:
+                            try:
+                                core_elements = self.driver.find_elements(By.CSS_SELECTOR, '.yt-core-attributed-string')
+                                for element in core_elements:
+                                    text = element.text.strip()
+                                    if text and any(word in text.lower() for word in self.metric_words('views')):
+                                        # Check if this is in the main video metadata area
+                                        try:
+                                            parent = element.find_element(By.XPATH, '../..')
+                                            parent_classes = parent.get_attribute('class') or ''
+                                            if 'metadata' in parent_classes.lower() or 'primary' in parent_classes.lower():
+                                                view_text = text
+                                                break
+                                        except:
+                                            # If we can't check parent, use the first views text we find
+                                            if not view_text:
+                                                view_text = text
+                            except:
+                                pass
+                        
+                        if view_text:
+                            stats.views = self.extract_number(view_text)
+                except:
+                    pass
             
             # Extract likes and comments
             try:
                 if is_shorts:
                     # For YouTube Shorts, use helper method
-                    likes, comments = self._extract_shorts_numbers()
-                    stats.likes = likes
-                    stats.comments = comments
+                    if stats.likes is None or stats.comments is None:
+                        likes, comments = self._extract_shorts_numbers()
+                        stats.likes = stats.likes if stats.likes is not None else likes
+                        stats.comments = stats.comments if stats.comments is not None else comments
                 else:
-                    # Regular YouTube video likes - try multiple approaches
-                    like_text = None
-                    
-                    # First try: Look for like buttons and extract from aria-label or button text
-                    try:
-                        like_buttons = self.driver.find_elements(By.XPATH, '//button[contains(@aria-label, "like") or contains(@aria-label, "suka")]')
-                        for button in like_buttons:
-                            try:
-                                # First check button text directly
-                                button_text = button.text.strip()
-                                if button_text and any(c.isdigit() for c in button_text):
-                                    like_text = button_text
-                                    break
-                                
-                                # Then check aria-label for like count
-                                aria_label = button.get_attribute('aria-label') or ''
-                                if 'like' in aria_label.lower() and any(c.isdigit() for c in aria_label):
-                                    # Extract number from aria-label like "like this video along with 608 other people"
-                                    import re
-                                    numbers = re.findall(r'\d+', aria_label)
-                                    if numbers:
-                                        like_text = numbers[0]  # Take the first number found
-                                        break
-                                
-                                # Finally check span elements within the button
-                                spans = button.find_elements(By.TAG_NAME, 'span')
-                                for span in spans:
-                                    text = span.text.strip()
-                                    if text and any(c.isdigit() for c in text):
-                                        like_text = text
-                                        break
-                                if like_text:
-                                    break
-                            except:
-                                continue
-                    except:
-                        pass
-                    
-                    # Second try: Use CSS selectors
-                    if not like_text:
-                        like_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_LIKES)
-                    
-                    # Third try: Look for segmented like button
-                    if not like_text:
+                    if stats.likes is None:
+                        # Regular YouTube video likes - try multiple approaches
+                        like_text = None
+                        
+                        # First try: Look for like buttons and extract from aria-label or button text
                         try:
-                            segmented_buttons = self.driver.find_elements(By.CSS_SELECTOR, 'ytd-segmented-like-dislike-button-renderer button')
-                            for button in segmented_buttons:
-                                aria_label = button.get_attribute('aria-label') or ''
-                                if 'like' in aria_label.lower() or 'suka' in aria_label.lower():
+                            like_buttons = self.driver.find_elements(By.XPATH, f"//button[{self._xpath_contains_any('@aria-label', 'likes')}]")
+                            for button in like_buttons:
+                                try:
+                                    # First check button text directly
+                                    button_text = button.text.strip()
+                                    if button_text and any(c.isdigit() for c in button_text):
+                                        like_text = button_text
+                                        break
+                                    
+                                    # Then check aria-label for like count
+                                    aria_label = button.get_attribute('aria-label') or ''
+                                    if 'like' in aria_label.lower() and any(c.isdigit() for c in aria_label):
+                                        # Extract number from aria-label like "like this video along with 608 other people"
+                                        import re
+                                        numbers = re.findall(r'\d+', aria_label)
+                                        if numbers:
+                                            like_text = numbers[0]  # Take the first number found
+                                            break
+                                    
+                                    # Finally check span elements within the button
                                     spans = button.find_elements(By.TAG_NAME, 'span')
                                     for span in spans:
                                         text = span.text.strip()
@@ -281,20 +606,48 @@ class YouTubeScraper(BaseScraper):
                                             break
                                     if like_text:
                                         break
+                                except:
+                                    continue
                         except:
                             pass
+                        
+                        # Second try: Use CSS selectors
+                        if not like_text:
+                            like_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_LIKES)
+                        
+                        # Third try: Look for segmented like button
+                        if not like_text:
+                            try:
+                                segmented_buttons = self.driver.find_elements(By.CSS_SELECTOR, 'ytd-segmented-like-dislike-button-renderer button')
+                                for button in segmented_buttons:
+                                    aria_label = button.get_attribute('aria-label') or ''
+                                    if any(word in aria_label.lower() for word in self.metric_words('likes')):
+                                        spans = button.find_elements(By.TAG_NAME, 'span')
+                                        for span in spans:
+                                            text = span.text.strip()
+                                            if text and any(c.isdigit() for c in text):
+                                                like_text = text
+                                                break
+                                        if like_text:
+                                            break
+                            except:
+                                pass
+                        
+                        if like_text:
+                            stats.likes = self.extract_number(like_text)
                     
-                    if like_text:
-                        stats.likes = self.extract_number(like_text)
-                    
-                    # Scroll down to load comments section for regular videos
-                    self.driver.execute_script("window.scrollTo(0, 1000);")
-                    time.sleep(YouTubeTiming.COMMENTS_SCROLL_WAIT)
+                    # Not in the page data: load the comments continuation payload
+                    if stats.comments is None:
+                        stats.comments = self._extract_comment_count_from_data(payloads)
                     
-                    # Regular YouTube video comments
-                    comment_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_COMMENTS)
-                    if comment_text:
-                        stats.comments = self.extract_number(comment_text)
+                    if stats.comments is None:
+                        # Fallback: scroll down so the comments header lazy-loads
+                        self.driver.execute_script("window.scrollTo(0, 1000);")
+                        time.sleep(YouTubeTiming.COMMENTS_SCROLL_WAIT)
+                        
+                        comment_text = self._extract_with_selectors(YouTubeSelectors.REGULAR_COMMENTS)
+                        if comment_text:
+                            stats.comments = self.extract_number(comment_text)
             except:
                 pass
             
@@ -302,24 +655,30 @@ class YouTubeScraper(BaseScraper):
             stats.shares = None
             
             # Extract upload date with enhanced extraction
-            try:
-                if is_shorts:
-                    stats.upload_date = self._extract_with_selectors(YouTubeSelectors.SHORTS_UPLOAD_DATE)
-                else:
-                    # Regular YouTube video upload date
-                    stats.upload_date = self._extract_with_selectors(YouTubeSelectors.REGULAR_UPLOAD_DATE)
-                
-                # If standard extraction failed, try enhanced extraction
-                if not stats.upload_date:
-                    stats.upload_date = self._enhanced_date_extraction()
-            except:
-                pass
+            if not stats.upload_date:
+                try:
+                    if is_shorts:
+                        stats.upload_date = self._extract_with_selectors(YouTubeSelectors.SHORTS_UPLOAD_DATE)
+                    else:
+                        # Regular YouTube video upload date
+                        stats.upload_date = self._extract_with_selectors(YouTubeSelectors.REGULAR_UPLOAD_DATE)
+                    
+                    # If standard extraction failed, try enhanced extraction
+                    if not stats.upload_date:
+                        stats.upload_date = self._enhanced_date_extraction()
+                except:
+                    pass
                 
+        except ScrapeError as e:
+            stats.error = str(e)
+            stats.error_type = e.kind
         except TimeoutException:
             stats.error = "Timeout: Page took too long to load"
+            stats.error_type = ScrapeTimeoutError.kind
         except Exception as e:
             import traceback
             stats.error = f"Error scraping YouTube: {str(e)}\nTraceback: {traceback.format_exc()}"
+            stats.error_type = classify_exception(e)
         
         return stats
     
@@ -1,8 +1,10 @@
 from .ollama_service import OllamaService
+from .async_ollama_service import AsyncOllamaService
 from .crew_service import CrewService, SocialMediaScrapingTool, SocialMediaAnalysisTool
 
 __all__ = [
     'OllamaService',
+    'AsyncOllamaService',
     'CrewService',
     'SocialMediaScrapingTool',
     'SocialMediaAnalysisTool'
@@ -0,0 +1,47 @@
+import concurrent.futures
+from typing import Any, Dict, Hashable, List, Optional
+
+from config import Config
+from .ollama_service import circuit_open_message
+
+# Shared by every batch so the whole process never sends Ollama more than it runs in parallel
+ANALYSIS_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=Config.OLLAMA_NUM_PARALLEL, thread_name_prefix='llm-analysis'
+)
+
+class AnalysisStage:
+    """LLM analysis as a batch stage: stats are analysed as soon as they are scraped, OLLAMA_NUM_PARALLEL at a time"""
+
+    def __init__(self, ollama_service, executor: Optional[concurrent.futures.Executor] = None):
+        self.ollama_service = ollama_service
+        self.executor = executor or ANALYSIS_EXECUTOR
+        self._futures: Dict[Hashable, concurrent.futures.Future] = {}
+
+    def submit(self, key: Hashable, stats_data: Dict[str, Any]) -> concurrent.futures.Future:
+        """Start analysing stats_data unless key was already submitted"""
+        if key not in self._futures:
+            breaker = getattr(self.ollama_service, 'breaker', None)
+            if breaker and breaker.is_open():
+                # Ollama is down: settle at once instead of queueing behind the executor's workers
+                skipped = concurrent.futures.Future()
+                skipped.set_result(circuit_open_message(breaker))
+                self._futures[key] = skipped
+            else:
+                self._futures[key] = self.executor.submit(self.ollama_service.analyze_social_media_data, stats_data)
+        return self._futures[key]
+
+    def result(self, key: Hashable) -> Optional[str]:
+        """Analysis for key (waiting for it), None when nothing was submitted"""
+        future = self._futures.get(key)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            return f"Error generating response: {str(e)}"
+
+    def map(self, stats_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Analyse a list concurrently, returning the analyses in input order"""
+        for index, stats_data in enumerate(stats_list):
+            self.submit(index, stats_data)
+        return [self.result(index) for index in range(len(stats_list))]
@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from config import Config
+from .circuit_breaker import CircuitBreaker, breaker_for
+from .ollama_service import (
+    ENDPOINT_TIMEOUTS, OllamaService, circuit_open_message, generate_payload, generate_result, model_report,
+    pick_vision_model
+)
+from .response_cache import ResponseCache, get_response_cache, response_key
+
+def endpoint_timeout(endpoint: str) -> httpx.Timeout:
+    """httpx timeout for an Ollama endpoint; connecting never waits longer than a model listing"""
+    return httpx.Timeout(ENDPOINT_TIMEOUTS[endpoint], connect=ENDPOINT_TIMEOUTS['tags'])
+
+class AsyncOllamaService:
+    """asyncio counterpart of OllamaService: one pooled httpx.AsyncClient keeps many requests in flight without a thread each"""
+
+    def __init__(self, base_url: str = None, model: str = None, response_cache: Optional[ResponseCache] = None,
+                 client: Optional[httpx.AsyncClient] = None, breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url or Config.OLLAMA_BASE_URL
+        self.model = model or Config.OLLAMA_MODEL
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.breaker = breaker if breaker is not None else breaker_for(self.base_url)
+        self.keep_alive = Config.OLLAMA_KEEP_ALIVE
+        self.client = client or httpx.AsyncClient(
+            timeout=endpoint_timeout('generate'),
+            limits=httpx.Limits(max_connections=Config.OLLAMA_MAX_CONNECTIONS,
+                                max_keepalive_connections=Config.OLLAMA_MAX_CONNECTIONS)
+        )
+
+    async def __aenter__(self) -> 'AsyncOllamaService':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def is_available(self) -> bool:
+        """Check if Ollama service is available"""
+        try:
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=endpoint_timeout('tags'))
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def list_models(self) -> list:
+        """List available models"""
+        try:
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=endpoint_timeout('tags'))
+            if response.status_code == 200:
+                return response.json().get('models', [])
+            return []
+        except Exception:
+            return []
+
+    async def running_models(self) -> List[str]:
+        """Models currently resident in Ollama's memory (/api/ps)"""
+        try:
+            response = await self.client.get(f"{self.base_url}/api/ps", timeout=endpoint_timeout('ps'))
+            if response.status_code == 200:
+                return [m.get('name', '') for m in response.json().get('models', [])]
+            return []
+        except Exception:
+            return []
+
+    async def vision_model(self, available_models: List[str] = None) -> Optional[str]:
+        """Configured vision model, else the first installed one from VISION_MODELS"""
+        if available_models is None and not Config.OLLAMA_VISION_MODEL:
+            available_models = [m.get('name', '') for m in await self.list_models()]
+        return pick_vision_model(available_models or [])
+
+    async def generate(self, prompt: str, context: List[int] = None, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Full /api/generate result (response, context tokens, eval counts); failures set 'error'"""
+        key = response_key(self.model, prompt, options, context)
+        if self.response_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return {'response': cached, 'cached': True}
+        if self.breaker and not self.breaker.allow():
+            return {'response': circuit_open_message(self.breaker), 'error': True, 'skipped': True}
+
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/api/generate",
+                json=generate_payload(self.model, prompt, self.keep_alive, context, options),
+                timeout=endpoint_timeout('generate')
+            )
+        except Exception as e:
+            if self.breaker:
+                self.breaker.record()
+            return {'response': f"Error generating response: {str(e)}", 'error': True}
+        if self.breaker:
+            self.breaker.record(response.status_code)
+        try:
+            return generate_result(self.model, response, self.response_cache, key)
+        except Exception as e:
+            return {'response': f"Error generating response: {str(e)}", 'error': True}
+
+    async def generate_response(self, prompt: str, context: List[int] = None, options: Dict[str, Any] = None) -> str:
+        """Generate response using Llama2 model (identical model/prompt/options are served from the response cache)"""
+        return (await self.generate(prompt, context, options)).get('response', '')
+
+    async def analyze_social_media_data(self, stats_data: Dict[str, Any]) -> str:
+        """Analyze social media statistics using Llama2"""
+        return await self.generate_response(OllamaService.analysis_prompt(stats_data))
+
+    async def analyze_many(self, stats_list: List[Dict[str, Any]], limit: int = None) -> List[str]:
+        """Analyse a list concurrently, at most limit (default OLLAMA_NUM_PARALLEL) at a time, in input order"""
+        slots = asyncio.Semaphore(limit or Config.OLLAMA_NUM_PARALLEL)
+
+        async def bounded(stats_data):
+            async with slots:
+                return await self.analyze_social_media_data(stats_data)
+
+        return await asyncio.gather(*(bounded(stats_data) for stats_data in stats_list))
+
+    async def analyze_image_with_text(self, image_base64: str, prompt: str) -> str:
+        """Analyze image with text using vision-capable model"""
+        if self.breaker and self.breaker.is_open():
+            return circuit_open_message(self.breaker)
+        try:
+            vision_model = await self.vision_model()
+            if not vision_model:
+                return "Error: No vision-capable model available. Please install llava or similar model."
+            if self.breaker and not self.breaker.allow():
+                return circuit_open_message(self.breaker)
+
+            try:
+                response = await self.client.post(
+                    f"{self.base_url}/api/generate",
+                    json=generate_payload(vision_model, prompt, self.keep_alive, images=[image_base64]),
+                    timeout=endpoint_timeout('vision')
+                )
+            except Exception:
+                if self.breaker:
+                    self.breaker.record()
+                raise
+            if self.breaker:
+                self.breaker.record(response.status_code)
+            return generate_result(vision_model, response).get('response', '')
+        except Exception as e:
+            return f"Error analyzing image: {str(e)}"
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Perform health check on Ollama service"""
+        result = {
+            'service_available': False,
+            'model_loaded': False,
+            'models_available': [],
+            'models': {},
+            'circuit': self.breaker.stats() if self.breaker else None,
+            'response_cache': self.response_cache.stats() if self.response_cache else None,
+            'error': None
+        }
+
+        try:
+            models = await self.list_models() if await self.is_available() else None
+            if models is None:
+                result['error'] = "Ollama service is not available"
+                return result
+
+            result['service_available'] = True
+            result['models_available'] = [m.get('name', '') for m in models]
+            result['model_loaded'] = self.model in result['models_available']
+            result['models'] = model_report(
+                [self.model, await self.vision_model(result['models_available'])], await self.running_models()
+            )
+            if not result['model_loaded']:
+                result['error'] = f"Model '{self.model}' not found. Available models: {result['models_available']}"
+        except Exception as e:
+            result['error'] = str(e)
+
+        return result
@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import Config
+
+class CircuitBreaker:
+    """Fail fast while Ollama is down: opens after consecutive failures, then lets one probe through at a time
+
+    closed    -> calls pass; failure_threshold failures in a row open the circuit
+    open      -> calls are rejected at once until reset_timeout has passed
+    half_open -> a single probe call is allowed; success closes the circuit, failure reopens it
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold or Config.OLLAMA_BREAKER_FAILURES
+        self.reset_timeout = Config.OLLAMA_BREAKER_RESET if reset_timeout is None else reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._counts = {'opened': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    def _probe_due(self) -> bool:
+        return self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open and not yet due for a probe, or a probe is running)"""
+        with self._lock:
+            return self.state == self.HALF_OPEN or (self.state == self.OPEN and not self._probe_due())
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; the first call after reset_timeout becomes the half-open probe"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self._probe_due():
+                self.state = self.HALF_OPEN
+                return True
+            self._counts['rejected'] += 1
+            return False
+
+    def record(self, status_code: Optional[int] = None):
+        """Outcome of an allowed call: an HTTP status, or None when the request itself failed"""
+        # 5xx means Ollama is overloaded or crashed; 4xx (e.g. unknown model) is the caller's problem
+        if status_code is None or status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self._counts['opened'] += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed)"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        """State, consecutive failures, times opened and calls rejected"""
+        retry_after = round(self.retry_after(), 1)
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures, **self._counts, 'retry_after': retry_after}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(base_url: str) -> Optional[CircuitBreaker]:
+    """Process-wide breaker per Ollama server (shared by sync and async clients), None when disabled"""
+    if not Config.OLLAMA_BREAKER_ENABLED:
+        return None
+    with _breakers_lock:
+        if base_url not in _breakers:
+            _breakers[base_url] = CircuitBreaker()
+        return _breakers[base_url]
@@ -3,6 +3,7 @@ from crewai.tools import BaseTool
 from typing import Dict, Any, List
 import json
 from .ollama_service import OllamaService
+from .analysis_stage import AnalysisStage
 from scrapers import ScraperFactory, SocialMediaStats
 from utils import URLDetector
 from config import Config
@@ -22,10 +23,9 @@ class SocialMediaScrapingTool(BaseTool):
             
             platform = url_info['platform']
             
-            # Create scraper and scrape data
-            with ScraperFactory.create_scraper(platform, headless=True) as scraper:
-                stats = scraper.scrape(url)
-                return json.dumps(stats.to_dict(), indent=2)
+            # Scrape through the configured backend (sync wrapper of the async scraper)
+            stats = ScraperFactory.create_async_scraper(headless=True).scrape_sync(url)
+            return json.dumps(stats.to_dict(), indent=2)
                 
         except Exception as e:
             return f"Error scraping {url}: {str(e)}"
@@ -155,8 +155,12 @@ class CrewService:
             expected_output="Comprehensive list of actionable recommendations for social media optimization"
         )
     
-    def analyze_single_url(self, url: str) -> Dict[str, Any]:
-        """Analyze a single social media URL using direct scraping and Ollama analysis"""
+    def analyze_single_url(self, url: str, hedged: bool = None, max_age: float = None,
+                           include_analysis: bool = True) -> Dict[str, Any]:
+        """Analyze a single social media URL using direct scraping and Ollama analysis
+
+        include_analysis=False returns the stats only, for callers that stream the analysis themselves.
+        """
         try:
             # Direct data collection using scraper
             url_info = URLDetector.validate_url(url)
@@ -169,20 +173,28 @@ class CrewService:
                 'insights': None
             }
             
-            platform = url_info['platform']
-            with ScraperFactory.create_scraper(platform, headless=True) as scraper:
-                stats = scraper.scrape(url)
-                stats_data = stats.to_dict()
+            hedged = Config.HEDGED_SCRAPING if hedged is None else hedged
+            if hedged:
+                scraper = ScraperFactory.create_hedged_scraper(headless=True)
+            else:
+                scraper = ScraperFactory.create_async_scraper(headless=True)
+            stats = scraper.scrape_sync(url, max_age=max_age)
+            stats_data = stats.to_dict()
             
             # Use OllamaService directly for analysis instead of CrewAI
-            analysis_result = self.ollama_service.analyze_social_media_data(stats_data)
+            analysis_result = insights = None
+            if include_analysis:
+                analysis_result = insights = self.ollama_service.analyze_social_media_data(stats_data)
+                # Suggestions continue from the analysis context instead of re-encoding the stats
+                if analysis_result and not analysis_result.startswith('Error'):
+                    insights = self.ollama_service.generate_content_suggestions(stats_data)
             
             return {
                 'success': True,
                 'error': None,
                 'stats': stats_data,
                 'analysis': analysis_result,
-                'insights': analysis_result  # Using same analysis as insights for now
+                'insights': insights
             }
             
         except Exception as e:
@@ -194,11 +206,56 @@ class CrewService:
                 'insights': None
             }
     
-    def analyze_multiple_urls(self, urls: List[str]) -> Dict[str, Any]:
+    def _result_from_stats(self, stats: SocialMediaStats, analysis_result: str = None) -> Dict[str, Any]:
+        """Build a per-URL result from already scraped stats and their analysis"""
+        stats_data = stats.to_dict()
+        
+        # Partial scrapes (some counts plus an error) are results too, as in analyze_single_url
+        return {
+            'success': stats.has_metrics(),
+            'error': stats.error,
+            'stats': stats_data,
+            'analysis': analysis_result,
+            'insights': analysis_result
+        }
+    
+    def analyze_multiple_urls(self, urls: List[str], backend: str = None, max_age: float = None) -> Dict[str, Any]:
         """Analyze multiple social media URLs and provide comparative insights"""
         results = []
         
+        # Video URLs are scraped up front by the async backend, max_concurrency at a time; each
+        # successful scrape is handed to the analysis stage at once, so inference overlaps scraping
+        video_urls = [url for url in urls
+                      if not URLDetector.is_listing_url(url) and URLDetector.validate_url(url)['valid']]
+        analysis = AnalysisStage(self.ollama_service)
+        prefetched = {}
+        if video_urls:
+            def analyze_when_scraped(url: str, stats: SocialMediaStats):
+                if stats.has_metrics():
+                    analysis.submit(url, stats.to_dict())
+            
+            scraper = ScraperFactory.create_async_scraper(backend, headless=True)
+            prefetched = dict(zip(video_urls, scraper.scrape_many_sync(video_urls, max_age, analyze_when_scraped)))
+        
         for url in urls:
+            # Channel/playlist/profile URLs expand into one result per video
+            if URLDetector.is_listing_url(url):
+                listing_results = self.analyze_listing(url, include_analysis=True)
+                if listing_results.get('error'):
+                    results.append({
+                        'success': False,
+                        'error': listing_results['error'],
+                        'stats': None,
+                        'analysis': None,
+                        'insights': None
+                    })
+                results.extend(listing_results['individual_results'])
+                continue
+            
+            if url in prefetched:
+                results.append(self._result_from_stats(prefetched[url], analysis.result(url)))
+                continue
+            
             result = self.analyze_single_url(url)
             results.append(result)
         
@@ -212,21 +269,59 @@ class CrewService:
             return {
                 'individual_results': results,
                 'comparative_analysis': comparative_analysis,
-                'total_analyzed': len(urls),
+                'total_analyzed': len(results),
                 'successful_analyses': len(successful_results)
             }
         
         return {
             'individual_results': results,
-            'total_analyzed': len(urls),
+            'total_analyzed': len(results),
             'successful_analyses': len(successful_results)
         }
     
+    def analyze_listing(self, url: str, limit: int = None, fields: List[str] = None,
+                        include_analysis: bool = False) -> Dict[str, Any]:
+        """Expand a channel/playlist/profile URL in one browser session into per-video results"""
+        listing_info = URLDetector.validate_listing_url(url)
+        if not listing_info['valid']:
+            return {
+                'individual_results': [],
+                'total_analyzed': 0,
+                'successful_analyses': 0,
+                'error': f"Invalid listing URL: {listing_info['error']}"
+            }
+        
+        try:
+            with ScraperFactory.create_scraper(listing_info['platform'], headless=True) as scraper:
+                stats_list = scraper.scrape_listing(url, limit=limit, fields=fields)
+        except Exception as e:
+            return {
+                'individual_results': [],
+                'total_analyzed': 0,
+                'successful_analyses': 0,
+                'error': str(e)
+            }
+        
+        analyses = [None] * len(stats_list)
+        if include_analysis:
+            scraped = [index for index, stats in enumerate(stats_list) if stats.has_metrics()]
+            mapped = AnalysisStage(self.ollama_service).map([stats_list[index].to_dict() for index in scraped])
+            for index, analysis in zip(scraped, mapped):
+                analyses[index] = analysis
+        results = [self._result_from_stats(stats, analysis) for stats, analysis in zip(stats_list, analyses)]
+        
+        return {
+            'individual_results': results,
+            'total_analyzed': len(results),
+            'successful_analyses': len([r for r in results if r['success']])
+        }
+    
     def health_check(self) -> Dict[str, Any]:
         """Perform health check on all services"""
         return {
             'ollama_service': self.ollama_service.health_check(),
             'crew_agents_ready': True,
+            'scraper_timeouts': ScraperFactory.timeout_status(),
             'tools_available': {
                 'scraping_tool': self.scraping_tool.name,
                 'analysis_tool': self.analysis_tool.name
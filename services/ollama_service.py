@@ -1,20 +1,298 @@
 import requests
 import json
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional
 from config import Config
+from .circuit_breaker import CircuitBreaker, breaker_for
+from .response_cache import ResponseCache, get_response_cache, response_key
+
+# Vision-capable models tried in order when OLLAMA_VISION_MODEL is not set
+VISION_MODELS = ['llava', 'llava:latest', 'bakllava', 'moondream']
+
+# Seconds each model took to load into memory, shared by all service instances; a warm call
+# reports a load of a few milliseconds, so only loads above COLD_LOAD_SECONDS replace a recorded one
+MODEL_LOAD_TIMES: Dict[str, float] = {}
+COLD_LOAD_SECONDS = 1.0
+
+_warm_up_lock = threading.Lock()
+_warm_up_started = False
+
+def record_load(model: str, load_duration_ns: Optional[int]):
+    """Remember a model's load time from Ollama's load_duration (nanoseconds)"""
+    if not load_duration_ns:
+        return
+    seconds = round(load_duration_ns / 1e9, 2)
+    if seconds >= COLD_LOAD_SECONDS or model not in MODEL_LOAD_TIMES:
+        MODEL_LOAD_TIMES[model] = seconds
+
+# Seconds allowed per Ollama endpoint, shared by the sync and async clients
+ENDPOINT_TIMEOUTS = {
+    'tags': Config.OLLAMA_TAGS_TIMEOUT,
+    'ps': Config.OLLAMA_TAGS_TIMEOUT,
+    'generate': Config.OLLAMA_TIMEOUT,
+    'vision': Config.OLLAMA_VISION_TIMEOUT,
+}
+
+def generate_payload(model: str, prompt: str, keep_alive: Any, context: List[int] = None,
+                     options: Dict[str, Any] = None, images: List[str] = None) -> Dict[str, Any]:
+    """Body of a non-streaming /api/generate call"""
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "keep_alive": keep_alive
+    }
+    if context:
+        payload["context"] = context
+    if options:
+        payload["options"] = options
+    if images:
+        payload["images"] = images
+    return payload
+
+def generate_result(model: str, response: Any, response_cache: Optional[ResponseCache] = None,
+                    key: str = None) -> Dict[str, Any]:
+    """Result dict of an /api/generate reply (requests or httpx response); non-200 replies set 'error'"""
+    if response.status_code != 200:
+        return {'response': f"Error: {response.status_code} - {response.text}", 'error': True}
+    result = response.json()
+    record_load(model, result.get('load_duration'))
+    # Errors are returned as text too, so only real answers are cached
+    if response_cache and key and result.get('response'):
+        response_cache.put(key, result['response'])
+    return result
+
+def circuit_open_message(breaker: CircuitBreaker) -> str:
+    """Error text returned instead of calling Ollama while its circuit is open"""
+    return f"Error: Ollama unavailable, analysis skipped (retry in {breaker.retry_after():.0f}s)"
+
+def pick_vision_model(available_models: List[str]) -> Optional[str]:
+    """Configured vision model, else the first installed one from VISION_MODELS"""
+    if Config.OLLAMA_VISION_MODEL:
+        return Config.OLLAMA_VISION_MODEL
+    return next((model for model in VISION_MODELS if model in available_models), None)
+
+def model_report(names: List[str], running: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Residency (in memory now, per /api/ps) and last load time of each named model"""
+    return {
+        name: {
+            'resident': any(same_model(name, loaded) for loaded in running),
+            'load_seconds': MODEL_LOAD_TIMES.get(name)
+        }
+        for name in filter(None, dict.fromkeys(names))
+    }
+
+def same_model(a: str, b: str) -> bool:
+    """Compare model names, treating a missing tag as :latest"""
+    def tagged(name):
+        return name if ':' in name else f"{name}:latest"
+    return tagged(a) == tagged(b)
+
+class ResponseStream:
+    """Text chunks of one generation as Ollama streams them; text and metrics are complete once iterated"""
+    
+    def __init__(self, service: 'OllamaService', prompt: str, context: str = None, options: Dict[str, Any] = None,
+                 session: Optional['OllamaSession'] = None):
+        self.service = service
+        self.prompt = prompt
+        self.context = context
+        self.options = options
+        # The session a completed stream hands its context to, so follow-ups can continue from it
+        self.session = session
+        self.text = ''
+        self.metrics: Dict[str, Any] = {}
+    
+    def __iter__(self) -> Iterator[str]:
+        key = response_key(self.service.model, self.prompt, self.options, self.context)
+        cache = self.service.response_cache
+        cached = cache.get(key) if cache else None
+        start = time.perf_counter()
+        if cached is not None:
+            self.text = cached
+            self.metrics = {'time_to_first_token': 0.0, 'tokens': None, 'tokens_per_sec': None,
+                            'total_time': 0.0, 'cached': True}
+            yield cached
+            return
+        
+        breaker = self.service.breaker
+        if breaker and not breaker.allow():
+            self.text = circuit_open_message(breaker)
+            yield self.text
+            return
+        
+        payload = {"model": self.service.model, "prompt": self.prompt, "stream": True,
+                   "keep_alive": self.service.keep_alive}
+        if self.context:
+            payload["context"] = self.context
+        if self.options:
+            payload["options"] = self.options
+        
+        first_token = None
+        chunks = 0
+        final = None
+        response = None
+        try:
+            # The read timeout applies between chunks, so long generations no longer time out
+            response = self.service.session.post(
+                f"{self.service.base_url}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=(10, Config.OLLAMA_STREAM_TIMEOUT)
+            )
+            if breaker:
+                breaker.record(response.status_code)
+            try:
+                if response.status_code != 200:
+                    self.text = f"Error: {response.status_code} - {response.text}"
+                    yield self.text
+                    return
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    if message.get('error'):
+                        raise RuntimeError(message['error'])
+                    chunk = message.get('response', '')
+                    if chunk:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                        chunks += 1
+                        self.text += chunk
+                        yield chunk
+                    if message.get('done'):
+                        final = message
+                        record_load(self.service.model, message.get('load_duration'))
+                        break
+            finally:
+                response.close()
+        except Exception as e:
+            if breaker and response is None:
+                breaker.record()
+            error = f"Error generating response: {str(e)}"
+            self.text += error
+            yield error
+            return
+        
+        total = time.perf_counter() - start
+        tokens = (final or {}).get('eval_count', chunks)
+        eval_seconds = (final or {}).get('eval_duration', 0) / 1e9
+        if not eval_seconds and first_token is not None:
+            eval_seconds = total - first_token
+        self.metrics = {
+            'time_to_first_token': round(first_token, 3) if first_token is not None else None,
+            'tokens': tokens,
+            'tokens_per_sec': round(tokens / eval_seconds, 1) if eval_seconds else None,
+            'total_time': round(total, 3),
+            'cached': False
+        }
+        
+        # Only generations that ran to completion are cached
+        if cache and final is not None and self.text:
+            cache.put(key, self.text)
+        if self.session and final is not None:
+            self.session.record(final, root=True)
+
+class OllamaSession:
+    """Chained prompts about one video: follow-ups continue from the first answer's context tokens"""
+    
+    def __init__(self, service: 'OllamaService', stats_data: Dict[str, Any]):
+        self.service = service
+        self.stats_data = stats_data
+        self.context: Optional[List[int]] = None
+        # Prompt tokens and prompt-eval seconds of the call the context came from, i.e. what a
+        # follow-up would otherwise pay again to re-encode the stats
+        self.prefix_tokens = 0
+        self.prefix_seconds = 0.0
+        self.metrics = {'calls': 0, 'follow_ups': 0, 'prompt_tokens': 0, 'prompt_eval_seconds': 0.0,
+                        'reused_tokens': 0, 'prompt_eval_seconds_saved': 0.0}
+        self._lock = threading.Lock()
+    
+    def start(self, prompt: str, options: Dict[str, Any] = None) -> str:
+        """Send a prompt carrying the stats; its context becomes the base for follow-ups"""
+        result = self.service.generate(prompt, options=options)
+        self.record(result, root=True)
+        return result.get('response', '')
+    
+    def follow_up(self, prompt: str, standalone_prompt: str, options: Dict[str, Any] = None) -> str:
+        """Continue from the stored context, or send standalone_prompt (stats included) when there is none"""
+        with self._lock:
+            context = self.context
+        if context is None:
+            return self.start(standalone_prompt, options)
+        
+        result = self.service.generate(prompt, context=context, options=options)
+        self.record(result, reused=not result.get('error'))
+        return result.get('response', '')
+    
+    def analyze(self) -> str:
+        """Analysis of the video's stats, starting the session"""
+        return self.start(self.service.analysis_prompt(self.stats_data))
+    
+    def stream_analysis(self) -> 'ResponseStream':
+        """analyze(), streamed; the context is kept once the stream completes"""
+        return ResponseStream(self.service, self.service.analysis_prompt(self.stats_data), session=self)
+    
+    def content_suggestions(self) -> str:
+        """Content suggestions as a follow-up, without resending the stats when context exists"""
+        platform = self.stats_data.get('platform', 'platform')
+        return self.follow_up(CONTENT_SUGGESTIONS_FOLLOW_UP.format(platform=platform),
+                              self.service.content_suggestions_prompt(self.stats_data))
+    
+    def record(self, result: Dict[str, Any], root: bool = False, reused: bool = False):
+        """Account for a generate result (or final stream message); a root result's context is kept"""
+        if result.get('error') or result.get('cached'):
+            return
+        tokens = result.get('prompt_eval_count') or 0
+        seconds = (result.get('prompt_eval_duration') or 0) / 1e9
+        with self._lock:
+            self.metrics['calls'] += 1
+            self.metrics['prompt_tokens'] += tokens
+            self.metrics['prompt_eval_seconds'] += seconds
+            if reused:
+                self.metrics['follow_ups'] += 1
+                self.metrics['reused_tokens'] += self.prefix_tokens
+                self.metrics['prompt_eval_seconds_saved'] += self.prefix_seconds
+            if root and result.get('context'):
+                self.context = result['context']
+                self.prefix_tokens = tokens
+                self.prefix_seconds = seconds
+
+# Follow-up asked on top of the analysis context, which already holds the post's stats
+CONTENT_SUGGESTIONS_FOLLOW_UP = """
+For the same post, generate 5 content improvement suggestions:
+1. Title/Caption optimization
+2. Posting time recommendations
+3. Content format suggestions
+4. Engagement tactics
+5. Hashtag/keyword recommendations
+
+Make suggestions specific to the {platform} platform.
+"""
 
 class OllamaService:
     """Service for interacting with Ollama and Llama2 model"""
     
-    def __init__(self, base_url: str = None, model: str = None):
+    # Per-video sessions kept for context reuse (least recently used are dropped)
+    MAX_SESSIONS = 64
+    
+    def __init__(self, base_url: str = None, model: str = None, response_cache: Optional[ResponseCache] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         self.base_url = base_url or Config.OLLAMA_BASE_URL
         self.model = model or Config.OLLAMA_MODEL
         self.session = requests.Session()
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.breaker = breaker if breaker is not None else breaker_for(self.base_url)
+        self.keep_alive = Config.OLLAMA_KEEP_ALIVE
+        self._sessions = OrderedDict()
+        self._sessions_lock = threading.Lock()
     
     def is_available(self) -> bool:
         """Check if Ollama service is available"""
         try:
-            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=ENDPOINT_TIMEOUTS['tags'])
             return response.status_code == 200
         except:
             return False
@@ -22,43 +300,132 @@ class OllamaService:
     def list_models(self) -> list:
         """List available models"""
         try:
-            response = self.session.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=ENDPOINT_TIMEOUTS['tags'])
             if response.status_code == 200:
                 return response.json().get('models', [])
             return []
         except:
             return []
     
-    def generate_response(self, prompt: str, context: str = None) -> str:
-        """Generate response using Llama2 model"""
+    def generate_response(self, prompt: str, context: List[int] = None, options: Dict[str, Any] = None) -> str:
+        """Generate response using Llama2 model (identical model/prompt/options are served from the response cache)"""
+        return self.generate(prompt, context, options).get('response', '')
+    
+    def generate(self, prompt: str, context: List[int] = None, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Full /api/generate result (response, context tokens, eval counts); failures set 'error'"""
+        key = response_key(self.model, prompt, options, context)
+        if self.response_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return {'response': cached, 'cached': True}
+        if self.breaker and not self.breaker.allow():
+            return {'response': circuit_open_message(self.breaker), 'error': True, 'skipped': True}
+        
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False
-            }
-            
-            if context:
-                payload["context"] = context
-            
             response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=30
+                json=generate_payload(self.model, prompt, self.keep_alive, context, options),
+                timeout=ENDPOINT_TIMEOUTS['generate']
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '')
-            else:
-                return f"Error: {response.status_code} - {response.text}"
-                
         except Exception as e:
-            return f"Error generating response: {str(e)}"
+            if self.breaker:
+                self.breaker.record()
+            return {'response': f"Error generating response: {str(e)}", 'error': True}
+        if self.breaker:
+            self.breaker.record(response.status_code)
+        try:
+            return generate_result(self.model, response, self.response_cache, key)
+        except Exception as e:
+            return {'response': f"Error generating response: {str(e)}", 'error': True}
+    
+    def session_for(self, stats_data: Dict[str, Any]) -> OllamaSession:
+        """Session of one video, reused while its stats are unchanged"""
+        key = json.dumps([stats_data.get(name) for name in
+                          ('platform', 'url', 'title', 'views', 'likes', 'shares', 'comments')], default=str)
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = OllamaSession(self, stats_data)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+            return session
+    
+    def context_reuse_stats(self) -> Dict[str, Any]:
+        """Prompt tokens and prompt-eval seconds saved by follow-ups over all live sessions"""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+        totals = {'sessions': len(sessions), 'follow_ups': 0, 'reused_tokens': 0, 'prompt_eval_seconds_saved': 0.0}
+        for session in sessions:
+            for name in ('follow_ups', 'reused_tokens', 'prompt_eval_seconds_saved'):
+                totals[name] += session.metrics[name]
+        totals['prompt_eval_seconds_saved'] = round(totals['prompt_eval_seconds_saved'], 2)
+        return totals
+    
+    def vision_model(self, available_models: List[str] = None) -> Optional[str]:
+        """Configured vision model, else the first installed one from VISION_MODELS"""
+        if available_models is None and not Config.OLLAMA_VISION_MODEL:
+            available_models = [m.get('name', '') for m in self.list_models()]
+        return pick_vision_model(available_models or [])
+    
+    def running_models(self) -> List[str]:
+        """Models currently resident in Ollama's memory (/api/ps)"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/ps", timeout=ENDPOINT_TIMEOUTS['ps'])
+            if response.status_code == 200:
+                return [m.get('name', '') for m in response.json().get('models', [])]
+            return []
+        except:
+            return []
+    
+    def warm_up(self) -> Dict[str, Dict[str, Any]]:
+        """Load the text and vision models with an empty prompt, so the first real request skips the load"""
+        report = {}
+        for model in filter(None, dict.fromkeys([self.model, self.vision_model()])):
+            try:
+                start = time.perf_counter()
+                response = self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json={"model": model, "prompt": "", "stream": False, "keep_alive": self.keep_alive},
+                    timeout=Config.OLLAMA_WARMUP_TIMEOUT
+                )
+                if response.status_code == 200:
+                    record_load(model, response.json().get('load_duration') or int((time.perf_counter() - start) * 1e9))
+                    report[model] = {'loaded': True, 'load_seconds': MODEL_LOAD_TIMES.get(model)}
+                else:
+                    report[model] = {'loaded': False, 'error': f"{response.status_code} - {response.text}"}
+            except Exception as e:
+                report[model] = {'loaded': False, 'error': str(e)}
+        return report
+    
+    def warm_up_in_background(self) -> bool:
+        """Run warm_up() once per process in a daemon thread; False when disabled or already started"""
+        global _warm_up_started
+        if not Config.OLLAMA_WARMUP:
+            return False
+        with _warm_up_lock:
+            if _warm_up_started:
+                return False
+            _warm_up_started = True
+        threading.Thread(target=self.warm_up, name='ollama-warm-up', daemon=True).start()
+        return True
+    
+    def stream_response(self, prompt: str, context: str = None, options: Dict[str, Any] = None) -> ResponseStream:
+        """Stream a generation chunk by chunk from Ollama's NDJSON output (see ResponseStream)"""
+        return ResponseStream(self, prompt, context, options)
     
     def analyze_social_media_data(self, stats_data: Dict[str, Any]) -> str:
-        """Analyze social media statistics using Llama2"""
-        prompt = f"""
+        """Analyze social media statistics using Llama2 (starts the video's session for follow-ups)"""
+        return self.session_for(stats_data).analyze()
+    
+    def stream_social_media_analysis(self, stats_data: Dict[str, Any]) -> ResponseStream:
+        """analyze_social_media_data, streamed"""
+        return self.session_for(stats_data).stream_analysis()
+    
+    @staticmethod
+    def analysis_prompt(stats_data: Dict[str, Any]) -> str:
+        """Prompt used to analyze one post's statistics"""
+        return f"""
 Analyze the following social media statistics and provide insights:
 
 Platform: {stats_data.get('platform', 'Unknown')}
@@ -78,8 +445,6 @@ Please provide:
 
 Keep the analysis concise and actionable.
 """
-        
-        return self.generate_response(prompt)
     
     def compare_platforms(self, stats_list: list) -> str:
         """Compare statistics across multiple platforms"""
@@ -114,8 +479,13 @@ Keep the comparison concise and actionable.
         return self.generate_response(prompt)
     
     def generate_content_suggestions(self, stats_data: Dict[str, Any]) -> str:
-        """Generate content suggestions based on performance data"""
-        prompt = f"""
+        """Generate content suggestions based on performance data (a follow-up on the video's analysis)"""
+        return self.session_for(stats_data).content_suggestions()
+    
+    @staticmethod
+    def content_suggestions_prompt(stats_data: Dict[str, Any]) -> str:
+        """Stand-alone prompt (stats included) for content suggestions"""
+        return f"""
 Based on this social media post performance:
 
 Platform: {stats_data.get('platform', 'Unknown')}
@@ -134,45 +504,34 @@ Generate 5 content improvement suggestions:
 
 Make suggestions specific to the {stats_data.get('platform', 'platform')} platform.
 """
-        
-        return self.generate_response(prompt)
     
     def analyze_image_with_text(self, image_base64: str, prompt: str) -> str:
         """Analyze image with text using vision-capable model"""
+        # Skip even the model lookup while the circuit is open
+        if self.breaker and self.breaker.is_open():
+            return circuit_open_message(self.breaker)
         try:
             # Check if we have a vision-capable model
-            vision_models = ['llava', 'llava:latest', 'bakllava', 'moondream']
-            available_models = [m.get('name', '') for m in self.list_models()]
-            
-            # Find a suitable vision model
-            vision_model = None
-            for model in vision_models:
-                if model in available_models:
-                    vision_model = model
-                    break
+            vision_model = self.vision_model()
             
             if not vision_model:
                 return "Error: No vision-capable model available. Please install llava or similar model."
+            if self.breaker and not self.breaker.allow():
+                return circuit_open_message(self.breaker)
             
-            payload = {
-                "model": vision_model,
-                "prompt": prompt,
-                "images": [image_base64],
-                "stream": False
-            }
-            
-            response = self.session.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60  # Longer timeout for vision analysis
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '')
-            else:
-                return f"Error: {response.status_code} - {response.text}"
-                
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json=generate_payload(vision_model, prompt, self.keep_alive, images=[image_base64]),
+                    timeout=ENDPOINT_TIMEOUTS['vision']  # Longer timeout for vision analysis
+                )
+            except Exception:
+                if self.breaker:
+                    self.breaker.record()
+                raise
+            if self.breaker:
+                self.breaker.record(response.status_code)
+            return generate_result(vision_model, response).get('response', '')
         except Exception as e:
             return f"Error analyzing image: {str(e)}"
     
@@ -182,6 +541,10 @@ Make suggestions specific to the {stats_data.get('platform', 'platform')} platfo
             'service_available': False,
             'model_loaded': False,
             'models_available': [],
+            'models': {},
+            'context_reuse': self.context_reuse_stats(),
+            'circuit': self.breaker.stats() if self.breaker else None,
+            'response_cache': self.response_cache.stats() if self.response_cache else None,
             'error': None
         }
         
@@ -195,6 +558,11 @@ Make suggestions specific to the {stats_data.get('platform', 'platform')} platfo
                 result['models_available'] = [m.get('name', '') for m in models]
                 result['model_loaded'] = self.model in result['models_available']
                 
+                # Residency and last load time of the text and vision models
+                result['models'] = model_report(
+                    [self.model, self.vision_model(result['models_available'])], self.running_models()
+                )
+                
                 if not result['model_loaded']:
                     result['error'] = f"Model '{self.model}' not found. Available models: {result['models_available']}"
             else:
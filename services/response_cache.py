@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config import Config
+
+def response_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None, context: Any = None) -> str:
+    """Cache key of a generate call: model plus a hash of prompt, options and context"""
+    digest = hashlib.sha256(
+        json.dumps([prompt, options or {}, context], sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+    return f"{model}:{digest}"
+
+class ResponseCache:
+    """LLM responses by (model, prompt hash, options): in-memory LRU over an optional SQLite tier, with a TTL"""
+
+    def __init__(self, path: str = None, memory_size: int = None, ttl: float = None):
+        self.path = path
+        self.memory_size = memory_size or Config.LLM_CACHE_MEMORY_SIZE
+        self.ttl = Config.LLM_CACHE_TTL if ttl is None else ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT, created_at REAL)')
+            self._db.commit()
+
+    def _remember(self, key: str, response: str, created_at: float):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self._counts['evictions'] += 1
+
+    def _lookup(self, key: str):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._db is None:
+            return None
+        row = self._db.execute('SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+        if row:
+            self._remember(key, row[0], row[1])
+        return row
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response while younger than the TTL, None otherwise (counted as hit / miss)"""
+        with self._lock:
+            found = self._lookup(key)
+            if found and time.time() - found[1] < self.ttl:
+                self._counts['hits'] += 1
+                return found[0]
+            self._counts['misses'] += 1
+            return None
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)', (key, response, now))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM llm_cache')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters, hit rate and memory size"""
+        with self._lock:
+            lookups = self._counts['hits'] + self._counts['misses']
+            return {
+                **self._counts,
+                'hit_rate': round(self._counts['hits'] / lookups, 3) if lookups else 0.0,
+                'size': len(self._memory),
+                'disk': bool(self._db is not None)
+            }
+
+_cache = None
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache, None when disabled"""
+    global _cache
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(Config.LLM_CACHE_PATH)
+    return _cache
@@ -26,6 +26,7 @@ from extract_video_details import (
     calculate_completeness_score
 )
 from utils.url_detector import URLDetector
+from scrapers.revalidate import age_seconds, get_revalidator
 from services.ollama_service import OllamaService
 from vlm_metrics_analyzer import analyze_video_with_vlm, VLMAnalysisResult
 
@@ -156,6 +157,7 @@ def setup_vlm_service():
         health = st.session_state.ollama_service.health_check()
         if health.get('service_available', False):
             st.session_state.vlm_enabled = True
+            st.session_state.ollama_service.warm_up_in_background()
             return True
         else:
             st.session_state.vlm_enabled = False
@@ -484,6 +486,12 @@ def create_download_link(video_data: Dict[str, Any]):
     href = f'<a href="data:application/json;base64,{b64}" download="{filename}">📥 Download Data JSON</a>'
     return href
 
+def history_stats(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Counts dict of a history item (extract_video_details stores them under 'video_info')"""
+    if 'stats' in item:
+        return item['stats']
+    return item.setdefault('video_info', {})
+
 def display_extraction_history():
     """Tampilkan riwayat ekstraksi"""
     if not st.session_state.extraction_history:
@@ -492,9 +500,25 @@ def display_extraction_history():
     
     st.subheader(f"{get_text('history_title')} ({len(st.session_state.extraction_history)} {get_text('video_count')})")
     
+    # Stale-while-revalidate: last known numbers at once, expired ones refreshed in the background
+    revalidator = get_revalidator()
+    if revalidator:
+        for item in st.session_state.extraction_history:
+            if 'error' not in item and item.get('url'):
+                revalidator.apply(history_stats(item), item['url'])
+        
+        pending = revalidator.pending()
+        if pending:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.info(get_text('refreshing_count', count=pending))
+            with col2:
+                if st.button(get_text('show_latest'), key="revalidate_history"):
+                    st.rerun()
+    
     # Summary statistics
-    total_views = sum(item.get('stats', {}).get('views', 0) or 0 for item in st.session_state.extraction_history if 'stats' in item)
-    total_likes = sum(item.get('stats', {}).get('likes', 0) or 0 for item in st.session_state.extraction_history if 'stats' in item)
+    total_views = sum(history_stats(item).get('views', 0) or 0 for item in st.session_state.extraction_history)
+    total_likes = sum(history_stats(item).get('likes', 0) or 0 for item in st.session_state.extraction_history)
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -510,18 +534,21 @@ def display_extraction_history():
     for i, item in enumerate(reversed(st.session_state.extraction_history), 1):
         with st.expander(f"Video #{len(st.session_state.extraction_history) - i + 1} - {item.get('timestamp', 'Unknown time')}"):
             if 'error' not in item:
-                stats = item.get('stats', {})
+                stats = history_stats(item)
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown(f"**{get_text('title_label')}:** {stats.get('title', 'N/A')[:50]}...")
-                    st.markdown(f"**{get_text('platform_label')}:** {stats.get('platform', 'N/A').upper()}")
+                    st.markdown(f"**{get_text('title_label')}:** {(stats.get('title') or 'N/A')[:50]}...")
+                    st.markdown(f"**{get_text('platform_label')}:** {(stats.get('platform') or item.get('platform') or 'N/A').upper()}")
                     st.markdown(f"**URL:** {item.get('url', 'N/A')[:50]}...")
                 
                 with col2:
                     st.markdown(f"**Views:** {format_number(stats.get('views'))}")
                     st.markdown(f"**Likes:** {format_number(stats.get('likes'))}")
                     st.markdown(f"**Comments:** {format_number(stats.get('comments'))}")
+                    age = age_seconds(stats.get('scraped_at'))
+                    if age is not None:
+                        st.caption(get_text('data_age', minutes=int(age // 60)))
             else:
                 st.error(f"Error: {item['error']}")
     
@@ -5,18 +5,53 @@ Basic tests for application components
 """
 
 import unittest
+import asyncio
+import json
+import time
 import sys
 import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils.url_detector import URLDetector
 from scrapers.base_scraper import SocialMediaStats
+from scrapers.youtube_scraper import YouTubeScraper
+from scrapers.tiktok_scraper import TikTokScraper
+from scrapers.facebook_scraper import FacebookScraper
+from scrapers.network_capture import NetworkCapture
+from scrapers.cdp_transport import CDPTransport, CDPError
+from scrapers.remote_grid import RemoteNodePool
+from scrapers.errors import (
+    LoginWallError, CaptchaError, ConsentWallError, PrivateContentError, UnavailableError, classify_exception
+)
+from scrapers.page_state import page_state_script
+from scrapers.locale_pin import accept_language, metric_words, pin_url
+from scrapers.latency import LatencyTracker, latency_tracker
+from scrapers.http_extractor import HttpExtractor, html_payloads
+from scrapers.hedged import HedgedScraper
+from scrapers.negative_cache import NegativeCache
+from scrapers.result_cache import ResultCache
+from scrapers.single_flight import SingleFlight
+from scrapers.revalidate import Revalidator, age_seconds
+from scrapers.retry import RetryPolicy, classify_stats
+from scrapers.playwright_backend import PlaywrightBackend
+from scrapers.async_scraper import AsyncScraper, SeleniumAsyncScraper, run_sync
+from scrapers import ScraperFactory
 from services.ollama_service import OllamaService
+from services.async_ollama_service import AsyncOllamaService
+from services.response_cache import ResponseCache, response_key
+from services.analysis_stage import AnalysisStage
+from services.circuit_breaker import CircuitBreaker
 from config import Config
 
+# Scrape tests must not share results through (or write) the on-disk result cache, nor
+# Ollama tests their responses through the LLM cache or their failures through the circuit breaker
+Config.RESULT_CACHE_ENABLED = False
+Config.LLM_CACHE_ENABLED = False
+Config.OLLAMA_BREAKER_ENABLED = False
+
 class TestURLDetector(unittest.TestCase):
     """Test URL detection and validation"""
     
@@ -86,6 +121,57 @@ class TestURLDetector(unittest.TestCase):
         self.assertFalse(result['valid'])
         self.assertIn('error', result)
 
+class TestListingURLDetector(unittest.TestCase):
+    """Test channel/playlist/profile URL detection"""
+    
+    def test_youtube_listing_detection(self):
+        """Test YouTube channel and playlist URLs"""
+        test_urls = {
+            'https://www.youtube.com/@SomeChannel': ('channel', '@SomeChannel'),
+            'https://www.youtube.com/@SomeChannel/videos': ('channel', '@SomeChannel'),
+            'https://www.youtube.com/channel/UCabcDEF123': ('channel', 'channel/UCabcDEF123'),
+            'https://www.youtube.com/playlist?list=PLxyzABC': ('playlist', 'PLxyzABC'),
+        }
+        
+        for url, (listing_type, listing_id) in test_urls.items():
+            with self.subTest(url=url):
+                listing = URLDetector.detect_listing(url)
+                self.assertEqual(listing['platform'], 'youtube')
+                self.assertEqual(listing['listing_type'], listing_type)
+                self.assertEqual(listing['listing_id'], listing_id)
+    
+    def test_tiktok_profile_detection(self):
+        """Test TikTok profile URLs"""
+        for url in ['https://www.tiktok.com/@some.creator', 'https://www.tiktok.com/@some.creator/?lang=en']:
+            with self.subTest(url=url):
+                listing = URLDetector.detect_listing(url)
+                self.assertEqual(listing['platform'], 'tiktok')
+                self.assertEqual(listing['listing_id'], '@some.creator')
+    
+    def test_facebook_page_detection(self):
+        """Test Facebook page and videos tab URLs"""
+        test_urls = {
+            'https://www.facebook.com/somepage': 'somepage',
+            'https://www.facebook.com/somepage/videos/': 'somepage',
+            'https://www.facebook.com/somepage/reels': 'somepage',
+            'https://www.facebook.com/profile.php?id=100012345': 'profile.php?id=100012345',
+        }
+        
+        for url, listing_id in test_urls.items():
+            with self.subTest(url=url):
+                listing = URLDetector.detect_listing(url)
+                self.assertEqual(listing['platform'], 'facebook')
+                self.assertEqual(listing['listing_id'], listing_id)
+    
+    def test_video_url_is_not_listing(self):
+        """Test single video URLs are not treated as listings"""
+        self.assertFalse(URLDetector.is_listing_url('https://www.tiktok.com/@user/video/1234567890123456789'))
+        self.assertFalse(URLDetector.is_listing_url('https://www.facebook.com/somepage/videos/1234567890'))
+        self.assertFalse(URLDetector.is_listing_url('https://www.facebook.com/watch/?v=1234567890123456'))
+        self.assertFalse(URLDetector.is_listing_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLxyz'))
+        self.assertFalse(URLDetector.is_listing_url('not-a-url'))
+        self.assertFalse(URLDetector.validate_listing_url('https://example.com')['valid'])
+
 class TestSocialMediaStats(unittest.TestCase):
     """Test SocialMediaStats data class"""
     
@@ -119,6 +205,1524 @@ class TestSocialMediaStats(unittest.TestCase):
         self.assertEqual(result['views'], 1000)
         self.assertIn('url', result)
 
+class TestYouTubeCommentCount(unittest.TestCase):
+    """Test comment count extraction from YouTube page data"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scraper = YouTubeScraper()
+    
+    def test_count_from_continuation_header(self):
+        """Test exact count from the comments header in a next payload"""
+        payload = {
+            'onResponseReceivedEndpoints': [{
+                'reloadContinuationItemsCommand': {
+                    'continuationItems': [{
+                        'commentsHeaderRenderer': {
+                            'countText': {'runs': [{'text': '1,234'}, {'text': ' Comments'}]},
+                            'commentsCount': {'simpleText': '1.2K'}
+                        }
+                    }]
+                }
+            }]
+        }
+        
+        self.assertEqual(self.scraper._parse_comment_count(payload), 1234)
+    
+    def test_count_from_engagement_panel(self):
+        """Test count from the comments engagement panel in ytInitialData"""
+        data = {
+            'engagementPanels': [{
+                'engagementPanelSectionListRenderer': {
+                    'panelIdentifier': 'engagement-panel-comments-section',
+                    'header': {
+                        'engagementPanelTitleHeaderRenderer': {
+                            'contextualInfo': {'runs': [{'text': '5.6K'}]}
+                        }
+                    }
+                }
+            }]
+        }
+        
+        self.assertEqual(self.scraper._parse_comment_count(data), 5600)
+    
+    def test_continuation_used_when_count_missing(self):
+        """Test the continuation payload is fetched when initial data has no count"""
+        initial_data = {
+            'contents': {'twoColumnWatchNextResults': {'results': {'results': {'contents': [{
+                'itemSectionRenderer': {
+                    'sectionIdentifier': 'comment-item-section',
+                    'contents': [{
+                        'continuationItemRenderer': {
+                            'continuationEndpoint': {'continuationCommand': {'token': 'TOKEN'}}
+                        }
+                    }]
+                }
+            }]}}}}
+        }
+        continuation = {'commentsHeaderRenderer': {'countText': {'simpleText': '42 Comments'}}}
+        
+        player_response = {'videoDetails': {'videoId': 'abc', 'viewCount': '10'}}
+        
+        # The payloads already fetched by page_payloads are reused: ytInitialData is not read again
+        with patch.object(self.scraper, '_get_initial_data') as mock_initial_data, \
+             patch.object(self.scraper, '_innertube_post', return_value=continuation) as mock_post:
+            self.assertEqual(self.scraper._extract_comment_count_from_data([player_response, initial_data]), 42)
+            mock_post.assert_called_once_with('next', 'TOKEN')
+            mock_initial_data.assert_not_called()
+    
+    def test_missing_data_returns_none(self):
+        """Test None is returned so the scroll fallback runs"""
+        with patch.object(self.scraper, '_innertube_post') as mock_post:
+            self.assertIsNone(self.scraper._extract_comment_count_from_data([]))
+            self.assertIsNone(self.scraper._extract_comment_count_from_data([{'videoDetails': {}}]))
+            mock_post.assert_not_called()
+
+class TestYouTubeListing(unittest.TestCase):
+    """Test YouTube channel/playlist listing parsing"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scraper = YouTubeScraper()
+        self.page = {
+            'metadata': {'channelMetadataRenderer': {'title': 'Some Channel'}},
+            'contents': [
+                {'richItemRenderer': {'content': {'videoRenderer': {
+                    'videoId': 'abcDEF12345',
+                    'title': {'runs': [{'text': 'First video'}]},
+                    'viewCountText': {'simpleText': '1,234,567 views'}
+                }}}},
+                {'playlistVideoRenderer': {
+                    'videoId': 'xyzXYZ67890',
+                    'title': {'simpleText': 'Second video'},
+                    'videoInfo': {'runs': [{'text': '2.5K views'}, {'text': ' • '}, {'text': '3 days ago'}]}
+                }},
+                {'continuationItemRenderer': {
+                    'continuationEndpoint': {'continuationCommand': {'token': 'NEXT'}}
+                }}
+            ]
+        }
+    
+    def test_parse_listing_items(self):
+        """Test views and titles come straight from the listing payload"""
+        items = self.scraper._parse_listing_items(self.page)
+        
+        self.assertEqual([i['video_id'] for i in items], ['abcDEF12345', 'xyzXYZ67890'])
+        self.assertEqual(items[0]['views'], 1234567)
+        self.assertEqual(items[0]['title'], 'First video')
+        self.assertEqual(items[1]['views'], 2500)
+        self.assertEqual(self.scraper._find_listing_continuation(self.page), 'NEXT')
+        self.assertEqual(self.scraper._listing_author(self.page), 'Some Channel')
+    
+    def test_scrape_listing_pages_through_continuations(self):
+        """Test continuations are followed and the limit is respected"""
+        next_page = {'onResponseReceivedActions': [{'appendContinuationItemsAction': {'continuationItems': [
+            {'richItemRenderer': {'content': {'videoRenderer': {
+                'videoId': 'thirdVID001',
+                'title': {'runs': [{'text': 'Third video'}]},
+                'viewCountText': {'simpleText': '10 views'}
+            }}}}
+        ]}}]}
+        self.scraper.driver = Mock()
+        
+        with patch.object(self.scraper, '_get_initial_data', return_value=self.page), \
+             patch.object(self.scraper, '_innertube_post', return_value=next_page) as mock_post:
+            results = self.scraper.scrape_listing('https://www.youtube.com/@SomeChannel')
+            limited = self.scraper.scrape_listing('https://www.youtube.com/@SomeChannel', limit=1)
+        
+        mock_post.assert_called_with('browse', 'NEXT')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].url, 'https://www.youtube.com/watch?v=abcDEF12345')
+        self.assertEqual(results[0].author, 'Some Channel')
+        self.assertEqual(results[2].views, 10)
+        self.assertEqual(len(limited), 1)
+    
+    def test_deep_scrape_only_missing_fields(self):
+        """Test per-video scrapes only run for videos missing requested fields"""
+        complete = SocialMediaStats(platform='youtube', url='https://a', views=1, likes=2)
+        partial = SocialMediaStats(platform='youtube', url='https://b', views=1)
+        
+        with patch.object(self.scraper, 'scrape',
+                          return_value=SocialMediaStats(platform='youtube', url='https://b', likes=7)) as mock_scrape:
+            self.scraper.fill_missing_fields([complete, partial], ['likes'])
+        
+        mock_scrape.assert_called_once_with('https://b')
+        self.assertEqual(partial.likes, 7)
+
+class TestTikTokProfileFeed(unittest.TestCase):
+    """Test TikTok profile feed harvesting"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scraper = TikTokScraper()
+        self.item = {
+            'id': '7300000000000000001',
+            'desc': 'Clip one',
+            'createTime': 1700000000,
+            'author': {'uniqueId': 'creator'},
+            'stats': {'playCount': 120345, 'diggCount': 4567, 'shareCount': 89, 'commentCount': 12}
+        }
+    
+    def test_stats_from_item(self):
+        """Test exact counts are read from an item_list entry"""
+        stats = self.scraper._stats_from_item(self.item)
+        
+        self.assertEqual(stats.url, 'https://www.tiktok.com/@creator/video/7300000000000000001')
+        self.assertEqual(stats.views, 120345)
+        self.assertEqual(stats.likes, 4567)
+        self.assertEqual(stats.shares, 89)
+        self.assertEqual(stats.comments, 12)
+        self.assertEqual(stats.author, 'creator')
+        self.assertIsNotNone(stats.upload_date)
+    
+    def test_scrape_listing_collects_feed_pages(self):
+        """Test item_list responses are collected until hasMore is false"""
+        second = dict(self.item, id='7300000000000000002')
+        pages = [
+            [{'itemList': [self.item], 'hasMore': True}],
+            [{'itemList': [self.item, second], 'hasMore': False}],
+        ]
+        self.scraper.driver = Mock()
+        self.scraper.network_capture = Mock()
+        self.scraper.network_capture.json_bodies.side_effect = pages
+        
+        with patch('scrapers.tiktok_scraper.time.sleep'):
+            results = self.scraper.scrape_listing('https://www.tiktok.com/@creator')
+        
+        self.scraper.driver.get.assert_called_once_with('https://www.tiktok.com/@creator')
+        self.assertEqual([r.url.rsplit('/', 1)[-1] for r in results],
+                         ['7300000000000000001', '7300000000000000002'])
+
+class TestFacebookVideosTab(unittest.TestCase):
+    """Test Facebook videos tab bulk listing"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scraper = FacebookScraper()
+    
+    def test_collect_listing_videos(self):
+        """Test view counts are attached to the nearest video ID"""
+        payload = {'data': {'node': {'edges': [
+            {'node': {'__typename': 'Video', 'id': '111', 'title': {'text': 'Clip A'},
+                      'feedback': {'id': 'ZmVlZGJhY2s6MQ==', 'video_view_count': 5120}}},
+            {'node': {'videoId': '222', 'play_count': 42,
+                      'permalink_url': 'https://www.facebook.com/somepage/videos/222/'}}
+        ]}}}
+        found = {}
+        
+        self.scraper._collect_videos(payload, found)
+        
+        self.assertEqual(found['111']['views'], 5120)
+        self.assertEqual(found['111']['title'], 'Clip A')
+        self.assertEqual(found['222']['views'], 42)
+        self.assertEqual(found['222']['url'], 'https://www.facebook.com/somepage/videos/222/')
+    
+    def test_scrape_listing_scrolls_until_idle(self):
+        """Test the tab is scrolled until no new videos appear"""
+        self.scraper.driver = Mock()
+        self.scraper.driver.title = 'Some Page | Facebook'
+        self.scraper.driver.execute_script.return_value = {
+            'payloads': ['{"video": {"__typename": "Video", "id": "333", "play_count": 7}}'],
+            'links': ['https://www.facebook.com/somepage/videos/444/?ref=tab']
+        }
+        self.scraper.network_capture = Mock()
+        self.scraper.network_capture.json_bodies.return_value = []
+        
+        with patch('scrapers.facebook_scraper.time.sleep'):
+            results = self.scraper.scrape_listing('https://www.facebook.com/somepage')
+        
+        self.scraper.driver.get.assert_called_once_with('https://www.facebook.com/somepage/videos')
+        self.assertEqual({r.url: r.views for r in results}, {
+            'https://www.facebook.com/watch/?v=333': 7,
+            'https://www.facebook.com/somepage/videos/444/': None
+        })
+        self.assertTrue(all(r.author == 'Some Page' for r in results))
+
+class TestNetworkCapture(unittest.TestCase):
+    """Test response capture from Chrome performance logs"""
+    
+    def _entry(self, method, **params):
+        return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+    
+    def test_matching_bodies_are_captured(self):
+        """Test only finished responses of matching URLs are read"""
+        driver = Mock()
+        driver.get_log.side_effect = [[
+            self._entry('Network.responseReceived', requestId='1',
+                        response={'url': 'https://www.tiktok.com/api/item/detail/?itemId=1'}),
+            self._entry('Network.responseReceived', requestId='2',
+                        response={'url': 'https://www.tiktok.com/static/app.js'}),
+            self._entry('Network.loadingFinished', requestId='1'),
+            self._entry('Network.loadingFinished', requestId='2'),
+        ], []]
+        driver.execute_cdp_cmd.return_value = {'body': '{"itemInfo": {}}', 'base64Encoded': False}
+        capture = NetworkCapture(driver, [r'/api/item/detail/'])
+        
+        self.assertEqual(capture.json_bodies(), [{'itemInfo': {}}])
+        driver.execute_cdp_cmd.assert_called_once_with('Network.getResponseBody', {'requestId': '1'})
+        self.assertEqual(capture.json_bodies(), [])
+
+class TestPayloadCounts(unittest.TestCase):
+    """Test exact counts are read from platform JSON payloads"""
+    
+    def test_tiktok_item_detail(self):
+        """Test the itemStruct of the requested video is used, not a recommendation"""
+        scraper = TikTokScraper()
+        payloads = [{'__DEFAULT_SCOPE__': {'webapp.video-detail': {'itemInfo': {'itemStruct': {
+            'id': '7300000000000000001', 'createTime': 1700000000, 'desc': 'Clip',
+            'author': {'uniqueId': 'creator'},
+            'stats': {'playCount': 1234567, 'diggCount': 89012, 'shareCount': 345, 'commentCount': 678},
+            'related': [{'id': '7300000000000000009', 'createTime': 1700000000, 'stats': {'playCount': 1}}]
+        }}}}}]
+        
+        stats = scraper._stats_from_payloads(payloads, '7300000000000000001')
+        
+        self.assertEqual((stats.views, stats.likes, stats.shares, stats.comments), (1234567, 89012, 345, 678))
+        self.assertIsNone(scraper._stats_from_payloads(payloads, '7300000000000000002'))
+    
+    def test_youtube_watch_page(self):
+        """Test views, likes and comments come from player response and watch data"""
+        scraper = YouTubeScraper()
+        player = {
+            'videoDetails': {'videoId': 'dQw4w9WgXcQ', 'viewCount': '1234567890', 'title': 'Song', 'author': 'Artist'},
+            'microformat': {'playerMicroformatRenderer': {'publishDate': '2009-10-24'}}
+        }
+        data = {'contents': [
+            {'likeButtonViewModel': {'toggleButtonViewModel': {'toggleButtonViewModel': {
+                'defaultButtonViewModel': {'buttonViewModel': {
+                    'title': '18M', 'accessibilityText': 'like this video along with 18,123,456 other people'}},
+                'toggledButtonViewModel': {'buttonViewModel': {
+                    'accessibilityText': 'like this video along with 18,123,457 other people'}}
+            }}}},
+            {'commentsEntryPointHeaderRenderer': {'commentCount': {'simpleText': '2.3M'}}}
+        ]}
+        
+        stats = scraper._stats_from_payloads([player, data], 'dqw4w9wgxcq')
+        
+        self.assertEqual(stats.views, 1234567890)
+        self.assertEqual(stats.likes, 18123456)
+        self.assertEqual(stats.comments, 2300000)
+        self.assertEqual((stats.title, stats.author), ('Song', 'Artist'))
+        self.assertEqual(stats.upload_date, 'October 24, 2009')
+    
+    def test_facebook_video_feedback(self):
+        """Test counts are attached to the requested video, falling back to the post feedback"""
+        scraper = FacebookScraper()
+        payloads = [{'data': {'story': {
+            'feedback': {'share_count': {'count': 31}},
+            'attachments': [{'media': {'__typename': 'Video', 'id': '555', 'play_count': 98765,
+                                       'feedback': {'reaction_count': {'count': 4321},
+                                                    'comments': {'total_count': 210}}}}]
+        }}}]
+        
+        stats = scraper._stats_from_payloads(payloads, '555')
+        
+        self.assertEqual((stats.views, stats.likes, stats.shares, stats.comments), (98765, 4321, 31, 210))
+        self.assertEqual(scraper._video_id('https://www.facebook.com/somepage/videos/555/'), '555')
+        self.assertEqual(scraper._video_id('https://www.facebook.com/watch/?v=555'), '555')
+    
+    def test_payload_stats_fill_only_missing(self):
+        """Test JSON values never overwrite fields that are already set"""
+        scraper = FacebookScraper()
+        stats = SocialMediaStats(platform='facebook', url='u', title='Kept')
+        
+        scraper.apply_payload_stats(stats, SocialMediaStats(platform='facebook', url='', title='Other', likes=5))
+        
+        self.assertEqual((stats.title, stats.likes), ('Kept', 5))
+
+class TestPlaywrightBackend(unittest.TestCase):
+    """Test the Playwright backend with a fake browser"""
+    
+    def _backend(self, evaluate_results):
+        page = Mock()
+        page.url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+        page.goto = AsyncMock()
+        page.wait_for_timeout = AsyncMock()
+        page.evaluate = AsyncMock(side_effect=evaluate_results)
+        context = Mock()
+        context.route = AsyncMock()
+        context.new_page = AsyncMock(return_value=page)
+        context.close = AsyncMock()
+        
+        backend = PlaywrightBackend(max_concurrency=2)
+        backend._browser = Mock()
+        backend._browser.new_context = AsyncMock(return_value=context)
+        backend._semaphore = asyncio.Semaphore(2)
+        backend.retry_policy = RetryPolicy(max_retries=1, base_delay=0)
+        return backend, context
+    
+    def test_scrape_reads_page_payloads(self):
+        """Test counts come from page JSON and each URL gets its own context"""
+        player = json.dumps({'videoDetails': {'videoId': 'dQw4w9WgXcQ', 'viewCount': '4321', 'title': 'Song'}})
+        backend, context = self._backend([None, player, None])
+        
+        stats = asyncio.run(backend.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        
+        self.assertIsNone(stats.error)
+        self.assertEqual((stats.platform, stats.views, stats.title), ('youtube', 4321, 'Song'))
+        context.close.assert_awaited_once()
+    
+    def test_captcha_page_fails_fast(self):
+        """Test a bot check is reported as captcha before any payload is read"""
+        backend, context = self._backend(['captcha'])
+        
+        stats = asyncio.run(backend.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        
+        self.assertEqual(stats.error_type, 'captcha')
+        context.new_page.return_value.wait_for_timeout.assert_not_awaited()
+        context.close.assert_awaited_once()
+    
+    def test_retries_missing_metrics_and_records_timing(self):
+        """Test an empty page is retried, then classified element_missing with retry_count and scrape_time"""
+        player = json.dumps({'videoDetails': {'videoId': 'dQw4w9WgXcQ', 'viewCount': '99'}})
+        backend, context = self._backend([None, None, None, None, player, None])
+        latency_tracker.reset()
+        self.addCleanup(latency_tracker.reset)
+        
+        stats = asyncio.run(backend.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        
+        self.assertEqual((stats.views, stats.retry_count), (99, 1))
+        self.assertIsNotNone(stats.scrape_time)
+        self.assertEqual(latency_tracker.percentiles('youtube', 'page')['samples'], 2)
+        
+        backend, _ = self._backend([None] * 6)
+        stats = asyncio.run(backend.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        self.assertEqual((stats.error_type, stats.retry_count), ('element_missing', 1))
+        self.assertIsNotNone(stats.error)
+    
+    def test_adaptive_page_timeout_and_reused_session(self):
+        """Test goto uses the tracker's page timeout and a caller's context gets no extra route"""
+        player = json.dumps({'videoDetails': {'videoId': 'dQw4w9WgXcQ', 'viewCount': '5'}})
+        backend, context = self._backend([None, player, None])
+        
+        with patch.object(latency_tracker, 'timeout', return_value=12.5) as timeout:
+            stats = asyncio.run(backend.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ', session=context))
+        
+        self.assertEqual(stats.views, 5)
+        self.assertEqual(timeout.call_args.args[:2], ('youtube', 'page'))
+        self.assertEqual(context.new_page.return_value.goto.await_args.kwargs['timeout'], 12500)
+        context.route.assert_not_awaited()
+        context.close.assert_not_awaited()
+        backend._browser.new_context.assert_not_called()
+    
+    def test_invalid_url_is_not_opened(self):
+        """Test invalid URLs fail without creating a context"""
+        backend, _ = self._backend([])
+        
+        stats = asyncio.run(backend.scrape('not a url'))
+        
+        self.assertIsNotNone(stats.error)
+        backend._browser.new_context.assert_not_called()
+
+class TestAsyncScraper(unittest.TestCase):
+    """Test the async scraper contract and its sync wrappers"""
+    
+    class EchoScraper(AsyncScraper):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.in_flight = 0
+            self.peak = 0
+        
+        async def scrape(self, url, session=None):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return SocialMediaStats(platform='youtube', url=url)
+    
+    def test_scrape_many_keeps_order_and_bounds_concurrency(self):
+        """Test results follow input order with at most max_concurrency in flight"""
+        scraper = self.EchoScraper(max_concurrency=2)
+        urls = [f'https://example.com/{i}' for i in range(5)]
+        
+        results = scraper.scrape_many_sync(urls)
+        
+        self.assertEqual([r.url for r in results], urls)
+        self.assertEqual(scraper.peak, 2)
+    
+    def test_sync_wrapper_inside_running_loop(self):
+        """Test run_sync also works when called from a thread with a running loop"""
+        async def caller():
+            return self.EchoScraper().scrape_sync('https://example.com/a')
+        
+        self.assertEqual(asyncio.run(caller()).url, 'https://example.com/a')
+        self.assertEqual(run_sync(asyncio.sleep(0, result=7)), 7)
+    
+    def test_selenium_adapter_uses_passed_session(self):
+        """Test an explicit session is used instead of opening a new browser"""
+        session = Mock()
+        session.scraper.scrape_with_retry.return_value = SocialMediaStats(platform='tiktok', url='u', views=3)
+        
+        stats = asyncio.run(SeleniumAsyncScraper().scrape('u', session=session))
+        
+        self.assertEqual(stats.views, 3)
+        session.scraper.scrape_with_retry.assert_called_once_with('u')
+    
+    def test_factory_backends(self):
+        """Test the factory picks the async scraper for a backend"""
+        self.assertIsInstance(ScraperFactory.create_async_scraper('selenium'), SeleniumAsyncScraper)
+        self.assertIsInstance(ScraperFactory.create_async_scraper('playwright'), PlaywrightBackend)
+        with self.assertRaises(ValueError):
+            ScraperFactory.create_async_scraper('lynx')
+
+class TestCDPTransport(unittest.TestCase):
+    """Test the direct DevTools websocket transport with a fake socket"""
+    
+    def _transport(self, messages):
+        transport = CDPTransport('127.0.0.1:9222', timeout=1)
+        transport._ws = Mock()
+        transport._ws.recv.side_effect = [json.dumps(m) for m in messages]
+        return transport
+    
+    def test_navigate_keeps_early_load_event(self):
+        """Test a load event that arrives before the navigate reply is not lost"""
+        transport = self._transport([
+            {'id': 1, 'result': {}},
+            {'method': 'Page.loadEventFired', 'params': {'timestamp': 1}},
+            {'id': 2, 'result': {'frameId': 'F'}},
+        ])
+        
+        self.assertTrue(transport.navigate('https://example.com'))
+        sent = [json.loads(call.args[0])['method'] for call in transport._ws.send.call_args_list]
+        self.assertEqual(sent, ['Page.enable', 'Page.navigate'])
+    
+    def test_evaluate_returns_value_and_raises_errors(self):
+        """Test evaluation results and exceptions"""
+        transport = self._transport([
+            {'id': 1, 'result': {'result': {'type': 'string', 'value': 'Title'}}},
+            {'id': 2, 'result': {'result': {}, 'exceptionDetails': {'text': 'Uncaught', 'exception': {'description': 'ReferenceError: x'}}}},
+        ])
+        
+        self.assertEqual(transport.run_script('return document.title'), 'Title')
+        with self.assertRaises(CDPError):
+            transport.evaluate('x')
+    
+    def test_scraper_navigate_timeout(self):
+        """Test a missed load event surfaces as a Selenium timeout"""
+        from selenium.common.exceptions import TimeoutException
+        scraper = YouTubeScraper()
+        scraper.cdp = Mock()
+        scraper.cdp.navigate.return_value = False
+        
+        with self.assertRaises(TimeoutException):
+            scraper.navigate('https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+
+class TestRemoteNodePool(unittest.TestCase):
+    """Test spreading remote WebDriver sessions by node capacity"""
+    
+    def _status(self, free, busy=0, availability='UP'):
+        slots = [{'stereotype': {'browserName': 'chrome'}, 'session': None} for _ in range(free)]
+        slots += [{'stereotype': {'browserName': 'chrome'}, 'session': {'sessionId': 'x'}} for _ in range(busy)]
+        response = Mock()
+        response.json.return_value = {'value': {'ready': free > 0, 'nodes': [{'availability': availability, 'slots': slots}]}}
+        return response
+    
+    @patch('scrapers.remote_grid.requests.get')
+    def test_pick_most_free_slots(self, mock_get):
+        """Test the endpoint with most free slots wins and unreachable ones are skipped"""
+        responses = {
+            'http://a:4444/status': self._status(1, busy=3),
+            'http://b:4444/status': self._status(3, busy=1),
+            'http://c:4444/status': self._status(8, availability='DOWN'),
+        }
+        def fake_get(url, timeout):
+            if url == 'http://d:4444/status':
+                raise ConnectionError('refused')
+            return responses[url]
+        mock_get.side_effect = fake_get
+        pool = RemoteNodePool(['http://a:4444', 'http://b:4444/', 'http://c:4444', 'http://d:4444'])
+        
+        self.assertEqual(pool.capacities(), {'http://a:4444': 1, 'http://b:4444': 3, 'http://c:4444': 0, 'http://d:4444': None})
+        self.assertEqual(pool.pick(), 'http://b:4444')
+    
+    @patch('scrapers.remote_grid.requests.get')
+    def test_ties_rotate_and_no_endpoint_fails(self, mock_get):
+        """Test equal nodes alternate and an all-unreachable pool raises"""
+        mock_get.return_value = self._status(2)
+        pool = RemoteNodePool(['http://a:4444', 'http://b:4444'])
+        self.assertEqual({pool.pick(), pool.pick()}, {'http://a:4444', 'http://b:4444'})
+        
+        mock_get.side_effect = ConnectionError('refused')
+        with self.assertRaises(ConnectionError):
+            pool.pick()
+    
+    @patch('scrapers.base_scraper.get_node_pool')
+    @patch('scrapers.base_scraper.webdriver.Remote')
+    def test_create_driver_uses_remote_endpoint(self, mock_remote, mock_pool):
+        """Test setup uses webdriver.Remote on the picked endpoint when configured"""
+        mock_pool.return_value.pick.return_value = 'http://b:4444'
+        options = Mock()
+        
+        with patch.object(Config, 'SELENIUM_REMOTE_URLS', ['http://a:4444', 'http://b:4444']):
+            driver = YouTubeScraper()._create_driver(options)
+        
+        mock_remote.assert_called_once_with(command_executor='http://b:4444', options=options)
+        self.assertIs(driver, mock_remote.return_value)
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test classified retries with backoff"""
+    
+    def _scraper(self, results):
+        scraper = YouTubeScraper(headless=True)
+        scraper.scrape = Mock(side_effect=results)
+        scraper.restart_driver = Mock()
+        return scraper
+    
+    def _ok(self):
+        return SocialMediaStats(platform='youtube', url='u', views=10)
+    
+    def test_delay_bounds_and_budget(self):
+        """Test backoff grows, is capped, keeps jitter in the upper half, and stops at max_retries"""
+        policy = RetryPolicy(max_retries=2, base_delay=2, max_delay=5)
+        for retries, backoff in [(0, 2), (1, 4), (4, 5)]:
+            delay = policy.delay(retries)
+            self.assertTrue(backoff / 2 <= delay <= backoff)
+        self.assertTrue(policy.should_retry('timeout', 1))
+        self.assertFalse(policy.should_retry('timeout', 2))
+        self.assertFalse(policy.should_retry('login_wall', 0))
+    
+    def test_classification(self):
+        """Test exceptions and stats map to error kinds"""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        self.assertEqual(classify_exception(TimeoutException()), 'timeout')
+        self.assertEqual(classify_exception(WebDriverException('invalid session id')), 'browser_crash')
+        self.assertEqual(classify_exception(LoginWallError('login')), 'login_wall')
+        self.assertEqual(classify_stats(SocialMediaStats(platform='youtube', url='u')), 'element_missing')
+        self.assertEqual(classify_stats(SocialMediaStats(platform='youtube', url='u', error='Timeout: slow')), 'timeout')
+        self.assertIsNone(classify_stats(self._ok()))
+    
+    @patch('scrapers.base_scraper.time.sleep')
+    def test_retries_timeout_then_succeeds(self, mock_sleep):
+        """Test a timeout is retried and the attempt count and duration are recorded"""
+        timeout = SocialMediaStats(platform='youtube', url='u', error='Timeout: slow', error_type='timeout')
+        scraper = self._scraper([timeout, self._ok()])
+        stats = scraper.scrape_with_retry('u', RetryPolicy(max_retries=3, base_delay=1))
+        
+        self.assertEqual(stats.views, 10)
+        self.assertIsNone(stats.error_type)
+        self.assertEqual(stats.retry_count, 1)
+        self.assertIsNotNone(stats.scrape_time)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertIn('retry_count', stats.to_dict())
+    
+    @patch('scrapers.base_scraper.time.sleep')
+    def test_login_wall_fails_fast(self, mock_sleep):
+        """Test non-retryable errors return after a single attempt"""
+        scraper = self._scraper([LoginWallError('login required')])
+        stats = scraper.scrape_with_retry('u', RetryPolicy(max_retries=3, base_delay=1))
+        
+        self.assertEqual(stats.error_type, 'login_wall')
+        self.assertEqual(stats.retry_count, 0)
+        self.assertEqual(scraper.scrape.call_count, 1)
+        mock_sleep.assert_not_called()
+    
+    @patch('scrapers.base_scraper.time.sleep')
+    def test_browser_crash_restarts_driver(self, mock_sleep):
+        """Test a dead browser session is replaced before retrying, and the budget is respected"""
+        from selenium.common.exceptions import InvalidSessionIdException
+        scraper = self._scraper([InvalidSessionIdException('gone'), self._ok()])
+        stats = scraper.scrape_with_retry('u', RetryPolicy(max_retries=1, base_delay=1))
+        self.assertEqual(stats.views, 10)
+        scraper.restart_driver.assert_called_once()
+        
+        empty = SocialMediaStats(platform='youtube', url='u')
+        scraper = self._scraper([empty, empty])
+        stats = scraper.scrape_with_retry('u', RetryPolicy(max_retries=1, base_delay=1))
+        self.assertEqual(stats.error_type, 'element_missing')
+        self.assertEqual(stats.error, 'No metrics found on page')
+        self.assertEqual(stats.retry_count, 1)
+
+class TestPageState(unittest.TestCase):
+    """Test early detection of login walls, captchas and consent pages"""
+    
+    def _scraper(self, cls, states, current_url='https://www.facebook.com/login/'):
+        scraper = cls(headless=True)
+        scraper.driver = Mock()
+        scraper.driver.current_url = current_url
+        scraper.driver.execute_script.side_effect = states
+        return scraper
+    
+    def test_script_carries_platform_markers(self):
+        """Test the page-state script embeds the scraper's markers and every marker key"""
+        script = page_state_script(FacebookScraper.PAGE_STATE_MARKERS)
+        self.assertIn('login.php', script)
+        self.assertIn('"consent_urls": []', script)
+    
+    def test_login_wall_and_captcha_raise(self):
+        """Test blocked states raise their typed errors"""
+        with self.assertRaises(LoginWallError):
+            self._scraper(FacebookScraper, ['login_wall']).check_page_state()
+        with self.assertRaises(CaptchaError):
+            self._scraper(TikTokScraper, ['captcha']).check_page_state()
+        self.assertFalse(self._scraper(TikTokScraper, [None]).check_page_state())
+    
+    @patch('scrapers.base_scraper.time.sleep')
+    def test_consent_is_dismissed_once(self, mock_sleep):
+        """Test a dismissed consent dialog continues, one that stays raises"""
+        self.assertTrue(self._scraper(YouTubeScraper, ['consent_dismissed', None]).check_page_state())
+        with self.assertRaises(ConsentWallError):
+            self._scraper(YouTubeScraper, ['consent_dismissed', 'consent_dismissed']).check_page_state()
+    
+    @patch('scrapers.facebook_scraper.time.sleep')
+    def test_facebook_login_redirect_skips_waits(self, mock_sleep):
+        """Test Facebook returns a login_wall error without waiting for main content"""
+        scraper = self._scraper(FacebookScraper, ['login_wall'])
+        scraper.network_capture = None
+        scraper.wait_for_element = Mock()
+        
+        stats = scraper.scrape('https://www.facebook.com/watch/?v=123')
+        
+        self.assertEqual(stats.error_type, 'login_wall')
+        self.assertIn('Login required', stats.error)
+        scraper.wait_for_element.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    def test_login_prompt_with_main_content_is_not_a_wall(self):
+        """Test a login form rendered before [role="main"] is not classified once the content appears"""
+        from selenium.common.exceptions import TimeoutException
+        self.assertIn("return 'login_prompt'", page_state_script(FacebookScraper.PAGE_STATE_MARKERS))
+        
+        # The form matched the combined wait first; the main content follows on the same page
+        scraper = self._scraper(FacebookScraper, ['login_prompt'], 'https://www.facebook.com/watch/?v=123')
+        scraper.wait_for_element = Mock()
+        scraper.wait_for_content('[role="main"]', timeout=10)
+        self.assertEqual(scraper.wait_for_element.call_args.args[1], '[role="main"]')
+        self.assertFalse(self._scraper(FacebookScraper, ['login_prompt'],
+                                       'https://www.facebook.com/watch/?v=123').check_page_state(content_pending=True))
+        
+        # Form and main content both present when classified: the script reports a normal page
+        scraper = self._scraper(FacebookScraper, [None], 'https://www.facebook.com/watch/?v=123')
+        scraper.wait_for_element = Mock()
+        scraper.wait_for_content('[role="main"]', timeout=10)
+        scraper.wait_for_element.assert_called_once()
+        
+        # Only the form, even at the end of the wait: a real login wall
+        scraper = self._scraper(FacebookScraper, ['login_prompt'], 'https://www.facebook.com/watch/?v=123')
+        scraper.wait_for_element = Mock(side_effect=[None, TimeoutException()])
+        with self.assertRaises(LoginWallError):
+            scraper.wait_for_content('[role="main"]', timeout=10)
+        with self.assertRaises(LoginWallError):
+            self._scraper(FacebookScraper, ['login_prompt']).check_page_state()
+    
+    @patch('scrapers.facebook_scraper.time.sleep')
+    def test_facebook_listing_waits_out_login_prompt(self, mock_sleep):
+        """Test a page tab whose login form renders before the grid is still walked"""
+        scraper = self._scraper(FacebookScraper, None, 'https://www.facebook.com/somepage/videos')
+        scraper.locale = None
+        scraper.driver.title = 'Some Page | Facebook'
+        scraper.network_capture = Mock()
+        scraper.network_capture.json_bodies.return_value = []
+        scraper.wait_for_element = Mock()
+        states = iter(['login_prompt', 'login_prompt'])
+        page_data = {'payloads': ['{"video": {"__typename": "Video", "id": "333", "play_count": 7}}'], 'links': []}
+        scraper.driver.execute_script.side_effect = lambda *args: next(states, page_data)
+        
+        results = scraper.scrape_listing('https://www.facebook.com/somepage')
+        
+        self.assertEqual(scraper.wait_for_element.call_args_list[-1].args[1], '[role="main"]')
+        self.assertEqual([r.views for r in results], [7])
+
+class TestLocalePinning(unittest.TestCase):
+    """Test locale-pinned navigation and single-language extraction"""
+    
+    def test_pin_url_per_platform(self):
+        """Test each platform gets its locale parameters without overriding the URL's own"""
+        self.assertEqual(pin_url('https://www.youtube.com/watch?v=abc', 'youtube', 'en-US'),
+                         'https://www.youtube.com/watch?v=abc&hl=en&gl=US')
+        self.assertEqual(pin_url('https://www.youtube.com/watch?v=abc&hl=id', 'youtube', 'en-US'),
+                         'https://www.youtube.com/watch?v=abc&hl=id&gl=US')
+        self.assertEqual(pin_url('https://www.tiktok.com/@user/video/1', 'tiktok', 'en_US'),
+                         'https://www.tiktok.com/@user/video/1?lang=en')
+        self.assertIn('locale=en_US', pin_url('https://www.facebook.com/watch/?v=1', 'facebook', 'en-US'))
+        self.assertEqual(accept_language('en-US'), 'en-US,en;q=0.9')
+    
+    def test_metric_words_fall_back_to_all_languages(self):
+        """Test a known page language narrows the words, an unknown one keeps every language"""
+        self.assertEqual(metric_words('views', 'en'), ('view',))
+        self.assertIn('ditonton', metric_words('views'))
+        self.assertIn('view', metric_words('views', 'fr'))
+    
+    def test_navigate_pins_and_detects_language(self):
+        """Test navigation pins the URL, stores cookies once and narrows extraction to the page language"""
+        scraper = YouTubeScraper(headless=True)
+        scraper.locale = 'en-US'
+        scraper.driver = Mock()
+        scraper.driver.execute_script.return_value = 'en'
+        
+        scraper.navigate('https://www.youtube.com/watch?v=abc')
+        scraper.navigate('https://www.youtube.com/watch?v=def')
+        
+        scraper.driver.get.assert_called_with('https://www.youtube.com/watch?v=def&hl=en&gl=US')
+        scraper.driver.execute_cdp_cmd.assert_called_once()
+        self.assertEqual(scraper.page_language, 'en')
+        self.assertNotIn('ditonton', scraper._xpath_contains_any('text()', 'views'))
+        
+        scraper.driver.execute_script.return_value = 'id-ID'
+        scraper.navigate('https://www.youtube.com/watch?v=ghi')
+        self.assertIsNone(scraper.page_language)
+        self.assertIn('ditonton', scraper._xpath_contains_any('text()', 'views'))
+    
+    def test_unpinned_navigation_is_unchanged(self):
+        """Test no locale keeps the URL as given and skips language detection"""
+        scraper = TikTokScraper(headless=True)
+        scraper.locale = None
+        scraper.driver = Mock()
+        
+        scraper.navigate('https://www.tiktok.com/@user/video/1')
+        
+        scraper.driver.get.assert_called_once_with('https://www.tiktok.com/@user/video/1')
+        scraper.driver.execute_script.assert_not_called()
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    """Test timeouts derived from rolling per-platform latency"""
+    
+    def setUp(self):
+        latency_tracker.reset()
+    
+    def tearDown(self):
+        latency_tracker.reset()
+    
+    def test_percentiles_and_bounds(self):
+        """Test p95-based timeouts stay on the fixed default until sampled, then within bounds"""
+        tracker = LatencyTracker(window=20, min_samples=5)
+        self.assertEqual(tracker.timeout('youtube', 'page', 30), 30)
+        
+        for seconds in [1, 2, 2, 3, 4]:
+            tracker.record('youtube', 'page', seconds)
+        stats = tracker.percentiles('youtube', 'page')
+        self.assertEqual((stats['p50'], stats['p95']), (2, 4))
+        with patch.object(Config, 'TIMEOUT_MIN', 5), patch.object(Config, 'TIMEOUT_MAX', 60), \
+             patch.object(Config, 'TIMEOUT_P95_MULTIPLIER', 1.5), patch.object(Config, 'ADAPTIVE_TIMEOUTS', True):
+            self.assertEqual(tracker.timeout('youtube', 'page', 30), 6.0)
+            
+            # A degraded platform (timeouts recorded at their limit) gets more slack, up to the cap
+            for _ in range(20):
+                tracker.record('youtube', 'page', 45)
+            self.assertEqual(tracker.timeout('youtube', 'page', 30), 60)
+        
+        with patch.object(Config, 'ADAPTIVE_TIMEOUTS', False):
+            self.assertEqual(tracker.timeout('youtube', 'page', 30), 30)
+    
+    def test_navigation_records_latency_and_updates_driver(self):
+        """Test navigation feeds the tracker and only resends the timeout when it changes"""
+        scraper = TikTokScraper(headless=True)
+        scraper.locale = None
+        scraper.driver = Mock()
+        
+        with patch.object(Config, 'ADAPTIVE_TIMEOUTS', True), patch.object(Config, 'TIMEOUT_MIN', 5):
+            for _ in range(6):
+                scraper.navigate('https://www.tiktok.com/@user/video/1')
+        
+        timeouts = [c.args[0] for c in scraper.driver.set_page_load_timeout.call_args_list]
+        self.assertEqual(timeouts, [45, 5])
+        self.assertEqual(latency_tracker.percentiles('tiktok', 'page')['samples'], 6)
+    
+    @patch('scrapers.youtube_scraper.time.sleep')
+    def test_youtube_element_waits_are_adaptive(self, mock_sleep):
+        """Test the Shorts container and title waits use and feed their own tracker stages"""
+        scraper = YouTubeScraper(headless=True)
+        scraper.wait_for_element = Mock()
+        
+        with patch.object(latency_tracker, 'timeout', side_effect=lambda platform, stage, default: default + 0.5):
+            scraper._wait_for_shorts_load()
+            scraper.wait_for_stage('title', 'css selector', 'h1')
+        
+        self.assertEqual([c.args[2] for c in scraper.wait_for_element.call_args_list], [5.5, 5.5])
+        self.assertEqual(latency_tracker.percentiles('youtube', 'shorts')['samples'], 1)
+        self.assertEqual(latency_tracker.percentiles('youtube', 'title')['samples'], 1)
+        
+        from selenium.common.exceptions import TimeoutException
+        scraper.wait_for_element = Mock(side_effect=TimeoutException())
+        with self.assertRaises(TimeoutException):
+            scraper.wait_for_stage('title', 'css selector', 'h1')
+        self.assertEqual(latency_tracker.percentiles('youtube', 'title')['p95'], 5)
+        self.assertIn('shorts', ScraperFactory.timeout_status()['youtube'])
+    
+    def test_timeout_status_in_health_check(self):
+        """Test the factory reports current timeouts per platform and stage"""
+        status = ScraperFactory.timeout_status()
+        self.assertEqual(status['tiktok']['page']['timeout'], 45)
+        self.assertEqual(status['youtube']['content']['samples'], 0)
+
+class TestHedgedScraping(unittest.TestCase):
+    """Test the HTTP fast path and racing it against the browser path"""
+    
+    class FakeScraper(AsyncScraper):
+        def __init__(self, stats=None, delay=0.0, error=None):
+            super().__init__()
+            self.stats, self.delay, self.error = stats, delay, error
+            self.started = False
+            self.cancelled = False
+        
+        async def scrape(self, url, session=None):
+            self.started = True
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            if self.error:
+                raise self.error
+            return self.stats
+    
+    def _stats(self, **fields):
+        return SocialMediaStats(platform='youtube', url='u', **fields)
+    
+    def test_html_payloads(self):
+        """Test JSON is read from script assignments and hydration script tags"""
+        html = ('<script>var ytInitialPlayerResponse = {"videoDetails": {"viewCount": "7"}};var x = 1;</script>'
+                '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{"a": 1}</script>')
+        payloads = html_payloads(html)
+        self.assertIn({'videoDetails': {'viewCount': '7'}}, payloads)
+        self.assertIn({'a': 1}, payloads)
+    
+    def test_http_extractor_uses_payload_parsers(self):
+        """Test the HTTP path fills stats from the embedded player response"""
+        player = json.dumps({'videoDetails': {'videoId': 'dQw4w9WgXcQ', 'viewCount': '4321', 'title': 'Song'}})
+        response = Mock(url='https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+                        text=f'<script>var ytInitialPlayerResponse = {player};</script>')
+        extractor = HttpExtractor()
+        extractor._fetch = Mock(return_value=response)
+        
+        stats = asyncio.run(extractor.scrape('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        
+        self.assertEqual((stats.views, stats.title), (4321, 'Song'))
+        self.assertIsNone(stats.error)
+    
+    def test_complete_fast_result_skips_browser(self):
+        """Test a complete HTTP answer inside the hedge delay never starts the browser"""
+        fast = self.FakeScraper(self._stats(views=1, likes=2))
+        slow = self.FakeScraper(self._stats(views=9, likes=9))
+        
+        stats = asyncio.run(HedgedScraper(fast, slow, hedge_delay=0.5).scrape('u'))
+        
+        self.assertEqual(stats.views, 1)
+        self.assertFalse(slow.started)
+    
+    def test_browser_wins_when_http_is_slow_and_loser_is_cancelled(self):
+        """Test the first complete result wins and the other path is cancelled"""
+        fast = self.FakeScraper(self._stats(views=1, likes=2), delay=1.0)
+        slow = self.FakeScraper(self._stats(views=9, likes=9), delay=0.01)
+        
+        stats = asyncio.run(HedgedScraper(fast, slow, hedge_delay=0).scrape('u'))
+        
+        self.assertEqual(stats.views, 9)
+        self.assertTrue(fast.cancelled)
+    
+    def test_incomplete_results_pick_most_filled(self):
+        """Test an incomplete HTTP answer waits for the browser, falling back to the fuller result"""
+        fast = self.FakeScraper(self._stats(views=1))
+        slow = self.FakeScraper(error=RuntimeError('browser died'), delay=0.01)
+        self.assertEqual(asyncio.run(HedgedScraper(fast, slow, hedge_delay=0).scrape('u')).views, 1)
+        
+        slow = self.FakeScraper(self._stats(views=9, comments=3), delay=0.01)
+        stats = asyncio.run(HedgedScraper(self.FakeScraper(self._stats(views=1)), slow, hedge_delay=0).scrape('u'))
+        self.assertEqual(stats.views, 9)
+
+class TestNegativeCache(unittest.TestCase):
+    """Test skipping deleted, private and login-walled URLs"""
+    
+    def _dead(self, url='https://www.youtube.com/watch?v=dQw4w9WgXcQ', error_type='unavailable'):
+        return SocialMediaStats(platform='youtube', url=url, error='Video unavailable', error_type=error_type)
+    
+    def test_canonical_id_keeps_case_and_merges_url_forms(self):
+        """Test every URL form of a video shares one key"""
+        self.assertEqual(URLDetector.canonical_id('https://youtu.be/dQw4w9WgXcQ'), 'youtube:dQw4w9WgXcQ')
+        self.assertEqual(URLDetector.canonical_id('https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10'), 'youtube:dQw4w9WgXcQ')
+        self.assertIsNone(URLDetector.canonical_id('not a url'))
+    
+    def test_record_lookup_and_ttl(self):
+        """Test cached classes are served until their re-check time; transient ones are not cached"""
+        cache = NegativeCache(ttls={'unavailable': 60, 'private': 0})
+        self.assertTrue(cache.record(self._dead()))
+        self.assertFalse(cache.record(self._dead('https://youtu.be/aaaaaaaaaaa', 'timeout')))
+        self.assertFalse(cache.record(self._dead('https://youtu.be/bbbbbbbbbbb', 'private')))
+        
+        cached = cache.lookup('https://youtu.be/dQw4w9WgXcQ')
+        self.assertEqual((cached.error_type, cached.cache), ('unavailable', 'negative'))
+        self.assertIsNone(cache.lookup('https://youtu.be/aaaaaaaaaaa'))
+        
+        with patch('scrapers.negative_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.lookup('https://youtu.be/dQw4w9WgXcQ'))
+    
+    def test_success_clears_entry(self):
+        """Test a URL that works again is removed from the cache"""
+        cache = NegativeCache(ttls={'login_wall': 60})
+        cache.record(self._dead(error_type='login_wall'))
+        cache.record(SocialMediaStats(platform='youtube', url='https://youtu.be/dQw4w9WgXcQ', views=5))
+        self.assertIsNone(cache.lookup('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+    
+    def test_scrape_many_skips_known_dead_urls(self):
+        """Test batches answer cached URLs without scraping them"""
+        cache = NegativeCache(ttls={'unavailable': 60})
+        cache.record(self._dead())
+        scraper = TestAsyncScraper.EchoScraper(max_concurrency=2)
+        scraper.scrape = AsyncMock(side_effect=lambda url, session=None: SocialMediaStats(platform='youtube', url=url, views=1))
+        
+        with patch('scrapers.negative_cache.get_negative_cache', return_value=cache):
+            results = scraper.scrape_many_sync(['https://youtu.be/dQw4w9WgXcQ', 'https://youtu.be/ccccccccccc'])
+        
+        self.assertEqual(results[0].cache, 'negative')
+        self.assertEqual(results[1].views, 1)
+        scraper.scrape.assert_awaited_once()
+    
+    def test_payload_markers_raise_typed_errors(self):
+        """Test deleted and private videos are recognised from page JSON"""
+        youtube = YouTubeScraper(headless=True)
+        with self.assertRaises(UnavailableError):
+            youtube.raise_for_payloads([{'playabilityStatus': {'status': 'ERROR', 'reason': 'Video unavailable'}}])
+        with self.assertRaises(PrivateContentError):
+            youtube.raise_for_payloads([{'playabilityStatus': {'status': 'LOGIN_REQUIRED', 'reason': 'Private video'}}])
+        with self.assertRaises(LoginWallError):
+            youtube.raise_for_payloads([{'playabilityStatus': {'status': 'LOGIN_REQUIRED', 'desktopLegacyAgeGateReason': 1}}])
+        youtube.raise_for_payloads([{'playabilityStatus': {'status': 'OK'}}])
+        
+        tiktok = TikTokScraper(headless=True)
+        with self.assertRaises(UnavailableError):
+            tiktok.raise_for_payloads([{'__DEFAULT_SCOPE__': {'webapp.video-detail': {'statusCode': 10204, 'statusMsg': 'item doesn\'t exist'}}}])
+        tiktok.raise_for_payloads([{'webapp.video-detail': {'statusCode': 0, 'itemInfo': {}}}])
+
+class TestResultCache(unittest.TestCase):
+    """Test reusing recent scrape results by canonical video ID"""
+    
+    URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    
+    def _stats(self, url=URL, **fields):
+        return SocialMediaStats(platform='youtube', url=url, **fields)
+    
+    def test_put_and_get_across_url_forms(self):
+        """Test a stored result is served for any URL of the same video"""
+        cache = ResultCache(freshness={'counts': 60, 'metadata': 60})
+        self.assertTrue(cache.put(self._stats(views=10, likes=2, title='Never')))
+        self.assertFalse(cache.put(self._stats('https://youtu.be/aaaaaaaaaaa', error='Timeout')))
+        self.assertFalse(cache.put(self._stats('https://youtu.be/bbbbbbbbbbb', title='No counts')))
+        
+        cached = cache.get('https://youtu.be/dQw4w9WgXcQ')
+        self.assertEqual((cached.views, cached.likes, cached.title, cached.cache), (10, 2, 'Never', 'hit'))
+        self.assertEqual(cached.url, 'https://youtu.be/dQw4w9WgXcQ')
+        self.assertIsNotNone(cached.scraped_at)
+        self.assertIsNone(cache.get('https://youtu.be/aaaaaaaaaaa'))
+    
+    def test_field_group_freshness_and_max_age(self):
+        """Test counts expire before metadata and max_age overrides the limits"""
+        cache = ResultCache(freshness={'counts': 60, 'metadata': 3600})
+        cache.put(self._stats(views=10, title='Never'))
+        
+        with patch('scrapers.result_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get(self.URL))
+            self.assertEqual(cache.get(self.URL, fields=['title']).title, 'Never')
+            self.assertEqual(cache.get(self.URL, max_age=300).views, 10)
+    
+    def test_newer_scrape_keeps_missing_groups(self):
+        """Test a counts-only scrape does not wipe cached metadata"""
+        cache = ResultCache(freshness={'counts': 60, 'metadata': 60})
+        cache.put(self._stats(views=10, title='Never'))
+        cache.put(self._stats(views=20))
+        
+        cached = cache.get(self.URL)
+        self.assertEqual((cached.views, cached.title), (20, 'Never'))
+    
+    def test_empty_field_group_is_not_fresh(self):
+        """Test a scrape without metadata does not make a metadata lookup a hit"""
+        cache = ResultCache(freshness={'counts': 60, 'metadata': 60})
+        cache.put(self._stats(views=10))
+        
+        self.assertIsNone(cache.get(self.URL, fields=['title', 'author']))
+        self.assertEqual(cache.get(self.URL, fields=['views']).views, 10)
+        self.assertEqual(cache.get(self.URL).views, 10)
+        
+        cache.put(self._stats(views=11, title='Found later'))
+        self.assertEqual(cache.get(self.URL, fields=['title']).title, 'Found later')
+    
+    def test_lru_eviction_falls_back_to_sqlite(self):
+        """Test entries evicted from memory are still read from SQLite"""
+        cache = ResultCache(memory_size=1, freshness={'counts': 60, 'metadata': 60})
+        cache.put(self._stats(views=10))
+        cache.put(self._stats('https://youtu.be/ccccccccccc', views=30))
+        
+        self.assertEqual(list(cache._memory), ['youtube:ccccccccccc'])
+        self.assertEqual(cache.get(self.URL).views, 10)
+        self.assertEqual(list(cache._memory), ['youtube:dQw4w9WgXcQ'])
+        
+        cache.invalidate(self.URL)
+        self.assertIsNone(cache.get(self.URL))
+    
+    def test_scrape_sync_served_from_cache(self):
+        """Test a cached URL is answered without scraping, and a later scrape refreshes it"""
+        cache = ResultCache(freshness={'counts': 60, 'metadata': 60})
+        scraper = TestAsyncScraper.EchoScraper(max_concurrency=2)
+        scraper.scrape = AsyncMock(side_effect=lambda url, session=None: self._stats(url, views=1))
+        
+        with patch('scrapers.result_cache.get_result_cache', return_value=cache):
+            first = scraper.scrape_sync(self.URL)
+            second = scraper.scrape_sync('https://youtu.be/dQw4w9WgXcQ')
+            batch = scraper.scrape_many_sync([self.URL, 'https://youtu.be/ccccccccccc'], max_age=0)
+        
+        self.assertIsNone(first.cache)
+        self.assertEqual((second.views, second.cache), (1, 'hit'))
+        self.assertEqual([stats.cache for stats in batch], [None, None])
+        self.assertEqual(scraper.scrape.await_count, 3)
+
+class TestSingleFlight(unittest.TestCase):
+    """Test coalescing concurrent scrapes of the same video"""
+    
+    def _scraper(self, delay=0.2):
+        scraper = TestAsyncScraper.EchoScraper(max_concurrency=4)
+        
+        async def slow_scrape(url, session=None):
+            await asyncio.sleep(delay)
+            return SocialMediaStats(platform='youtube', url=url, views=7)
+        
+        scraper.scrape = AsyncMock(side_effect=slow_scrape)
+        return scraper
+    
+    def test_threads_share_one_scrape(self):
+        """Test callers in separate threads and event loops get one scrape's result"""
+        import concurrent.futures
+        scraper = self._scraper()
+        urls = ['https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'https://youtu.be/dQw4w9WgXcQ', 'https://youtu.be/dQw4w9WgXcQ']
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(scraper.scrape_sync, urls))
+        
+        self.assertEqual(scraper.scrape.await_count, 1)
+        self.assertEqual([r.views for r in results], [7, 7, 7])
+        self.assertEqual(sorted(str(r.cache) for r in results), ['None', 'shared', 'shared'])
+        self.assertEqual([r.url for r in results], urls)
+    
+    def test_duplicate_urls_in_batch(self):
+        """Test a batch scrapes each video once and keeps input order"""
+        scraper = self._scraper(delay=0.05)
+        urls = ['https://youtu.be/dQw4w9WgXcQ', 'https://youtu.be/ccccccccccc', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ']
+        
+        results = scraper.scrape_many_sync(urls)
+        
+        self.assertEqual(scraper.scrape.await_count, 2)
+        self.assertEqual([r.url for r in results], urls)
+        self.assertEqual(results[2].cache, 'shared')
+    
+    def test_cancelled_leader_hands_over(self):
+        """Test followers of a cancelled leader run the work themselves"""
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'done'
+        
+        async def scenario():
+            leader = asyncio.ensure_future(flight.run('k', work))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(flight.run('k', work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+        
+        self.assertEqual(asyncio.run(scenario()), ('done', False))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.in_flight(), [])
+    
+    def test_errors_reach_followers(self):
+        """Test an exception in the leader is raised for every waiting caller"""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.02)
+            raise ValueError('boom')
+        
+        async def scenario():
+            return await asyncio.gather(flight.run('k', work), flight.run('k', work), return_exceptions=True)
+        
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+class TestRevalidator(unittest.TestCase):
+    """Test serving stale results while refreshing them in the background"""
+    
+    URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    
+    def setUp(self):
+        import threading
+        self.cache = ResultCache(freshness={'counts': 60, 'metadata': 3600})
+        self.cache.put(SocialMediaStats(platform='youtube', url=self.URL, views=10, title='Never'))
+        self.release = threading.Event()
+        
+        scraper = TestAsyncScraper.EchoScraper()
+        
+        async def fresh_scrape(url, session=None):
+            await asyncio.to_thread(self.release.wait, 5)
+            return SocialMediaStats(platform='youtube', url=url, views=99)
+        
+        scraper.scrape = AsyncMock(side_effect=fresh_scrape)
+        self.scraper = scraper
+        self.revalidator = Revalidator(scraper_factory=lambda: scraper)
+        patcher = patch('scrapers.result_cache.get_result_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        revalidate_patcher = patch('scrapers.revalidate.get_result_cache', return_value=self.cache)
+        revalidate_patcher.start()
+        self.addCleanup(revalidate_patcher.stop)
+    
+    def test_allow_stale_marks_expired_entries(self):
+        """Test expired entries are only returned on request, marked stale"""
+        with patch('scrapers.result_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get(self.URL))
+            stale = self.cache.get(self.URL, allow_stale=True)
+        self.assertEqual((stale.views, stale.cache), (10, 'stale'))
+        self.assertEqual(self.cache.get(self.URL, allow_stale=True).cache, 'hit')
+    
+    def test_fresh_entry_is_not_refreshed(self):
+        """Test fresh results are served without a background scrape"""
+        self.assertEqual(self.revalidator.get(self.URL).cache, 'hit')
+        self.assertEqual(self.revalidator.pending(), 0)
+    
+    def test_stale_served_now_and_refreshed_once(self):
+        """Test stale stats return at once, one refresh runs and its values are pushed and cached"""
+        updates = []
+        with patch('scrapers.result_cache.time.time', return_value=time.time() + 120):
+            first = self.revalidator.get(self.URL, on_update=updates.append)
+            data = {'views': 10}
+            self.revalidator.apply(data, 'https://youtu.be/dQw4w9WgXcQ')
+        
+        self.assertEqual((first.views, first.cache), (10, 'stale'))
+        self.assertEqual(data['cache'], 'stale')
+        self.assertIsNotNone(age_seconds(data['scraped_at']))
+        self.assertEqual(self.revalidator.pending(), 1)
+        
+        future = self.revalidator.refresh(self.URL)
+        self.release.set()
+        future.result(timeout=5)
+        # Done-callbacks may still be running right after result() returns
+        deadline = time.time() + 5
+        while (self.revalidator.pending() or not updates) and time.time() < deadline:
+            time.sleep(0.01)
+        
+        self.assertEqual(self.scraper.scrape.await_count, 1)
+        self.assertEqual([stats.views for stats in updates], [99])
+        self.assertEqual(self.revalidator.pending(), 0)
+        self.assertEqual((self.cache.get(self.URL).views, self.cache.get(self.URL).title), (99, 'Never'))
+
+class TestResponseCache(unittest.TestCase):
+    """Test caching Ollama responses by model, prompt and options"""
+    
+    def _service(self, cache):
+        service = OllamaService(response_cache=cache)
+        response = Mock(status_code=200)
+        response.json.return_value = {'response': 'Engagement is strong'}
+        service.session.post = Mock(return_value=response)
+        return service
+    
+    def test_key_depends_on_model_prompt_and_options(self):
+        """Test equal calls share a key and any difference changes it"""
+        key = response_key('llama2', 'prompt', {'temperature': 0, 'seed': 1})
+        self.assertEqual(key, response_key('llama2', 'prompt', {'seed': 1, 'temperature': 0}))
+        self.assertNotEqual(key, response_key('mistral', 'prompt', {'temperature': 0, 'seed': 1}))
+        self.assertNotEqual(key, response_key('llama2', 'prompt', {'temperature': 0.7, 'seed': 1}))
+        self.assertNotEqual(key, response_key('llama2', 'other prompt', {'temperature': 0, 'seed': 1}))
+    
+    def test_repeat_analysis_served_from_cache(self):
+        """Test an unchanged analysis prompt reaches Ollama once and is counted as a hit"""
+        cache = ResponseCache(ttl=60)
+        service = self._service(cache)
+        stats = {'platform': 'youtube', 'views': 1000, 'likes': 50}
+        
+        first = service.analyze_social_media_data(stats)
+        second = service.analyze_social_media_data(dict(stats))
+        service.analyze_social_media_data({**stats, 'views': 2000})
+        
+        self.assertEqual(first, second)
+        self.assertEqual(service.session.post.call_count, 2)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 2))
+    
+    def test_errors_are_not_cached(self):
+        """Test failed calls are retried next time"""
+        cache = ResponseCache(ttl=60)
+        service = self._service(cache)
+        service.session.post.return_value = Mock(status_code=500, text='boom')
+        
+        self.assertTrue(service.generate_response('prompt').startswith('Error'))
+        self.assertTrue(service.generate_response('prompt').startswith('Error'))
+        self.assertEqual(service.session.post.call_count, 2)
+        self.assertEqual(cache.stats()['size'], 0)
+    
+    def test_ttl_and_lru_eviction_with_disk_tier(self):
+        """Test expiry, memory eviction and reloading evicted entries from SQLite"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, 'llm.db'), memory_size=1, ttl=60)
+            cache.put('a', 'first')
+            cache.put('b', 'second')
+            
+            self.assertEqual(cache.stats()['evictions'], 1)
+            self.assertEqual(cache.get('a'), 'first')
+            with patch('services.response_cache.time.time', return_value=time.time() + 120):
+                self.assertIsNone(cache.get('b'))
+            cache._db.close()
+        
+        memory_only = ResponseCache(memory_size=1, ttl=60)
+        memory_only.put('a', 'first')
+        memory_only.put('b', 'second')
+        self.assertIsNone(memory_only.get('a'))
+
+class TestAnalysisStage(unittest.TestCase):
+    """Test running LLM analysis as a bounded, overlapping batch stage"""
+    
+    class SlowOllama:
+        def __init__(self, delay=0.05):
+            import threading
+            self.delay = delay
+            self.lock = threading.Lock()
+            self.active = 0
+            self.peak = 0
+            self.started = []
+        
+        def analyze_social_media_data(self, stats_data):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                self.started.append((stats_data['url'], time.perf_counter()))
+            time.sleep(self.delay)
+            with self.lock:
+                self.active -= 1
+            return f"analysis of {stats_data['url']}"
+    
+    def test_map_keeps_order_and_bounds_concurrency(self):
+        """Test analyses come back in input order with at most max_workers running"""
+        import concurrent.futures
+        ollama = self.SlowOllama()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            analyses = AnalysisStage(ollama, executor).map([{'url': f'u{i}'} for i in range(5)])
+        
+        self.assertEqual(analyses, [f'analysis of u{i}' for i in range(5)])
+        self.assertEqual(ollama.peak, 2)
+    
+    def test_batch_analysis_overlaps_scraping(self):
+        """Test analysis of early URLs starts before the last scrape finishes"""
+        import concurrent.futures
+        from services.crew_service import CrewService
+        
+        finished = {}
+        
+        class StaggeredScraper(TestAsyncScraper.EchoScraper):
+            async def scrape(self, url, session=None):
+                await asyncio.sleep(0.3 if url.endswith('ccccccccccc') else 0.01)
+                finished[url] = time.perf_counter()
+                return SocialMediaStats(platform='youtube', url=url, views=1)
+        
+        service = CrewService.__new__(CrewService)
+        service.ollama_service = self.SlowOllama()
+        urls = ['https://youtu.be/aaaaaaaaaaa', 'https://youtu.be/ccccccccccc', 'https://youtu.be/bbbbbbbbbbb']
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor, \
+                patch('services.crew_service.AnalysisStage', side_effect=lambda ollama: AnalysisStage(ollama, executor)), \
+                patch('scrapers.ScraperFactory.create_async_scraper', return_value=StaggeredScraper(max_concurrency=3)), \
+                patch.object(service.ollama_service, 'compare_platforms', create=True, return_value='comparison'):
+            results = service.analyze_multiple_urls(urls)
+        
+        analyses = [r['analysis'] for r in results['individual_results']]
+        self.assertEqual(analyses, [f'analysis of {url}' for url in urls])
+        first_analysis = min(started for _, started in service.ollama_service.started)
+        self.assertLess(first_analysis, finished['https://youtu.be/ccccccccccc'])
+    
+    def test_partial_scrapes_are_analysed_and_successful(self):
+        """Test a scrape with some counts and an error is analysed; one without counts is not"""
+        import concurrent.futures
+        from services.crew_service import CrewService
+        
+        class PartialScraper(TestAsyncScraper.EchoScraper):
+            async def scrape(self, url, session=None):
+                if url.endswith('aaaaaaaaaaa'):
+                    return SocialMediaStats(platform='youtube', url=url, views=5, error='Likes not found')
+                return SocialMediaStats(platform='youtube', url=url, error='Timeout loading page')
+        
+        service = CrewService.__new__(CrewService)
+        service.ollama_service = self.SlowOllama(delay=0)
+        urls = ['https://youtu.be/aaaaaaaaaaa', 'https://youtu.be/bbbbbbbbbbb']
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor, \
+                patch('services.crew_service.AnalysisStage', side_effect=lambda ollama: AnalysisStage(ollama, executor)), \
+                patch('scrapers.ScraperFactory.create_async_scraper', return_value=PartialScraper()):
+            results = service.analyze_multiple_urls(urls)
+        
+        partial, failed = results['individual_results']
+        self.assertEqual((partial['success'], partial['analysis']), (True, 'analysis of https://youtu.be/aaaaaaaaaaa'))
+        self.assertEqual(partial['error'], 'Likes not found')
+        self.assertEqual((failed['success'], failed['analysis']), (False, None))
+        self.assertEqual(results['successful_analyses'], 1)
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test failing fast while Ollama is down, with half-open probing"""
+    
+    def setUp(self):
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: self.now[0])
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test only consecutive failures (connection errors or 5xx) open the circuit"""
+        for outcome in (None, 503, 200, None, 500):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record(outcome)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        
+        self.breaker.record(404)
+        for _ in range(3):
+            self.breaker.record()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()['rejected'], 1)
+        self.assertEqual(self.breaker.stats()['retry_after'], 30)
+    
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test one probe goes out after the reset timeout; its outcome closes or reopens the circuit"""
+        for _ in range(3):
+            self.breaker.record()
+        self.now[0] = 30
+        self.assertFalse(self.breaker.is_open())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+        
+        self.breaker.record(500)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(self.breaker.is_open())
+        self.assertEqual(self.breaker.stats()['opened'], 2)
+        
+        self.now[0] = 60
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(200)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+    
+    def test_malformed_reply_returns_error_text(self):
+        """Test a 200 reply whose body is not JSON comes back as an error result, not an exception"""
+        import httpx
+        service = OllamaService(response_cache=ResponseCache(ttl=60), breaker=self.breaker)
+        service.session.post = Mock(return_value=Mock(status_code=200))
+        service.session.post.return_value.json.side_effect = ValueError('Expecting value')
+        
+        self.assertEqual(service.generate('prompt'),
+                         {'response': 'Error generating response: Expecting value', 'error': True})
+        self.assertTrue(service.analyze_social_media_data({'views': 1}).startswith('Error generating response'))
+        
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text='{"resp')))
+            async with AsyncOllamaService(response_cache=ResponseCache(ttl=60), client=client,
+                                          breaker=self.breaker) as async_service:
+                return await async_service.generate('prompt')
+        
+        self.assertTrue(asyncio.run(run())['error'])
+    
+    def test_service_fails_fast_while_open(self):
+        """Test OllamaService stops posting once the circuit opens and the analysis stage skips at once"""
+        import requests
+        service = OllamaService(response_cache=ResponseCache(ttl=60), breaker=self.breaker)
+        service.session.post = Mock(side_effect=requests.ConnectionError('refused'))
+        
+        answers = [service.analyze_social_media_data({'url': f'u{i}', 'views': i}) for i in range(5)]
+        
+        self.assertEqual(service.session.post.call_count, 3)
+        self.assertIn('refused', answers[0])
+        self.assertEqual(answers[4], 'Error: Ollama unavailable, analysis skipped (retry in 30s)')
+        self.assertTrue(service.analyze_image_with_text('aW1n', 'Describe').startswith('Error: Ollama unavailable'))
+        self.assertEqual(service.health_check()['circuit']['state'], CircuitBreaker.OPEN)
+        
+        executor = Mock()
+        stage = AnalysisStage(service, executor)
+        self.assertIn('analysis skipped', stage.map([{'url': 'u9'}])[0])
+        executor.submit.assert_not_called()
+
+class TestAsyncOllamaService(unittest.TestCase):
+    """Test the asyncio Ollama client over a mocked httpx transport"""
+    
+    def _service(self, handler, **kwargs):
+        import httpx
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return AsyncOllamaService(response_cache=ResponseCache(ttl=60), client=client, **kwargs)
+    
+    def test_generate_uses_endpoint_timeout_and_cache(self):
+        """Test generate_response sends keep_alive, uses the generate timeout and caches the answer"""
+        import httpx
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={'response': 'Async answer', 'load_duration': 2_000_000})
+        
+        async def run():
+            async with self._service(handler) as service:
+                return [await service.generate_response('prompt') for _ in range(2)]
+        
+        self.assertEqual(asyncio.run(run()), ['Async answer', 'Async answer'])
+        self.assertEqual(len(requests_seen), 1)
+        body = json.loads(requests_seen[0].content)
+        self.assertEqual(body['keep_alive'], Config.OLLAMA_KEEP_ALIVE)
+        self.assertEqual(requests_seen[0].extensions['timeout']['read'], Config.OLLAMA_TIMEOUT)
+    
+    def test_errors_returned_as_text(self):
+        """Test HTTP and connection errors come back as error strings like the sync client"""
+        import httpx
+        
+        def handler(request):
+            if request.url.path == '/api/tags':
+                raise httpx.ConnectError('refused')
+            return httpx.Response(500, text='overloaded')
+        
+        async def run():
+            async with self._service(handler) as service:
+                return (await service.generate_response('prompt'), await service.list_models(),
+                        await service.health_check())
+        
+        answer, models, health = asyncio.run(run())
+        self.assertEqual(answer, 'Error: 500 - overloaded')
+        self.assertEqual(models, [])
+        self.assertFalse(health['service_available'])
+    
+    def test_analyze_many_keeps_requests_in_flight(self):
+        """Test batch analyses overlap on one client, bounded by the limit, in input order"""
+        import httpx
+        state = {'active': 0, 'peak': 0}
+        
+        async def handler(request):
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            await asyncio.sleep(0.02)
+            state['active'] -= 1
+            views = json.loads(request.content)['prompt'].split('Views: ')[1].split()[0]
+            return httpx.Response(200, json={'response': f"analysis {views}"})
+        
+        async def run():
+            async with self._service(handler) as service:
+                return await service.analyze_many([{'views': n} for n in range(6)], limit=3)
+        
+        self.assertEqual(asyncio.run(run()), [f"analysis {n}" for n in range(6)])
+        self.assertEqual(state['peak'], 3)
+    
+    def test_image_analysis_and_health_check(self):
+        """Test vision calls pick an installed vision model with the vision timeout"""
+        import httpx
+        
+        def handler(request):
+            if request.url.path == '/api/tags':
+                return httpx.Response(200, json={'models': [{'name': 'llama2'}, {'name': 'llava'}]})
+            if request.url.path == '/api/ps':
+                return httpx.Response(200, json={'models': [{'name': 'llava:latest'}]})
+            body = json.loads(request.content)
+            self.assertEqual((body['model'], body['images']), ('llava', ['aW1n']))
+            self.assertEqual(request.extensions['timeout']['read'], Config.OLLAMA_VISION_TIMEOUT)
+            return httpx.Response(200, json={'response': 'A thumbnail'})
+        
+        async def run():
+            async with self._service(handler, model='llama2') as service:
+                return await service.analyze_image_with_text('aW1n', 'Describe'), await service.health_check()
+        
+        with patch.object(Config, 'OLLAMA_VISION_MODEL', ''):
+            answer, health = asyncio.run(run())
+        self.assertEqual(answer, 'A thumbnail')
+        self.assertTrue(health['model_loaded'])
+        self.assertTrue(health['models']['llava']['resident'])
+        self.assertFalse(health['models']['llama2']['resident'])
+
 class TestOllamaService(unittest.TestCase):
     """Test Ollama service integration"""
     
@@ -173,8 +1777,8 @@ class TestOllamaService(unittest.TestCase):
     
     def test_analyze_social_media_data(self):
         """Test social media data analysis"""
-        with patch.object(self.service, 'generate_response') as mock_generate:
-            mock_generate.return_value = "Analysis result"
+        with patch.object(self.service, 'generate') as mock_generate:
+            mock_generate.return_value = {'response': "Analysis result"}
             
             stats_data = {
                 'platform': 'youtube',
@@ -185,6 +1789,218 @@ class TestOllamaService(unittest.TestCase):
             result = self.service.analyze_social_media_data(stats_data)
             self.assertEqual(result, "Analysis result")
             mock_generate.assert_called_once()
+    
+    def _ndjson_response(self, *messages):
+        response = Mock(status_code=200)
+        response.iter_lines.return_value = [json.dumps(message).encode() for message in messages]
+        return response
+    
+    def test_stream_response_yields_chunks_and_metrics(self):
+        """Test NDJSON chunks are yielded as they arrive with first-token and throughput metrics"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        service.session.post = Mock(return_value=self._ndjson_response(
+            {'response': 'Strong ', 'done': False},
+            {'response': 'engagement.', 'done': False},
+            {'response': '', 'done': True, 'eval_count': 20, 'eval_duration': 2_000_000_000}
+        ))
+        
+        stream = service.stream_response('Test prompt')
+        self.assertEqual(list(stream), ['Strong ', 'engagement.'])
+        self.assertEqual(stream.text, 'Strong engagement.')
+        self.assertEqual((stream.metrics['tokens'], stream.metrics['tokens_per_sec']), (20, 10.0))
+        self.assertIsNotNone(stream.metrics['time_to_first_token'])
+        self.assertTrue(service.session.post.call_args.kwargs['json']['stream'])
+        
+        # A completed stream is cached for both streaming and blocking calls
+        again = service.stream_response('Test prompt')
+        self.assertEqual(list(again), ['Strong engagement.'])
+        self.assertTrue(again.metrics['cached'])
+        self.assertEqual(service.generate_response('Test prompt'), 'Strong engagement.')
+        self.assertEqual(service.session.post.call_count, 1)
+    
+    def test_stream_error_is_reported_and_not_cached(self):
+        """Test an error line ends the stream with an error text that is not cached"""
+        cache = ResponseCache(ttl=60)
+        service = OllamaService(response_cache=cache)
+        service.session.post = Mock(return_value=self._ndjson_response(
+            {'response': 'Partial', 'done': False}, {'error': 'model crashed'}
+        ))
+        
+        stream = service.stream_response('Test prompt')
+        chunks = list(stream)
+        self.assertEqual(chunks[0], 'Partial')
+        self.assertIn('model crashed', chunks[-1])
+        self.assertEqual(cache.stats()['size'], 0)
+    
+    def test_keep_alive_sent_with_every_call(self):
+        """Test generate and stream payloads carry the configured keep_alive"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        service.keep_alive = '45m'
+        service.session.post = Mock(return_value=self._ndjson_response({'response': 'ok', 'done': True}))
+        service.session.post.return_value.json.return_value = {'response': 'ok'}
+        
+        service.generate_response('blocking prompt')
+        list(service.stream_response('streamed prompt'))
+        
+        for call in service.session.post.call_args_list:
+            self.assertEqual(call.kwargs['json']['keep_alive'], '45m')
+    
+    def test_warm_up_and_residency_in_health_check(self):
+        """Test warm-up loads text and vision models and health_check reports residency and load time"""
+        import services.ollama_service as ollama_module
+        self.addCleanup(ollama_module.MODEL_LOAD_TIMES.clear)
+        service = OllamaService(model='llama2')
+        
+        def get(url, timeout=None):
+            response = Mock(status_code=200)
+            if url.endswith('/api/ps'):
+                response.json.return_value = {'models': [{'name': 'llama2:latest'}]}
+            else:
+                response.json.return_value = {'models': [{'name': 'llama2'}, {'name': 'llava'}]}
+            return response
+        
+        warm = Mock(status_code=200)
+        warm.json.return_value = {'response': '', 'done': True, 'load_duration': 4_200_000_000}
+        service.session.get = Mock(side_effect=get)
+        service.session.post = Mock(return_value=warm)
+        
+        report = service.warm_up()
+        self.assertEqual(report, {'llama2': {'loaded': True, 'load_seconds': 4.2},
+                                  'llava': {'loaded': True, 'load_seconds': 4.2}})
+        self.assertEqual([c.kwargs['json']['prompt'] for c in service.session.post.call_args_list], ['', ''])
+        
+        # A later warm call reports a millisecond load, which must not hide the cold load time
+        ollama_module.record_load('llama2', 3_000_000)
+        
+        health = service.health_check()
+        self.assertEqual(health['models']['llama2'], {'resident': True, 'load_seconds': 4.2})
+        self.assertEqual(health['models']['llava'], {'resident': False, 'load_seconds': 4.2})
+    
+    def test_warm_up_in_background_runs_once(self):
+        """Test background warm-up starts a single thread per process"""
+        with patch('services.ollama_service._warm_up_started', False), \
+                patch('services.ollama_service.threading.Thread') as thread:
+            self.assertTrue(self.service.warm_up_in_background())
+            self.assertFalse(OllamaService().warm_up_in_background())
+        thread.assert_called_once()
+    
+    def test_cli_prints_stream_incrementally(self):
+        """Test main.display_results prints the streamed analysis and its metrics"""
+        import io
+        from contextlib import redirect_stdout
+        from main import display_results
+        
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        service.session.post = Mock(return_value=self._ndjson_response(
+            {'response': 'Great ', 'done': False}, {'response': 'video', 'done': True, 'eval_count': 2}
+        ))
+        result = {'success': True, 'stats': {'platform': 'youtube', 'views': 10}, 'analysis': None}
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            display_results(result, verbose=True, analysis_stream=service.stream_response('p'))
+        
+        self.assertIn('Great video', output.getvalue())
+        self.assertIn('First token', output.getvalue())
+        self.assertEqual(result['analysis'], 'Great video')
+    
+    def test_cli_analyzes_partial_results(self):
+        """Test main.analyze_url still analyses stats with an error, and says why it skips empty ones"""
+        import io
+        from contextlib import redirect_stdout
+        import main
+        
+        url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+        for stats, analysed in (({'platform': 'youtube', 'views': 10, 'error': 'Timeout reading likes'}, True),
+                                ({'platform': 'youtube', 'likes': 0, 'error': 'Timeout reading views'}, True),
+                                ({'platform': 'youtube', 'error': 'Timeout loading page'}, False)):
+            crew = Mock()
+            crew.analyze_single_url.return_value = {'success': True, 'stats': stats, 'analysis': None}
+            crew.ollama_service.stream_social_media_analysis.return_value = None
+            output = io.StringIO()
+            with patch('main.CrewService', return_value=crew), patch('main.display_results'), redirect_stdout(output):
+                main.analyze_url(url)
+            
+            self.assertEqual(crew.ollama_service.stream_social_media_analysis.called, analysed)
+            self.assertEqual('AI analysis skipped' in output.getvalue(), not analysed)
+    
+    def test_session_follow_up_reuses_context(self):
+        """Test follow-ups send the analysis context instead of the stats and report the time saved"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        first = Mock(status_code=200)
+        first.json.return_value = {'response': 'Analysis', 'context': [1, 2, 3],
+                                   'prompt_eval_count': 400, 'prompt_eval_duration': 2_000_000_000}
+        second = Mock(status_code=200)
+        second.json.return_value = {'response': 'Suggestions', 'context': [1, 2, 3, 4],
+                                    'prompt_eval_count': 60, 'prompt_eval_duration': 300_000_000}
+        service.session.post = Mock(side_effect=[first, second])
+        stats = {'platform': 'youtube', 'url': 'https://youtu.be/abc', 'views': 1000, 'likes': 50}
+        
+        session = service.session_for(stats)
+        self.assertEqual(session.analyze(), 'Analysis')
+        self.assertIs(service.session_for(dict(stats)), session)
+        self.assertEqual(session.content_suggestions(), 'Suggestions')
+        
+        follow_up = service.session.post.call_args_list[1].kwargs['json']
+        self.assertEqual(follow_up['context'], [1, 2, 3])
+        self.assertIn('Views: 1000', service.session.post.call_args_list[0].kwargs['json']['prompt'])
+        self.assertNotIn('Views: 1000', follow_up['prompt'])
+        self.assertEqual(service.health_check()['context_reuse'], {
+            'sessions': 1, 'follow_ups': 1, 'reused_tokens': 400, 'prompt_eval_seconds_saved': 2.0
+        })
+    
+    def test_public_analysis_methods_share_context(self):
+        """Test analyze_social_media_data then generate_content_suggestions continue one session"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        analysis = Mock(status_code=200)
+        analysis.json.return_value = {'response': 'Analysis', 'context': [7, 8, 9],
+                                      'prompt_eval_count': 350, 'prompt_eval_duration': 1_500_000_000}
+        suggestions = Mock(status_code=200)
+        suggestions.json.return_value = {'response': 'Suggestions', 'prompt_eval_count': 50}
+        service.session.post = Mock(side_effect=[analysis, suggestions])
+        stats = {'platform': 'youtube', 'url': 'https://youtu.be/xyz', 'title': 'Demo', 'views': 1000}
+        
+        self.assertEqual(service.analyze_social_media_data(stats), 'Analysis')
+        self.assertEqual(service.generate_content_suggestions(dict(stats)), 'Suggestions')
+        
+        first, second = [call.kwargs['json'] for call in service.session.post.call_args_list]
+        self.assertNotIn('context', first)
+        self.assertEqual(second['context'], [7, 8, 9])
+        self.assertLess(len(second['prompt']), len(service.content_suggestions_prompt(stats)))
+        self.assertEqual(service.context_reuse_stats()['reused_tokens'], 350)
+    
+    def test_streamed_analysis_context_used_by_follow_up(self):
+        """Test a completed analysis stream hands its context to the video's session"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        follow_up = Mock(status_code=200)
+        follow_up.json.return_value = {'response': 'Suggestions'}
+        service.session.post = Mock(side_effect=[self._ndjson_response(
+            {'response': 'Analysis', 'done': False},
+            {'response': '', 'done': True, 'context': [4, 5], 'prompt_eval_count': 300,
+             'prompt_eval_duration': 900_000_000}
+        ), follow_up])
+        stats = {'platform': 'tiktok', 'url': 'https://tiktok.com/@a/video/2', 'views': 10}
+        
+        stream = service.stream_social_media_analysis(stats)
+        self.assertEqual(''.join(stream), 'Analysis')
+        self.assertEqual(stream.session.content_suggestions(), 'Suggestions')
+        self.assertEqual(service.session.post.call_args.kwargs['json']['context'], [4, 5])
+        self.assertEqual(service.context_reuse_stats()['prompt_eval_seconds_saved'], 0.9)
+    
+    def test_session_without_context_sends_standalone_prompt(self):
+        """Test a follow-up falls back to the full prompt when no context was stored"""
+        service = OllamaService(response_cache=ResponseCache(ttl=60))
+        service.session.post = Mock(return_value=Mock(status_code=200))
+        service.session.post.return_value.json.return_value = {'response': 'Suggestions'}
+        stats = {'platform': 'tiktok', 'url': 'https://tiktok.com/@a/video/1', 'views': 2500}
+        
+        session = service.session_for(stats)
+        session.content_suggestions()
+        
+        payload = service.session.post.call_args.kwargs['json']
+        self.assertNotIn('context', payload)
+        self.assertEqual(payload['prompt'], service.content_suggestions_prompt(stats))
+        self.assertEqual(session.metrics['follow_ups'], 0)
 
 class TestConfig(unittest.TestCase):
     """Test configuration settings"""
@@ -255,7 +2071,31 @@ def run_tests():
     # Add test cases
     test_classes = [
         TestURLDetector,
+        TestListingURLDetector,
         TestSocialMediaStats,
+        TestYouTubeCommentCount,
+        TestYouTubeListing,
+        TestTikTokProfileFeed,
+        TestFacebookVideosTab,
+        TestNetworkCapture,
+        TestPayloadCounts,
+        TestPlaywrightBackend,
+        TestAsyncScraper,
+        TestCDPTransport,
+        TestRemoteNodePool,
+        TestRetryPolicy,
+        TestPageState,
+        TestLocalePinning,
+        TestAdaptiveTimeouts,
+        TestHedgedScraping,
+        TestNegativeCache,
+        TestResultCache,
+        TestSingleFlight,
+        TestRevalidator,
+        TestResponseCache,
+        TestAnalysisStage,
+        TestCircuitBreaker,
+        TestAsyncOllamaService,
         TestOllamaService,
         TestConfig,
         TestIntegration
@@ -23,6 +23,25 @@ class URLDetector:
         ]
     }
     
+    # Channel / playlist / profile pages that expand into many videos.
+    # Matched case-insensitively against the original URL so IDs keep their case.
+    LISTING_PATTERNS = {
+        'youtube': [
+            ('playlist', r'youtube\.com/playlist\?(?:.*&)?list=([\w-]+)'),
+            ('channel', r'youtube\.com/(@[\w.-]+)'),
+            ('channel', r'youtube\.com/(channel/[\w-]+)'),
+            ('channel', r'youtube\.com/((?:c|user)/[\w.-]+)'),
+        ],
+        'tiktok': [
+            ('profile', r'tiktok\.com/(@[\w.-]+)/?(?:[?#]|$)'),
+        ],
+        'facebook': [
+            ('page', r'facebook\.com/(profile\.php\?id=\d+)'),
+            ('page', r'facebook\.com/(?!(?:watch|share|reel|story\.php|permalink\.php|profile\.php|groups|events|login)\b)'
+                     r'([\w.-]+)/?(?:(?:videos|reels)/?)?(?:[?#]|$)'),
+        ]
+    }
+    
     @classmethod
     def detect_platform(cls, url: str) -> str:
         """Detect social media platform from URL"""
@@ -43,13 +62,22 @@ class URLDetector:
         """Extract video/post ID from URL"""
         patterns = cls.PLATFORM_PATTERNS.get(platform, [])
         
+        # Match case-insensitively but return the ID as written: YouTube IDs are case-sensitive
         for pattern in patterns:
-            match = re.search(pattern, url.lower())
+            match = re.search(pattern, url, re.IGNORECASE)
             if match:
                 return match.group(1)
         
         raise ValueError(f"Could not extract ID from {platform} URL")
     
+    @classmethod
+    def canonical_id(cls, url: str) -> str:
+        """'platform:video_id' key shared by every URL form of the same video, None when unrecognised"""
+        info = cls.validate_url(url)
+        if not info['valid']:
+            return None
+        return f"{info['platform']}:{info['video_id']}"
+    
     @classmethod
     def validate_url(cls, url: str) -> dict:
         """Validate URL and return platform info"""
@@ -70,6 +98,46 @@ class URLDetector:
                 'original_url': url
             }
     
+    @classmethod
+    def detect_listing(cls, url: str) -> dict:
+        """Detect channel/playlist/profile URLs, returning None for anything else"""
+        if not url or not validators.url(url):
+            return None
+        
+        for platform, patterns in cls.LISTING_PATTERNS.items():
+            for listing_type, pattern in patterns:
+                match = re.search(pattern, url, re.IGNORECASE)
+                if match:
+                    return {
+                        'platform': platform,
+                        'listing_type': listing_type,
+                        'listing_id': match.group(1)
+                    }
+        
+        return None
+    
+    @classmethod
+    def is_listing_url(cls, url: str) -> bool:
+        """Check whether URL points to a channel, playlist or profile"""
+        return cls.detect_listing(url) is not None
+    
+    @classmethod
+    def validate_listing_url(cls, url: str) -> dict:
+        """Validate a channel/playlist/profile URL and return listing info"""
+        listing = cls.detect_listing(url)
+        if not listing:
+            return {
+                'valid': False,
+                'error': 'Not a supported channel, playlist or profile URL',
+                'original_url': url
+            }
+        
+        return {
+            'valid': True,
+            **listing,
+            'original_url': url
+        }
+    
     @classmethod
     def get_canonical_url(cls, url: str, platform: str, video_id: str) -> str:
         """Get canonical URL for the platform"""